@@ -0,0 +1,101 @@
+"""
+Deterministic fake model
+A ``BaseLlm`` that never leaves the process: given the same request it always
+makes the same tool call or gives the same answer, so agent runs can be
+benchmarked without Gemini.
+"""
+
+from typing import Any, AsyncGenerator, Dict, Iterable, Optional
+import asyncio
+import hashlib
+import json
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+# Placeholder argument values by schema type
+PLACEHOLDERS = {
+    types.Type.STRING: "benchmark",
+    types.Type.INTEGER: 1,
+    types.Type.NUMBER: 1.0,
+    types.Type.BOOLEAN: True,
+    types.Type.ARRAY: [],
+    types.Type.OBJECT: {},
+}
+
+
+def _placeholder_args(declaration: Optional[types.FunctionDeclaration]) -> Dict[str, Any]:
+    schema = declaration.parameters if declaration is not None else None
+    if schema is None or not schema.properties:
+        return {}
+    return {
+        name: PLACEHOLDERS.get(schema.properties[name].type, "benchmark")
+        for name in schema.required or []
+        if name in schema.properties
+    }
+
+
+class FakeLlm(BaseLlm):
+    """
+    Calls one tool per turn, then answers
+    On a fresh turn the model picks a tool by hashing the request, filling
+    required arguments with placeholders; once a tool result comes back it
+    replies with a short summary. Token counts are estimated at four
+    characters per token. ``tool_args`` supplies real arguments for tools
+    that cannot run on placeholders.
+    """
+
+    model: str = "fake-llm"
+    latency_seconds: float = 0.0
+    tool_args: Dict[str, Dict[str, Any]] = {}
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        contents = [content.model_dump(mode="json", exclude_none=True) for content in llm_request.contents]
+        prompt = json.dumps(contents, sort_keys=True)
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+
+        last = llm_request.contents[-1] if llm_request.contents else None
+        answered = last is not None and any(part.function_response for part in last.parts or [])
+        tools = sorted(llm_request.tools_dict)
+        if answered or not tools:
+            part = types.Part(text=f"Done ({len(llm_request.contents)} messages).")
+            completion = len(part.text)
+        else:
+            digest = hashlib.sha256(prompt.encode()).digest()
+            name = tools[digest[0] % len(tools)]
+            args = self.tool_args.get(name) or _placeholder_args(llm_request.tools_dict[name]._get_declaration())
+            part = types.Part(function_call=types.FunctionCall(name=name, args=args))
+            completion = len(name) + len(json.dumps(args))
+
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[part]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=len(prompt) // 4,
+                candidates_token_count=max(1, completion // 4),
+            ),
+        )
+
+
+def install_fake_llm(agents: Iterable[Any], model: BaseLlm) -> None:
+    """Point every agent, its sub-agents, AgentTool agents and routing targets at ``model``"""
+    from google.adk.tools.agent_tool import AgentTool
+
+    seen = set()
+    pending = list(agents)
+    while pending:
+        agent = pending.pop()
+        if id(agent) in seen:
+            continue
+        seen.add(id(agent))
+        if hasattr(agent, "model"):
+            agent.model = model
+        pending.extend(getattr(agent, "sub_agents", []) or [])
+        pending.extend(tool.agent for tool in getattr(agent, "tools", []) or [] if isinstance(tool, AgentTool))
+        pending.extend((getattr(agent, "agents", None) or {}).values())
+        if getattr(agent, "fallback", None) is not None:
+            pending.append(agent.fallback)
@@ -0,0 +1,92 @@
+"""
+MCP server startup benchmark
+Compares spawning a fresh server for every use with reusing a pooled one.
+
+    uv run python -m benchmarks.mcp_startup --server mongodb --iterations 5
+    uv run python -m benchmarks.mcp_startup --command python --args my_server.py
+"""
+
+from typing import List
+import argparse
+import asyncio
+import statistics
+import time
+
+from rich.console import Console
+from rich.table import Table
+
+from coordinator.tools.pool import MCPServerPool, MCPServerSpec
+from coordinator.tools.tools import SERVER_SPECS
+
+console = Console()
+
+
+async def cold_spawn(spec: MCPServerSpec, iterations: int) -> List[float]:
+    """Start, ping and stop a new server process for every iteration"""
+    samples = []
+    for _ in range(iterations):
+        pool = MCPServerPool()
+        pool.register(spec)
+        started = time.perf_counter()
+        session = await pool.acquire(spec.name)
+        await session.send_ping()
+        samples.append(time.perf_counter() - started)
+        await pool.close()
+    return samples
+
+
+async def pooled_reuse(spec: MCPServerSpec, iterations: int) -> List[float]:
+    """Start one server, then acquire and ping it from the pool every iteration"""
+    pool = MCPServerPool()
+    pool.register(spec)
+    await pool.acquire(spec.name)
+    samples = []
+    try:
+        for _ in range(iterations):
+            started = time.perf_counter()
+            session = await pool.acquire(spec.name)
+            await session.send_ping()
+            samples.append(time.perf_counter() - started)
+    finally:
+        await pool.close()
+    return samples
+
+
+def summarize(label: str, samples: List[float]) -> List[str]:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return [
+        label,
+        str(len(samples)),
+        f"{statistics.mean(samples) * 1000:.1f}",
+        f"{statistics.median(samples) * 1000:.1f}",
+        f"{p95 * 1000:.1f}",
+    ]
+
+
+async def main() -> None:
+    specs = {spec.name: spec for spec in SERVER_SPECS}
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--server", choices=sorted(specs), default="mongodb")
+    parser.add_argument("--command", help="Launch a custom stdio MCP server instead of a registered one")
+    parser.add_argument("--args", nargs="*", default=[], help="Arguments for --command")
+    parser.add_argument("--iterations", type=int, default=5)
+    options = parser.parse_args()
+
+    spec = specs[options.server]
+    if options.command:
+        spec = MCPServerSpec(name="custom", package="", command=options.command, args=tuple(options.args))
+
+    console.print(f"[bold]MCP startup benchmark[/bold] ({spec.name}, {options.iterations} iterations)")
+    cold = await cold_spawn(spec, options.iterations)
+    pooled = await pooled_reuse(spec, options.iterations)
+
+    table = Table("mode", "runs", "mean ms", "p50 ms", "p95 ms")
+    table.add_row(*summarize("cold spawn", cold))
+    table.add_row(*summarize("pooled reuse", pooled))
+    console.print(table)
+    console.print(f"Speedup: {statistics.mean(cold) / statistics.mean(pooled):.0f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,307 @@
+"""
+Offline workflow benchmarks
+Runs the weekly planning, approval, adaptive re-plan and emergency restock
+workflows (plus one coordinator agent turn) for 1, 100 and 10k users against stub MCP servers
+and a deterministic fake model, prints throughput and latency tables, and
+fails when a result regresses past the stored baseline.
+
+    uv run python -m benchmarks.scenarios
+    uv run python -m benchmarks.scenarios --scales 1,100 --latency-ms 20 --jitter-ms 5
+    uv run python -m benchmarks.scenarios --update-baseline
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Offline settings, applied before coordinator reads its configuration:
+# no MongoDB, checkpoints in a throwaway file
+OFFLINE_ENV = {
+    "PRICE_SNAPSHOT_STORE": "memory",
+    "LLM_CACHE_ENABLED": "false",
+    "CHECKPOINT_PATH": str(Path(tempfile.mkdtemp(prefix="edwardo_bench_")) / "checkpoints.db"),
+}
+for _name, _value in OFFLINE_ENV.items():
+    os.environ.setdefault(_name, _value)
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+from coordinator.context import DEFAULT_SOURCES, ContextSource, context_gatherer
+from coordinator.pricing import price_batcher
+from coordinator.pricing.sources import fetch_instacart_prices
+from coordinator.workflows import (
+    ApprovalWorkflow, AdaptiveRePlanningWorkflow, EmergencyRestockWorkflow, WeeklyPlanningWorkflow,
+)
+
+from .stub_mcp import TOOLSETS, stub_spec
+
+console = Console()
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+# Tool each context source calls on its stub server before returning its data
+SOURCE_TOOLS = {
+    "mongodb": "mongodb_find_one",
+    "calendar": "calendar_get_free_busy",
+    "gmail": "gmail_search_messages",
+    "plaid": "plaid_get_transactions",
+    "maps": "maps_get_traffic",
+}
+
+
+# Arguments the fake model passes to local function tools
+FAKE_TOOL_ARGS = {
+    "compile_grocery_list": {
+        "meal_plan": {"meals": [{"day": "monday", "meal_type": "dinner", "ingredients": [
+            {"name": "broccoli", "quantity": 1, "unit": "head"},
+            {"name": "rice", "quantity": 2, "unit": "cup"},
+        ]}]},
+        "pantry": {"well_stocked": ["rice"]},
+    },
+    "normalize_price_matrix": {
+        "grocery_items": [{"name": "milk", "quantity": 1, "unit": "gallon"}],
+        "price_matrix": {"prices": {"milk": {"Safeway": {"price": 3.49, "size": 0.5, "unit": "gallon"}}}},
+    },
+    "optimize_vendor_selection": {
+        "price_matrix": {
+            "items": ["milk", "eggs"],
+            "vendors": ["instacart_safeway", "instacart_whole_foods"],
+            "prices": {"milk": {"instacart_safeway": 3.49, "instacart_whole_foods": 4.29},
+                       "eggs": {"instacart_safeway": 4.99, "instacart_whole_foods": None}},
+            "delivery_fees": {"instacart_safeway": 3.99, "instacart_whole_foods": 0.0},
+        },
+    },
+}
+
+
+async def run_weekly(user_id: str) -> Any:
+    return await WeeklyPlanningWorkflow(user_id=user_id).execute()
+
+
+async def run_approval(user_id: str) -> Any:
+    return await ApprovalWorkflow(approval_id=f"appr_{user_id}", user_id=user_id).execute("grocery_order")
+
+
+async def run_replan(user_id: str) -> Any:
+    # Runs after the weekly scenario, so every user has a base plan to diff against
+    return await AdaptiveRePlanningWorkflow(user_id, "pantry_item_depleted").execute({"item": "milk"})
+
+
+async def run_restock(user_id: str) -> Any:
+    # Pantry snapshots from the weekly scenario are still cached for these users
+    return await EmergencyRestockWorkflow(user_id).execute(["milk"])
+
+
+class CoordinatorTurn:
+    """One coordinator conversation turn per user, on the fake model"""
+
+    def __init__(self):
+        from google.adk.runners import InMemoryRunner
+
+        from coordinator.agent import root_agent
+
+        self.runner = InMemoryRunner(agent=root_agent, app_name="benchmark")
+
+    async def __call__(self, user_id: str) -> Any:
+        from google.genai import types
+
+        session = await self.runner.session_service.create_session(app_name="benchmark", user_id=user_id)
+        message = types.Content(role="user", parts=[types.Part(text="Plan my week")])
+        async for _ in self.runner.run_async(user_id=user_id, session_id=session.id, new_message=message):
+            pass
+
+
+@dataclass
+class Scenario:
+    name: str
+    run: Callable[[], Callable[[str], Awaitable[Any]]]
+    scales: Tuple[int, ...] = (1, 100, 10_000)
+
+
+SCENARIOS = [
+    Scenario("weekly_planning", lambda: run_weekly),
+    Scenario("approval", lambda: run_approval),
+    Scenario("adaptive_replan", lambda: run_replan),
+    Scenario("emergency_restock", lambda: run_restock),
+    Scenario("coordinator_turn", CoordinatorTurn, scales=(1, 100)),
+]
+
+
+@dataclass
+class ScenarioResult:
+    scenario: str
+    users: int
+    elapsed_seconds: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+    failures: int = 0
+    first_error: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.scenario}@{self.users}"
+
+    @property
+    def throughput(self) -> float:
+        return len(self.latencies) / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        p50, p95, p99 = np.percentile(self.latencies, [50, 95, 99]) if self.latencies else (0.0, 0.0, 0.0)
+        return {
+            "throughput_per_second": round(self.throughput, 2),
+            "p50_ms": round(float(p50) * 1000, 2),
+            "p95_ms": round(float(p95) * 1000, 2),
+            "p99_ms": round(float(p99) * 1000, 2),
+            "failures": self.failures,
+        }
+
+
+def stub_context_source(source: ContextSource) -> ContextSource:
+    """Context source that makes its MCP round trip to the stub, then returns the default data"""
+    from coordinator.tools.tools import mcp_pool
+
+    async def fetch(user_id: str) -> Any:
+        args = {"collection": "pantry_items", "filter": {"user_id": user_id}} if source.name == "mongodb" else {"user_id": user_id}
+        await mcp_pool.call_tool(source.name, SOURCE_TOOLS[source.name], args)
+        return await source.fetch(user_id)
+
+    return ContextSource(source.name, source.output_key, fetch, source.timeout_fraction)
+
+
+async def install_stubs(latency_ms: float, jitter_ms: float, fake_llm_latency_ms: float) -> None:
+    """Route MCP servers, context sources, price lookups and agents to the offline stand-ins"""
+    from coordinator.agent import root_agent
+    from coordinator.tools.tools import mcp_pool
+
+    from .fake_llm import FakeLlm, install_fake_llm
+
+    for seed, server in enumerate(sorted(TOOLSETS)):
+        mcp_pool.register(stub_spec(server, latency_ms, jitter_ms, seed))
+    # Start every stub up front so process start-up is not timed
+    await asyncio.gather(*(mcp_pool.acquire(server) for server in TOOLSETS))
+
+    context_gatherer.sources = [stub_context_source(source) for source in DEFAULT_SOURCES]
+    price_batcher.fetch = fetch_instacart_prices
+    install_fake_llm([root_agent], FakeLlm(latency_seconds=fake_llm_latency_ms / 1000, tool_args=FAKE_TOOL_ARGS))
+
+
+async def run_scenario(name: str, run: Callable[[str], Awaitable[Any]], users: int,
+                       concurrency: int) -> ScenarioResult:
+    result = ScenarioResult(name, users)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(user_id: str) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await run(user_id)
+            except Exception as e:
+                result.failures += 1
+                result.first_error = result.first_error or f"{type(e).__name__}: {e}"
+                return
+            result.latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(f"bench_{users}_{i}") for i in range(users)))
+    result.elapsed_seconds = time.perf_counter() - started
+    return result
+
+
+def compare(results: List[ScenarioResult], baseline: Dict[str, Dict[str, float]],
+            tolerance: float, min_delta_ms: float) -> List[str]:
+    """
+    Regressions past ``tolerance`` (a fraction) against the baseline
+    Latency must also be ``min_delta_ms`` worse, so sub-millisecond timings
+    do not flap; throughput is only compared once there is concurrency.
+    """
+    regressions = []
+    for result in results:
+        expected = baseline.get(result.key)
+        if expected is None:
+            continue
+        measured = result.to_dict()
+        if measured["failures"] > expected.get("failures", 0):
+            regressions.append(f"{result.key}: {measured['failures']} failures")
+        if result.users > 1 and measured["throughput_per_second"] < expected["throughput_per_second"] * (1 - tolerance):
+            regressions.append(
+                f"{result.key}: throughput {measured['throughput_per_second']}/s "
+                f"< baseline {expected['throughput_per_second']}/s"
+            )
+        if measured["p95_ms"] > max(expected["p95_ms"] * (1 + tolerance), expected["p95_ms"] + min_delta_ms):
+            regressions.append(f"{result.key}: p95 {measured['p95_ms']}ms > baseline {expected['p95_ms']}ms")
+    return regressions
+
+
+def print_results(results: List[ScenarioResult], baseline: Dict[str, Dict[str, float]]) -> None:
+    table = Table("scenario", "users", "ops/s", "p50 ms", "p95 ms", "p99 ms", "failed", "base p95")
+    for result in results:
+        measured = result.to_dict()
+        expected = baseline.get(result.key, {})
+        table.add_row(
+            result.scenario, str(result.users), f"{measured['throughput_per_second']:.1f}",
+            f"{measured['p50_ms']:.1f}", f"{measured['p95_ms']:.1f}", f"{measured['p99_ms']:.1f}",
+            str(measured["failures"]), f"{expected['p95_ms']:.1f}" if expected else "-",
+        )
+    console.print(table)
+    for result in results:
+        if result.first_error:
+            console.print(f"[red]{result.key} failed: {result.first_error}[/red]")
+
+
+async def run_all(options: argparse.Namespace) -> List[ScenarioResult]:
+    await install_stubs(options.latency_ms, options.jitter_ms, options.llm_latency_ms)
+    selected = set(options.scenarios.split(",")) if options.scenarios else None
+    scales: Optional[Tuple[int, ...]] = tuple(int(n) for n in options.scales.split(",")) if options.scales else None
+
+    results = []
+    for scenario in SCENARIOS:
+        if selected is not None and scenario.name not in selected:
+            continue
+        run = scenario.run()
+        for users in scales or scenario.scales:
+            console.print(f"[dim]{scenario.name} × {users} users...[/dim]")
+            results.append(await run_scenario(scenario.name, run, users, options.concurrency))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=None, help="Comma-separated scenario names (default: all)")
+    parser.add_argument("--scales", default=None, help="Comma-separated user counts overriding each scenario's scales")
+    parser.add_argument("--concurrency", type=int, default=50, help="Users in flight at once")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Stub MCP latency per call")
+    parser.add_argument("--jitter-ms", type=float, default=5.0, help="Stub MCP latency jitter")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Fake model latency per call")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Allowed regression as a fraction of the baseline")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="Smallest p95 increase that counts as a regression")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    options = parser.parse_args()
+
+    results = asyncio.run(run_all(options))
+    baseline = json.loads(options.baseline.read_text()) if options.baseline.exists() else {}
+    print_results(results, baseline)
+
+    if options.update_baseline:
+        baseline.update({result.key: result.to_dict() for result in results})
+        options.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        console.print(f"[dim]Baseline written to {options.baseline}[/dim]")
+        return
+
+    regressions = compare(results, baseline, options.tolerance, options.min_delta_ms)
+    if regressions:
+        for regression in regressions:
+            console.print(f"[bold red]{regression}[/bold red]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Startup benchmark
+Measures `import coordinator` and time-to-first-workflow in fresh interpreters,
+and reports which heavyweight modules were loaded along the way.
+
+    uv run python -m benchmarks.startup --runs 5
+"""
+
+from typing import Dict, List
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+HEAVY_MODULES = ["google.adk", "mcp", "pymongo"]
+
+IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import coordinator
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in HEAVY if m in sys.modules]}))
+"""
+
+WORKFLOW_PROBE = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+from coordinator.workflows import get_workflow
+asyncio.run(get_workflow("weekly_planning")(user_id="bench_user").execute())
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in HEAVY if m in sys.modules]}))
+"""
+
+
+def probe(source: str) -> Dict:
+    script = f"HEAVY = {HEAVY_MODULES!r}\n{source}"
+    # Shipped defaults: the environment is inherited unchanged
+    completed = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def measure(source: str, runs: int) -> Dict:
+    results = [probe(source) for _ in range(runs)]
+    samples: List[float] = [result["seconds"] for result in results]
+    return {
+        "mean": statistics.mean(samples),
+        "max": max(samples),
+        "loaded": results[-1]["loaded"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=1.0, help="Seconds allowed for each measurement")
+    options = parser.parse_args()
+
+    table = Table("measurement", "mean s", "max s", "heavy modules loaded")
+    failed = False
+    for label, source in [("import coordinator", IMPORT_PROBE), ("first weekly plan", WORKFLOW_PROBE)]:
+        result = measure(source, options.runs)
+        failed = failed or result["max"] > options.budget
+        table.add_row(label, f"{result['mean']:.3f}", f"{result['max']:.3f}", ", ".join(result["loaded"]) or "none")
+
+    console.print(table)
+    if failed:
+        console.print(f"[bold red]Startup exceeded the {options.budget}s budget[/bold red]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Stub MCP server
+Serves the tool schemas declared in ``coordinator/mcp_toolsets.py`` over stdio
+with canned, deterministic responses after a configurable latency, so the
+real MCP client path can be exercised without npx or live credentials.
+
+    uv run python -m benchmarks.stub_mcp --server instacart --latency-ms 40 --jitter-ms 10
+"""
+
+from typing import Any, Callable, Dict, List
+import argparse
+import asyncio
+import hashlib
+import random
+import sys
+
+import mcp.types
+from mcp.server.lowlevel import Server
+from mcp.server.stdio import stdio_server
+
+from coordinator.mcp_toolsets import (
+    GmailMCPToolset,
+    GoogleCalendarMCPToolset,
+    GoogleMapsMCPToolset,
+    InstacartMCPToolset,
+    MongoDBMCPToolset,
+    PlaidMCPToolset,
+)
+from coordinator.pricing.sources import simulated_prices
+
+# Declarations served by each stub, keyed by pool server name
+TOOLSETS: Dict[str, Callable[[], Any]] = {
+    "mongodb": lambda: MongoDBMCPToolset("stub", "stub"),
+    "calendar": lambda: GoogleCalendarMCPToolset("stub", "stub"),
+    "gmail": lambda: GmailMCPToolset("stub", "stub"),
+    "plaid": lambda: PlaidMCPToolset("stub", "stub", "sandbox"),
+    "maps": lambda: GoogleMapsMCPToolset("stub"),
+    "instacart": lambda: InstacartMCPToolset("stub", "stub"),
+}
+
+
+def json_schema(schema: Any) -> Any:
+    """Convert a genai Schema dump (upper-case types) to JSON Schema"""
+    if isinstance(schema, dict):
+        return {key: value.lower() if key == "type" else json_schema(value) for key, value in schema.items()}
+    if isinstance(schema, list):
+        return [json_schema(value) for value in schema]
+    return schema
+
+
+def stub_tools(server: str) -> List[mcp.types.Tool]:
+    return [
+        mcp.types.Tool(
+            name=declaration.name,
+            description=declaration.description or "",
+            inputSchema=json_schema(declaration.parameters.model_dump(mode="json", exclude_none=True))
+            if declaration.parameters else {"type": "object", "properties": {}},
+        )
+        for tool in TOOLSETS[server]().get_tools()
+        for declaration in tool.function_declarations or []
+    ]
+
+
+def _token(*parts: Any) -> str:
+    return hashlib.sha256("|".join(map(str, parts)).encode()).hexdigest()[:12]
+
+
+async def canned_response(tool: str, args: Dict[str, Any]) -> Dict[str, Any]:
+    """Deterministic result for a tool call; the same arguments give the same answer"""
+    if tool == "instacart_get_prices":
+        return {"prices": await simulated_prices(args.get("items", []), args.get("stores") or ["Whole Foods"])}
+    if tool == "instacart_create_order":
+        order_id = f"stub_ord_{_token(args)}"
+        return {"order_id": order_id, "status": "placed", "tracking_url": f"https://stub.local/track/{order_id}"}
+    if tool == "mongodb_find_one":
+        return {"document": {"_id": _token(args), **(args.get("filter") or {})}}
+    if tool == "mongodb_find_many":
+        count = min(int(args.get("limit") or 5), 5)
+        return {"documents": [{"_id": _token(args, i), **(args.get("filter") or {})} for i in range(count)]}
+    if tool.startswith("mongodb_"):
+        return {"acknowledged": True, "id": _token(args)}
+    return {"tool": tool, "ok": True, "id": _token(tool, args)}
+
+
+def create_server(server: str, latency_seconds: float = 0.0, jitter_seconds: float = 0.0, seed: int = 0) -> Server:
+    """Low-level MCP server answering every tool call after ``latency ± jitter``"""
+    app = Server(f"stub-{server}")
+    tools = stub_tools(server)
+    rng = random.Random(seed)
+
+    @app.list_tools()
+    async def list_tools() -> List[mcp.types.Tool]:
+        return tools
+
+    @app.call_tool(validate_input=False)
+    async def call_tool(name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        delay = latency_seconds + rng.uniform(-jitter_seconds, jitter_seconds)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return await canned_response(name, arguments)
+
+    return app
+
+
+def stub_spec(server: str, latency_ms: float = 0.0, jitter_ms: float = 0.0, seed: int = 0) -> Any:
+    """Pool spec that launches this module as ``server`` in place of the npx package"""
+    from coordinator.tools.pool import MCPServerSpec
+
+    return MCPServerSpec(
+        name=server,
+        package="benchmarks.stub_mcp",
+        command=sys.executable,
+        args=(
+            "-m", "benchmarks.stub_mcp", "--server", server,
+            "--latency-ms", str(latency_ms), "--jitter-ms", str(jitter_ms), "--seed", str(seed),
+        ),
+    )
+
+
+async def serve(server: str, latency_seconds: float, jitter_seconds: float, seed: int) -> None:
+    app = create_server(server, latency_seconds, jitter_seconds, seed)
+    async with stdio_server() as (read, write):
+        await app.run(read, write, app.create_initialization_options())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--server", required=True, choices=sorted(TOOLSETS))
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean delay before each tool result")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform jitter around the mean delay")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the jitter sequence")
+    options = parser.parse_args()
+    asyncio.run(serve(options.server, options.latency_ms / 1000, options.jitter_ms / 1000, options.seed))
+
+
+if __name__ == "__main__":
+    main()
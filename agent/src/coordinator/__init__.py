@@ -4,6 +4,8 @@ Multi-agent system powered by Google ADK and MCP integrations
 """
 
 import os
+import sys
+import importlib
 import asyncio
 from rich.console import Console
 from rich.panel import Panel
@@ -18,13 +20,39 @@ if os.getenv("GOOGLE_API_KEY"):
 
 from .workflows import get_workflow
 from .config import settings
-from . import agent  # Load agent module
+from .data import ensure_indexes, mongodb_enabled
+from .learning import learning_loop
+from .runtime.events import event_stream
+from .runtime.progress import ConsoleProgress
+from .runtime.telemetry import serve_metrics
 
 console = Console()
 
 
-async def main() -> None:
-    """Main application entry point"""
+def __getattr__(name: str):
+    """Load the ADK agent module on first access rather than at import time"""
+    if name in ("agent", "root_agent"):
+        agent = importlib.import_module(f"{__name__}.agent")
+        return agent if name == "agent" else agent.root_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+async def main(headless: bool = False) -> None:
+    """Main application entry point
+    
+    In headless mode no progress subscriber is attached, so workflows run
+    without any rendering work on their execution path.
+    """
+    
+    progress_queue = None
+    progress_task = None
+    if not headless:
+        progress_queue = event_stream.subscribe()
+        progress_task = asyncio.create_task(ConsoleProgress(console).consume(progress_queue))
+    
+    async def flush_progress() -> None:
+        if progress_queue is not None:
+            await progress_queue.join()
     
     # Display welcome banner
     console.print(Panel.fit(
@@ -36,6 +64,17 @@ async def main() -> None:
     console.print(f"\n[dim]Environment: {settings.app_env}[/dim]")
     console.print(f"[dim]Model: {settings.gemini_model}[/dim]\n")
     
+    metrics_server = None
+    if settings.metrics_port:
+        metrics_server = await serve_metrics(settings.metrics_port, settings.metrics_host)
+        console.print(f"[dim]Metrics: http://localhost:{settings.metrics_port}/metrics[/dim]\n")
+    
+    if mongodb_enabled():
+        try:
+            await ensure_indexes()
+        except Exception as e:
+            console.print(f"[yellow]MongoDB indexes not created: {str(e)}[/yellow]\n")
+    
     # Demo user
     user_id = "demo_user_001"
     
@@ -43,6 +82,7 @@ async def main() -> None:
     try:
         weekly_workflow = get_workflow("weekly_planning")(user_id=user_id)
         result = await weekly_workflow.execute()
+        await flush_progress()
         
         # Display results
         console.print("\n[bold]📊 Planning Results:[/bold]")
@@ -63,21 +103,34 @@ async def main() -> None:
             user_id=user_id
         )
         order_result = await approval_workflow.execute("grocery_order")
+        await flush_progress()
         
         console.print(f"  • Order ID: {order_result['order_id']}")
         console.print(f"  • Confirmation: {order_result['confirmation_number']}")
         console.print(f"  • Tracking: {order_result['tracking_url']}")
         
+        # Simulate the vendor's delivery confirmation
+        if approval_workflow.confirm_delivery(order_result):
+            await learning_loop.flush()
+            console.print(f"  • Delivery learned: {learning_loop.stats['applied']} order(s) applied")
+        
     except Exception as e:
+        await flush_progress()
         console.print(f"\n[bold red]Error: {str(e)}[/bold red]")
         raise
+    finally:
+        event_stream.close()
+        if progress_task is not None:
+            await progress_task
+        if metrics_server is not None:
+            metrics_server.close()
     
     console.print("\n[bold cyan]🎉 Demo completed successfully![/bold cyan]\n")
 
 
 def run():
     """Synchronous wrapper for async main"""
-    asyncio.run(main())
+    asyncio.run(main(headless="--headless" in sys.argv[1:]))
 
 
 if __name__ == "__main__":
@@ -1,11 +1,20 @@
 """Edwardo Coordinator Agent"""
 
-from google.adk.agents import LlmAgent
+from typing import AsyncGenerator, Dict
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
 from google.adk.tools.agent_tool import AgentTool
+from google.adk.utils.context_utils import Aclosing
 from google.genai import types
 
 from . import prompt
 from .config import settings
+from .routing import classify, routing_stats
+from .runtime.limits import throttle_model_call
+from .runtime.llm_cache import llm_cache
+from .runtime.telemetry import telemetry
 from .sub_agents import (
     context_agent,
     planning_agent,
@@ -27,6 +36,53 @@ coordinator_agent = LlmAgent(
         AgentTool(agent=execution_agent),
     ],
     generate_content_config=types.GenerateContentConfig(temperature=0.3),
+    before_agent_callback=telemetry.before_agent,
+    after_agent_callback=telemetry.after_agent,
+    before_model_callback=[llm_cache.before_model, throttle_model_call, telemetry.before_model],
+    after_model_callback=[llm_cache.after_model, telemetry.after_model],
+    before_tool_callback=telemetry.before_tool,
+    after_tool_callback=telemetry.after_tool,
+)
+
+
+class RoutingCoordinator(BaseAgent):
+    """
+    Coordinator that runs known workflows without an LLM routing step
+    Requests that are exactly one workflow (or carry ``workflow_type`` in
+    session state) run that workflow's sub-agents in sequence; anything else
+    goes to the LLM coordinator.
+    """
+
+    fallback: BaseAgent
+    agents: Dict[str, BaseAgent]
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        text = " ".join(part.text for part in (ctx.user_content.parts or []) if part.text) if ctx.user_content else ""
+        route = classify(text, ctx.session.state.get("workflow_type"))
+
+        if route is None:
+            routing_stats.record_llm()
+            async with Aclosing(self.fallback.run_async(ctx)) as events:
+                async for event in events:
+                    yield event
+            return
+
+        routing_stats.record_direct(route)
+        for name in route.agents:
+            async with Aclosing(self.agents[name].run_async(ctx)) as events:
+                async for event in events:
+                    yield event
+                    if ctx.should_pause_invocation(event):
+                        return
+
+
+routing_coordinator = RoutingCoordinator(
+    name="edwardo",
+    description="Routes known workflows directly to sub-agents and free-form requests to the coordinator",
+    fallback=coordinator_agent,
+    agents={agent.name: agent for agent in (context_agent, planning_agent, decision_agent, execution_agent)},
+    before_agent_callback=telemetry.before_agent,
+    after_agent_callback=telemetry.after_agent,
 )
 
-root_agent = coordinator_agent
+root_agent = routing_coordinator if settings.coordinator_routing == "direct" else coordinator_agent
@@ -0,0 +1,237 @@
+"""
+Multi-tenant batch runs
+Runs a workflow (weekly planning by default) for a stream of users with
+bounded concurrency, records each finished user in a checkpoint file so an
+interrupted run resumes where it stopped, and reports throughput and latency.
+
+    uv run python -m coordinator.batch --users users.txt --batch-id sunday
+    seq -f "user_%g" 1000 | uv run python -m coordinator.batch --users - --batch-id load_test
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterable, Dict, Iterable, List, Optional, Set, Union
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+from .config import settings
+from .data import ensure_indexes, mongodb_enabled
+from .runtime.limits import rate_limits
+from .runtime.telemetry import serve_metrics
+from .workflows import get_workflow
+
+logger = logging.getLogger(__name__)
+
+UserStream = Union[Iterable[str], AsyncIterable[str]]
+
+
+class BatchCheckpoint:
+    """
+    Append-only record of finished users for one batch run
+    One JSON line per user; on resume, users whose last entry is
+    ``completed`` are skipped and failed users are retried.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+
+    @classmethod
+    def for_batch(cls, batch_id: str) -> "BatchCheckpoint":
+        return cls(Path(settings.batch_checkpoint_dir) / f"{batch_id}.jsonl")
+
+    def completed(self) -> Set[str]:
+        status: Dict[str, str] = {}
+        if self.path.exists():
+            with self.path.open() as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A crash can leave a torn last line
+                        continue
+                    status[entry["user_id"]] = entry["status"]
+        return {user_id for user_id, state in status.items() if state == "completed"}
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+
+
+@dataclass
+class BatchReport:
+    """Outcome of a batch run"""
+
+    completed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    elapsed_seconds: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+    rate_limits: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def plans_per_minute(self) -> float:
+        return self.completed / self.elapsed_seconds * 60 if self.elapsed_seconds else 0.0
+
+    def percentiles(self) -> Dict[str, float]:
+        if not self.latencies:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+        p50, p95, p99 = np.percentile(self.latencies, [50, 95, 99])
+        return {"p50": float(p50), "p95": float(p95), "p99": float(p99)}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "plans_per_minute": round(self.plans_per_minute, 1),
+            "latency_seconds": {k: round(v, 4) for k, v in self.percentiles().items()},
+            "errors": self.errors,
+            "rate_limits": self.rate_limits,
+        }
+
+
+class BatchRunner:
+    """Runs one workflow per user with at most ``concurrency`` in flight"""
+
+    def __init__(self, workflow: str = "weekly_planning", concurrency: Optional[int] = None,
+                 checkpoint: Optional[BatchCheckpoint] = None):
+        self.workflow_class = get_workflow(workflow)
+        self.concurrency = concurrency or settings.batch_concurrency
+        self.checkpoint = checkpoint
+
+    async def run(self, user_ids: UserStream) -> BatchReport:
+        """Plan for every user in the stream; users are read lazily as workers free up"""
+        report = BatchReport()
+        done = self.checkpoint.completed() if self.checkpoint else set()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        started = time.perf_counter()
+
+        async def produce() -> None:
+            seen: Set[str] = set()
+            async for user_id in _iterate(user_ids):
+                user_id = user_id.strip()
+                if not user_id or user_id in seen:
+                    continue
+                seen.add(user_id)
+                if user_id in done:
+                    report.skipped += 1
+                    continue
+                await queue.put(user_id)
+            for _ in range(self.concurrency):
+                await queue.put(None)
+
+        async def work() -> None:
+            while (user_id := await queue.get()) is not None:
+                await self._run_one(user_id, report)
+
+        workers = [asyncio.create_task(work()) for _ in range(self.concurrency)]
+        try:
+            await asyncio.gather(produce(), *workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            report.elapsed_seconds = time.perf_counter() - started
+            report.rate_limits = rate_limits.stats()
+        return report
+
+    async def _run_one(self, user_id: str, report: BatchReport) -> None:
+        started = time.perf_counter()
+        entry: Dict[str, Any] = {"user_id": user_id}
+        try:
+            result = await self.workflow_class(user_id=user_id).execute()
+            entry.update(status="completed", workflow_id=result.get("workflow_id"))
+            report.completed += 1
+        except Exception as e:
+            logger.warning("Batch workflow for %s failed: %s", user_id, e)
+            entry.update(status="failed", error=str(e))
+            report.failed += 1
+            report.errors[user_id] = str(e)
+        seconds = time.perf_counter() - started
+        if entry["status"] == "completed":
+            report.latencies.append(seconds)
+        if self.checkpoint is not None:
+            entry.update(seconds=round(seconds, 4), finished_at=datetime.now(timezone.utc).isoformat())
+            self.checkpoint.record(entry)
+
+
+async def _run_with_metrics(runner: BatchRunner, user_ids: UserStream) -> BatchReport:
+    """Run a batch, serving Prometheus metrics for its duration when a port is configured"""
+    server = await serve_metrics(settings.metrics_port, settings.metrics_host) if settings.metrics_port else None
+    if mongodb_enabled():
+        try:
+            await ensure_indexes()
+        except Exception as e:
+            logger.warning("MongoDB indexes not created: %s", e)
+    try:
+        return await runner.run(user_ids)
+    finally:
+        if server is not None:
+            server.close()
+
+
+async def _iterate(user_ids: UserStream):
+    if hasattr(user_ids, "__aiter__"):
+        async for user_id in user_ids:
+            yield user_id
+    else:
+        for user_id in user_ids:
+            yield user_id
+
+
+def _print_report(console: Console, report: BatchReport) -> None:
+    summary = report.to_dict()
+    table = Table(title="Batch run")
+    table.add_column("Metric")
+    table.add_column("Value", justify="right")
+    table.add_row("Completed", str(summary["completed"]))
+    table.add_row("Failed", str(summary["failed"]))
+    table.add_row("Skipped (checkpointed)", str(summary["skipped"]))
+    table.add_row("Elapsed", f"{summary['elapsed_seconds']:.2f}s")
+    table.add_row("Throughput", f"{summary['plans_per_minute']:.1f} plans/min")
+    for name, seconds in summary["latency_seconds"].items():
+        table.add_row(f"Latency {name}", f"{seconds * 1000:.1f}ms")
+    for backend, stats in summary["rate_limits"].items():
+        table.add_row(f"{backend} throttled", f"{stats['throttled']}/{stats['calls']} ({stats['wait_seconds']:.2f}s)")
+    console.print(table)
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(description="Run a workflow for many users")
+    parser.add_argument("--users", required=True, help="File with one user ID per line, or - for stdin")
+    parser.add_argument("--batch-id", default=None, help="Checkpoint name; rerun with the same ID to resume")
+    parser.add_argument("--workflow", default="weekly_planning")
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    batch_id = args.batch_id or f"batch_{datetime.now(timezone.utc):%Y%m%dT%H%M%S}"
+    runner = BatchRunner(args.workflow, args.concurrency, BatchCheckpoint.for_batch(batch_id))
+    source = sys.stdin if args.users == "-" else open(args.users)
+    try:
+        report = asyncio.run(_run_with_metrics(runner, source))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        console = Console()
+        console.print(f"[dim]Checkpoint: {runner.checkpoint.path}[/dim]")
+        _print_report(console, report)
+
+
+if __name__ == "__main__":
+    run()
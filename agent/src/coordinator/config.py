@@ -5,7 +5,7 @@ Centralized settings and environment variable management
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
-from typing import Literal
+from typing import Dict, List, Literal
 
 
 class Settings(BaseSettings):
@@ -21,10 +21,14 @@ class Settings(BaseSettings):
     # LLM Configuration
     google_api_key: str = Field(default="", description="Google AI API key for Gemini")
     gemini_model: str = Field(default="gemini-1.5-flash", description="Gemini model name")
+    coordinator_routing: Literal["direct", "llm"] = Field(default="direct", description="Run known workflows without an LLM routing step, or route every request through the LLM coordinator")
     
     # MongoDB
     mongodb_uri: str = Field(default="mongodb://localhost:27017", description="MongoDB connection URI")
     mongodb_database: str = Field(default="edwardo_db", description="MongoDB database name")
+    mongodb_max_pool_size: int = Field(default=50, description="Maximum connections in the shared MongoDB pool")
+    mongodb_timeout_ms: int = Field(default=2000, description="MongoDB server selection and connect timeout")
+    context_store: Literal["simulated", "mongodb"] = Field(default="simulated", description="Read workflow context from MongoDB through the repository layer, or use simulated data")
     
     # Google Services
     google_calendar_client_id: str = Field(default="", description="Google Calendar OAuth client ID")
@@ -50,6 +54,83 @@ class Settings(BaseSettings):
     app_env: Literal["development", "staging", "production"] = Field(default="development")
     log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = Field(default="INFO")
     agent_timeout_seconds: int = Field(default=120, description="Agent execution timeout")
+    
+    # MCP Server Pool
+    mcp_start_timeout_seconds: float = Field(default=60.0, description="Time allowed for an MCP server to start")
+    mcp_health_check_timeout_seconds: float = Field(default=5.0, description="Ping timeout for MCP server health checks")
+    mcp_health_check_interval_seconds: float = Field(default=30.0, description="Idle time after which a server is pinged before it is reused")
+    
+    # Context Cache
+    context_cache_ttl_seconds: Dict[str, float] = Field(
+        default={
+            "mongodb": 300,         # pantry and profile: minutes
+            "calendar": 600,        # calendar: minutes
+            "gmail": 3600,          # receipts: an hour
+            "plaid": 6 * 3600,      # transactions: hours
+            "maps": 3 * 86400,      # store locations: days
+        },
+        description="Context snapshot TTL per source"
+    )
+    context_cache_max_bytes: int = Field(default=64 * 1024 * 1024, description="Memory bound for cached context snapshots")
+    
+    # Price Lookups
+    price_batch_window_seconds: float = Field(default=0.05, description="How long price requests are collected before one batched vendor call")
+    price_batch_max_items: int = Field(default=200, description="Flush a price batch early once it holds this many items")
+    price_max_age_seconds: float = Field(default=6 * 3600, description="Age after which a cached price is stale")
+    price_vendor_max_age_seconds: Dict[str, float] = Field(default={}, description="Per-vendor overrides for price_max_age_seconds")
+    max_split_vendors: int = Field(default=3, description="Maximum vendors a single grocery order may be split across")
+    price_snapshot_store: Literal["mongodb", "memory"] = Field(default="memory", description="Backing tier for the price cache")
+    
+    # Emergency Restock
+    restock_deadline_seconds: float = Field(default=2.0, description="How long instant-delivery quotes are awaited before offering what arrived")
+    restock_pantry_timeout_seconds: float = Field(default=0.5, description="Time allowed for the low-stock pantry query before falling back to the pantry snapshot")
+    
+    # Spending Analytics
+    spending_window_weeks: int = Field(default=12, description="Weeks of transactions averaged into spending_patterns")
+    plaid_sync_enabled: bool = Field(default=False, description="Sync Plaid transactions incrementally and compute spending_patterns from them")
+    plaid_sync_path: str = Field(default=".edwardo/plaid.db", description="SQLite file holding synced transactions, cursors and merchant categories")
+    plaid_sync_page_size: int = Field(default=500, description="Transactions requested per sync page")
+    
+    # Receipt Ingestion
+    receipt_ingest_enabled: bool = Field(default=False, description="Ingest Gmail receipts incrementally and serve recent_receipts from the local store")
+    receipt_store_path: str = Field(default=".edwardo/receipts.db", description="SQLite file holding processed messages, receipts and per-user checkpoints")
+    receipt_fetch_batch_size: int = Field(default=100, description="Messages listed and fetched per Gmail request")
+    receipt_parse_workers: int = Field(default=0, description="Processes parsing receipts in parallel; 0 uses every CPU")
+    
+    # Learning Loop
+    learning_loop_max_attempts: int = Field(default=3, description="Attempts at applying a delivery's updates before giving up")
+    preference_half_life_days: float = Field(default=30.0, description="Days after which an item's purchase counts half as much in its preference score")
+    
+    # Re-plan Triggers
+    replan_debounce_seconds: float = Field(default=2.0, description="Quiet period before a user's pending re-plan triggers run")
+    replan_max_delay_seconds: float = Field(default=10.0, description="Longest a trigger waits while new ones keep arriving")
+    
+    # Backend Rate Limits and Batch Runs
+    backend_rate_limits: Dict[str, float] = Field(
+        default={
+            "gemini": 15.0,       # requests/second
+            "instacart": 5.0,
+            "plaid": 2.0,
+        },
+        description="Requests per second allowed to each shared backend; unlisted backends are unlimited"
+    )
+    batch_concurrency: int = Field(default=50, description="Workflows a batch run executes at once")
+    batch_checkpoint_dir: str = Field(default=".edwardo/batches", description="Where batch runs record completed users")
+    
+    # Workflow Checkpoints
+    checkpoint_store: Literal["sqlite", "mongodb", "none"] = Field(default="none", description="Where workflow step outputs are checkpointed")
+    checkpoint_path: str = Field(default=".edwardo/checkpoints.db", description="SQLite file for the sqlite checkpoint store")
+    
+    # LLM Response Cache
+    llm_cache_enabled: bool = Field(default=False, description="Serve repeated agent model calls from the response cache")
+    llm_cache_path: str = Field(default=".edwardo/llm_cache.db", description="SQLite file backing the response cache")
+    llm_cache_max_bytes: int = Field(default=256 * 1024 * 1024, description="Disk bound for cached responses; least recently used are evicted")
+    llm_cache_bypass_agents: List[str] = Field(default=["execution_agent"], description="Agents whose model calls are never cached")
+    
+    # Telemetry
+    metrics_port: int = Field(default=0, description="Port serving Prometheus metrics at /metrics; 0 disables the endpoint")
+    metrics_host: str = Field(default="127.0.0.1", description="Interface the metrics endpoint binds; use 0.0.0.0 to expose it beyond localhost")
+    trace_dir: str = Field(default="", description="Directory for per-workflow JSON trace files; empty disables tracing")
 
 
 # Global settings instance
@@ -0,0 +1,18 @@
+"""Context gathering for Edwardo system"""
+
+from .cache import ContextCache
+from .gatherer import ContextGatherer, ContextSource
+from .sources import DEFAULT_SOURCES
+
+# Shared cache and gatherer used by workflows
+context_cache = ContextCache()
+context_gatherer = ContextGatherer(DEFAULT_SOURCES, cache=context_cache)
+
+__all__ = [
+    "ContextCache",
+    "ContextGatherer",
+    "ContextSource",
+    "DEFAULT_SOURCES",
+    "context_cache",
+    "context_gatherer",
+]
@@ -0,0 +1,111 @@
+"""
+Context snapshot cache
+In-process TTL + LRU cache keyed by (user_id, source). Each source has its
+own TTL, total size is bounded in bytes, and entries can be invalidated
+explicitly when a change is known to have happened.
+"""
+
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import json
+import time
+
+from ..config import settings
+
+CacheKey = Tuple[str, str]
+InvalidationHook = Callable[[str, Optional[str]], None]
+
+
+class ContextCache:
+    """TTL + LRU cache for context snapshots"""
+
+    def __init__(self, ttl_seconds: Optional[Dict[str, float]] = None, max_bytes: Optional[int] = None,
+                 default_ttl_seconds: float = 300.0):
+        self.ttl_seconds = dict(settings.context_cache_ttl_seconds if ttl_seconds is None else ttl_seconds)
+        self.max_bytes = settings.context_cache_max_bytes if max_bytes is None else max_bytes
+        self.default_ttl_seconds = default_ttl_seconds
+        self._entries: "OrderedDict[CacheKey, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._hooks: List[InvalidationHook] = []
+        self.hits: Dict[str, int] = defaultdict(int)
+        self.misses: Dict[str, int] = defaultdict(int)
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ttl_for(self, source: str) -> float:
+        return self.ttl_seconds.get(source, self.default_ttl_seconds)
+
+    def get(self, user_id: str, source: str, default: Any = None) -> Any:
+        """Return a fresh cached value, or ``default`` on a miss"""
+        hit, value = self.lookup(user_id, source)
+        return value if hit else default
+
+    def lookup(self, user_id: str, source: str) -> Tuple[bool, Any]:
+        """Return ``(hit, value)``; expired entries count as misses and are dropped"""
+        key = (user_id, source)
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits[source] += 1
+            return True, entry[0]
+        if entry is not None:
+            self._remove(key)
+        self.misses[source] += 1
+        return False, None
+
+    def set(self, user_id: str, source: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a snapshot, evicting least recently used entries past the size bound"""
+        key = (user_id, source)
+        size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        ttl = self.ttl_for(source) if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (value, time.monotonic() + ttl, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, user_id: str, source: Optional[str] = None) -> int:
+        """Drop one source (or every source) for a user; returns entries removed"""
+        keys = [key for key in self._entries if key[0] == user_id and (source is None or key[1] == source)]
+        for key in keys:
+            self._remove(key)
+        for hook in self._hooks:
+            hook(user_id, source)
+        return len(keys)
+
+    def on_invalidate(self, hook: InvalidationHook) -> None:
+        """Register a callback run after every explicit invalidation"""
+        self._hooks.append(hook)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit and miss counters per source plus current occupancy"""
+        sources = sorted(set(self.hits) | set(self.misses))
+        total_hits = sum(self.hits.values())
+        total_lookups = total_hits + sum(self.misses.values())
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "evictions": self.evictions,
+            "hits": total_hits,
+            "misses": total_lookups - total_hits,
+            "hit_ratio": round(total_hits / total_lookups, 4) if total_lookups else 0.0,
+            "sources": {
+                source: {"hits": self.hits[source], "misses": self.misses[source]}
+                for source in sources
+            },
+        }
+
+    def _remove(self, key: CacheKey) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
@@ -0,0 +1,82 @@
+"""
+Context gathering engine
+Queries every context source concurrently with its own timeout, so context
+latency is bounded by the slowest source and a stuck source only costs its
+own slice of the context.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import time
+
+from ..config import settings
+from .cache import ContextCache
+
+
+@dataclass
+class ContextSource:
+    """One independent source of context data
+
+    ``timeout_fraction`` is the share of ``settings.agent_timeout_seconds``
+    the source may take before it is reported missing.
+    """
+
+    name: str
+    output_key: str
+    fetch: Callable[[str], Awaitable[Any]]
+    timeout_fraction: float = 0.1
+
+    @property
+    def timeout_seconds(self) -> float:
+        return settings.agent_timeout_seconds * self.timeout_fraction
+
+
+class ContextGatherer:
+    """Fans out to all context sources and returns whatever arrives in time
+
+    With a cache, fresh snapshots are served without touching the source and
+    successful fetches are stored for the next run.
+    """
+
+    def __init__(self, sources: List[ContextSource], cache: Optional[ContextCache] = None):
+        self.sources = sources
+        self.cache = cache
+
+    async def gather(self, user_id: str, only: Optional[List[str]] = None, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Gather context for a user from every source (or just ``only``)
+        Missing sources are set to None and listed in ``missing_sources``;
+        per-source status and timing are reported under ``sources``.
+        ``refresh`` bypasses cached snapshots.
+        """
+        sources = [source for source in self.sources if only is None or source.name in only]
+        reports = await asyncio.gather(*(self._fetch(source, user_id, refresh) for source in sources))
+
+        context: Dict[str, Any] = {"sources": {}, "missing_sources": []}
+        for source, (data, report) in zip(sources, reports):
+            context[source.output_key] = data
+            context["sources"][source.name] = report
+            if report["status"] != "ok":
+                context["missing_sources"].append(source.name)
+        return context
+
+    async def _fetch(self, source: ContextSource, user_id: str, refresh: bool) -> Tuple[Any, Dict[str, Any]]:
+        if self.cache is not None and not refresh:
+            hit, data = self.cache.lookup(user_id, source.name)
+            if hit:
+                return data, {"status": "ok", "cached": True, "duration_seconds": 0.0}
+
+        started = time.perf_counter()
+        report: Dict[str, Any] = {"status": "ok"}
+        data = None
+        try:
+            data = await asyncio.wait_for(source.fetch(user_id), timeout=source.timeout_seconds)
+            if self.cache is not None:
+                self.cache.set(user_id, source.name, data)
+        except asyncio.TimeoutError:
+            report = {"status": "timeout", "error": f"no response within {source.timeout_seconds:.1f}s"}
+        except Exception as e:
+            report = {"status": "error", "error": str(e)}
+        report["duration_seconds"] = round(time.perf_counter() - started, 4)
+        return data, report
@@ -0,0 +1,81 @@
+"""
+Default context sources
+Each source is independent of the others; in a real deployment each fetch
+would call its MCP server through the shared pool. With ``context_store``
+set to mongodb, the pantry is read straight from the repository layer.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+from ..config import settings
+from .gatherer import ContextSource
+
+
+async def fetch_pantry_state(user_id: str) -> Dict[str, Any]:
+    """Pantry inventory from MongoDB"""
+    if settings.context_store == "mongodb":
+        from ..data import pantry_items
+        return await pantry_items.state(user_id)
+    return {
+        "running_low": ["milk", "eggs", "bread"],
+        "well_stocked": ["rice", "pasta", "canned_goods"]
+    }
+
+
+async def fetch_low_stock_items(user_id: str) -> List[str]:
+    """Names of the user's low-stock pantry items, answered from the (user_id, status) index"""
+    from ..data import pantry_items
+    return await pantry_items.low_stock(user_id)
+
+
+async def fetch_availability(user_id: str) -> Dict[str, Any]:
+    """Free/busy blocks from Google Calendar"""
+    return {
+        "free_blocks": ["Sat 10am-6pm", "Sun 2pm-8pm"],
+        "busy_blocks": ["Sat 8-9:30am", "Sun 10am-1pm"]
+    }
+
+
+async def fetch_recent_receipts(user_id: str) -> List[Dict[str, Any]]:
+    """Grocery receipts extracted from Gmail in the last 30 days"""
+    if not settings.receipt_ingest_enabled:
+        return []
+    from ..ingest import receipt_ingestion
+
+    await receipt_ingestion.ingest(user_id)
+    since = datetime.now(timezone.utc).date() - timedelta(days=30)
+    return await receipt_ingestion.store.recent(user_id, since)
+
+
+async def fetch_spending_patterns(user_id: str) -> Dict[str, Any]:
+    """Grocery spending from the rolling weekly aggregates of Plaid transactions"""
+    from ..spending import spending_analytics
+
+    if settings.plaid_sync_enabled:
+        from ..ingest import plaid_sync
+        await plaid_sync.sync(user_id)
+    if settings.plaid_sync_enabled or settings.context_store == "mongodb" or spending_analytics.tracks(user_id):
+        return await spending_analytics.patterns(user_id)
+    return {
+        "avg_weekly_grocery": 150.0,
+        "categories": {"produce": 40, "dairy": 25, "meat": 35, "pantry": 50}
+    }
+
+
+async def fetch_location_insights(user_id: str) -> Dict[str, Any]:
+    """Store, traffic and delivery conditions from Google Maps"""
+    return {
+        "weather": "Clear weekend",
+        "traffic": "Light Saturday afternoon",
+        "recommended_shopping_time": "Saturday 2-3pm"
+    }
+
+
+DEFAULT_SOURCES = [
+    ContextSource("mongodb", "pantry_state", fetch_pantry_state, timeout_fraction=0.05),
+    ContextSource("calendar", "availability", fetch_availability, timeout_fraction=0.1),
+    ContextSource("gmail", "recent_receipts", fetch_recent_receipts, timeout_fraction=0.15),
+    ContextSource("plaid", "spending_patterns", fetch_spending_patterns, timeout_fraction=0.15),
+    ContextSource("maps", "contextual_insights", fetch_location_insights, timeout_fraction=0.1),
+]
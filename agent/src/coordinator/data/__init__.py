@@ -0,0 +1,54 @@
+"""Data access for Edwardo system"""
+
+from .mongo import close_client, get_client, get_database, mongodb_enabled
+from .repositories import (
+    LOW_STOCK_STATUSES,
+    GroceryTransaction,
+    GroceryTransactionRepository,
+    IndexSpec,
+    MealHistoryRepository,
+    MealRecord,
+    PantryItem,
+    PantryRepository,
+    PreferenceScoreRepository,
+    PriceSnapshotRepository,
+    Repository,
+    SpendingWeekRepository,
+    WorkflowCheckpointRepository,
+    ensure_indexes,
+    grocery_transactions,
+    meal_history,
+    pantry_items,
+    preference_scores,
+    price_snapshots,
+    spending_weeks,
+    workflow_checkpoints,
+)
+
+__all__ = [
+    "LOW_STOCK_STATUSES",
+    "GroceryTransaction",
+    "GroceryTransactionRepository",
+    "IndexSpec",
+    "MealHistoryRepository",
+    "MealRecord",
+    "PantryItem",
+    "PantryRepository",
+    "PreferenceScoreRepository",
+    "PriceSnapshotRepository",
+    "Repository",
+    "SpendingWeekRepository",
+    "WorkflowCheckpointRepository",
+    "close_client",
+    "ensure_indexes",
+    "get_client",
+    "get_database",
+    "grocery_transactions",
+    "meal_history",
+    "mongodb_enabled",
+    "pantry_items",
+    "preference_scores",
+    "price_snapshots",
+    "spending_weeks",
+    "workflow_checkpoints",
+]
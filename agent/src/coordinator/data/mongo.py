@@ -0,0 +1,50 @@
+"""
+Shared MongoDB client
+One AsyncMongoClient (and its connection pool) per event loop, created on
+first use so importing the package never opens a connection.
+"""
+
+from typing import Any, Optional
+import asyncio
+
+from ..config import settings
+
+_client: Any = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_client() -> Any:
+    """Return the shared AsyncMongoClient for the running event loop"""
+    global _client, _client_loop
+    from pymongo import AsyncMongoClient
+
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = AsyncMongoClient(
+            settings.mongodb_uri,
+            maxPoolSize=settings.mongodb_max_pool_size,
+            serverSelectionTimeoutMS=settings.mongodb_timeout_ms,
+            connectTimeoutMS=settings.mongodb_timeout_ms,
+            tz_aware=True,
+        )
+        _client_loop = loop
+    return _client
+
+
+def get_database() -> Any:
+    """Return the application database on the shared client"""
+    return get_client()[settings.mongodb_database]
+
+
+async def close_client() -> None:
+    """Close the shared client and its connection pool"""
+    global _client, _client_loop
+    if _client is not None:
+        await _client.close()
+    _client = None
+    _client_loop = None
+
+
+def mongodb_enabled() -> bool:
+    """Whether any configured store is backed by MongoDB"""
+    return "mongodb" in (settings.context_store, settings.price_snapshot_store, settings.checkpoint_store)
@@ -0,0 +1,272 @@
+"""
+MongoDB repositories
+Typed, in-process queries for the collections the agents work with, on the
+shared client's connection pool. Each repository declares the indexes its
+queries rely on; ``ensure_indexes`` creates them all at startup.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import asyncio
+
+from .mongo import get_database
+
+# Pantry statuses that count as low stock
+LOW_STOCK_STATUSES = ("running_low", "out")
+
+PriceKey = Tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """One index a repository's queries need"""
+
+    name: str
+    keys: Tuple[Tuple[str, int], ...]
+    unique: bool = False
+
+
+@dataclass
+class PantryItem:
+    name: str
+    status: str
+    quantity: Optional[float] = None
+    unit: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+    @classmethod
+    def from_doc(cls, doc: Dict[str, Any]) -> "PantryItem":
+        return cls(doc["name"], doc.get("status", "well_stocked"), doc.get("quantity"), doc.get("unit"), doc.get("updated_at"))
+
+
+@dataclass
+class MealRecord:
+    recipe: str
+    meal_type: str
+    served_at: datetime
+    rating: Optional[float] = None
+
+    @classmethod
+    def from_doc(cls, doc: Dict[str, Any]) -> "MealRecord":
+        return cls(doc["recipe"], doc.get("meal_type", "dinner"), doc["served_at"], doc.get("rating"))
+
+
+@dataclass
+class GroceryTransaction:
+    order_id: str
+    store: str
+    total: float
+    ordered_at: datetime
+    items: List[Dict[str, Any]] = field(default_factory=list)
+
+    @classmethod
+    def from_doc(cls, doc: Dict[str, Any]) -> "GroceryTransaction":
+        return cls(doc["order_id"], doc.get("store", ""), doc.get("total", 0.0), doc["ordered_at"], doc.get("items", []))
+
+
+class Repository:
+    """Base for collection repositories"""
+
+    collection_name = ""
+    indexes: Tuple[IndexSpec, ...] = ()
+
+    def collection(self) -> Any:
+        return get_database()[self.collection_name]
+
+    async def ensure_indexes(self) -> None:
+        from pymongo import IndexModel
+
+        if self.indexes:
+            await self.collection().create_indexes(
+                [IndexModel(list(index.keys), name=index.name, unique=index.unique) for index in self.indexes]
+            )
+
+
+class PantryRepository(Repository):
+    """Per-user pantry inventory, one document per (user_id, name)"""
+
+    collection_name = "pantry_items"
+    indexes = (
+        IndexSpec("user_item", (("user_id", 1), ("name", 1)), unique=True),
+        IndexSpec("user_status", (("user_id", 1), ("status", 1))),
+    )
+
+    async def items(self, user_id: str) -> List[PantryItem]:
+        cursor = self.collection().find({"user_id": user_id}, {"_id": 0})
+        return [PantryItem.from_doc(doc) async for doc in cursor]
+
+    async def low_stock(self, user_id: str) -> List[str]:
+        """Names of low-stock items, answered from the user_status index"""
+        cursor = self.collection().find(
+            {"user_id": user_id, "status": {"$in": list(LOW_STOCK_STATUSES)}},
+            {"_id": 0, "name": 1},
+        )
+        return [doc["name"] async for doc in cursor]
+
+    async def units(self, user_id: str, names: List[str]) -> Dict[str, str]:
+        """Stored unit of each named item the user already has"""
+        cursor = self.collection().find(
+            {"user_id": user_id, "name": {"$in": names}},
+            {"_id": 0, "name": 1, "unit": 1},
+        )
+        return {doc["name"]: doc["unit"] async for doc in cursor if doc.get("unit")}
+
+    async def state(self, user_id: str) -> Dict[str, List[str]]:
+        """Pantry in the shape of the ``pantry_state`` context key"""
+        state: Dict[str, List[str]] = {"running_low": [], "well_stocked": []}
+        for item in await self.items(user_id):
+            state["running_low" if item.status in LOW_STOCK_STATUSES else "well_stocked"].append(item.name)
+        return state
+
+
+class MealHistoryRepository(Repository):
+    """Meals a user has been served, newest first"""
+
+    collection_name = "meal_history"
+    indexes = (IndexSpec("user_served_at", (("user_id", 1), ("served_at", -1))),)
+
+    async def recent(self, user_id: str, since: Optional[datetime] = None, limit: int = 50) -> List[MealRecord]:
+        query: Dict[str, Any] = {"user_id": user_id}
+        if since is not None:
+            query["served_at"] = {"$gte": since}
+        cursor = self.collection().find(query, {"_id": 0}).sort("served_at", -1).limit(limit)
+        return [MealRecord.from_doc(doc) async for doc in cursor]
+
+
+class GroceryTransactionRepository(Repository):
+    """Placed grocery orders, one document per order_id"""
+
+    collection_name = "grocery_transactions"
+    indexes = (
+        IndexSpec("order_id", (("order_id", 1),), unique=True),
+        IndexSpec("user_ordered_at", (("user_id", 1), ("ordered_at", -1))),
+    )
+
+    async def recent(self, user_id: str, since: Optional[datetime] = None, limit: int = 100) -> List[GroceryTransaction]:
+        query: Dict[str, Any] = {"user_id": user_id}
+        if since is not None:
+            query["ordered_at"] = {"$gte": since}
+        cursor = self.collection().find(query, {"_id": 0}).sort("ordered_at", -1).limit(limit)
+        return [GroceryTransaction.from_doc(doc) async for doc in cursor]
+
+    async def get(self, order_id: str) -> Optional[GroceryTransaction]:
+        doc = await self.collection().find_one({"order_id": order_id}, {"_id": 0})
+        return GroceryTransaction.from_doc(doc) if doc else None
+
+
+class PriceSnapshotRepository(Repository):
+    """Append-only price history keyed by (vendor, store, item)"""
+
+    collection_name = "price_snapshots"
+    indexes = (
+        IndexSpec("key_observed_at", (("vendor", 1), ("store", 1), ("item", 1), ("observed_at", -1))),
+        IndexSpec("item_observed_at", (("item", 1), ("observed_at", -1))),
+        IndexSpec("order_item", (("order_id", 1), ("item", 1))),
+    )
+
+    async def latest(self, keys: List[PriceKey], since: datetime) -> Dict[PriceKey, Tuple[Any, datetime]]:
+        """Most recent snapshot per key observed after ``since``
+
+        Grouped server-side: the sort follows the key_observed_at index, so
+        ``$first`` picks each key's newest snapshot without shipping history.
+        """
+        if not keys:
+            return {}
+        pipeline = [
+            {"$match": {
+                "$or": [{"vendor": v, "store": s, "item": i} for v, s, i in keys],
+                "observed_at": {"$gte": since},
+            }},
+            {"$sort": {"vendor": 1, "store": 1, "item": 1, "observed_at": -1}},
+            {"$group": {
+                "_id": {"vendor": "$vendor", "store": "$store", "item": "$item"},
+                "price": {"$first": "$price"},
+                "observed_at": {"$first": "$observed_at"},
+            }},
+        ]
+        cursor = await self.collection().aggregate(pipeline)
+        return {
+            (doc["_id"]["vendor"], doc["_id"]["store"], doc["_id"]["item"]): (doc.get("price"), doc["observed_at"])
+            async for doc in cursor
+        }
+
+    async def history(self, item: str, since: datetime) -> List[Dict[str, Any]]:
+        """Every snapshot of an item since ``since``, newest first"""
+        cursor = self.collection().find({"item": item, "observed_at": {"$gte": since}}, {"_id": 0})
+        return [doc async for doc in cursor.sort("observed_at", -1)]
+
+    async def record(self, snapshots: List[Dict[str, Any]]) -> None:
+        if snapshots:
+            await self.collection().insert_many(snapshots, ordered=False)
+
+
+class PreferenceScoreRepository(Repository):
+    """Per-user item preference scores, one document per (user_id, item)"""
+
+    collection_name = "preference_scores"
+    indexes = (
+        IndexSpec("user_item", (("user_id", 1), ("item", 1)), unique=True),
+        IndexSpec("user_score", (("user_id", 1), ("score", -1))),
+    )
+
+    async def top(self, user_id: str, limit: int = 20) -> Dict[str, float]:
+        """Highest-scoring items for a user"""
+        cursor = self.collection().find({"user_id": user_id}, {"_id": 0, "item": 1, "score": 1})
+        return {doc["item"]: doc["score"] async for doc in cursor.sort("score", -1).limit(limit)}
+
+
+class SpendingWeekRepository(Repository):
+    """One document per (user_id, week) with the week's total and per-category totals"""
+
+    collection_name = "spending_weekly"
+    indexes = (IndexSpec("user_week", (("user_id", 1), ("week_start", -1)), unique=True),)
+
+    async def increment(self, user_id: str, deltas: Dict[date, Dict[str, float]]) -> None:
+        from pymongo import UpdateOne
+
+        ops = []
+        for week, categories in deltas.items():
+            inc = {f"categories.{category}": amount for category, amount in categories.items()}
+            inc["total"] = sum(categories.values())
+            ops.append(UpdateOne(
+                {"user_id": user_id, "week_start": datetime.combine(week, datetime.min.time(), timezone.utc)},
+                {"$inc": inc},
+                upsert=True,
+            ))
+        if ops:
+            await self.collection().bulk_write(ops, ordered=False)
+
+    async def weeks(self, user_id: str, since: date) -> Dict[date, Dict[str, float]]:
+        cursor = self.collection().find(
+            {"user_id": user_id, "week_start": {"$gte": datetime.combine(since, datetime.min.time(), timezone.utc)}},
+            {"_id": 0, "week_start": 1, "categories": 1},
+        )
+        return {doc["week_start"].date(): doc.get("categories", {}) async for doc in cursor}
+
+
+class WorkflowCheckpointRepository(Repository):
+    """Step outputs of checkpointed workflows, one document per (workflow_id, step)"""
+
+    collection_name = "workflow_checkpoints"
+    indexes = (IndexSpec("workflow_step", (("workflow_id", 1), ("step", 1)), unique=True),)
+
+
+# Shared repositories
+pantry_items = PantryRepository()
+meal_history = MealHistoryRepository()
+grocery_transactions = GroceryTransactionRepository()
+price_snapshots = PriceSnapshotRepository()
+preference_scores = PreferenceScoreRepository()
+spending_weeks = SpendingWeekRepository()
+workflow_checkpoints = WorkflowCheckpointRepository()
+
+REPOSITORIES: Tuple[Repository, ...] = (
+    pantry_items, meal_history, grocery_transactions, price_snapshots, preference_scores, spending_weeks,
+    workflow_checkpoints,
+)
+
+
+async def ensure_indexes(repositories: Iterable[Repository] = REPOSITORIES) -> None:
+    """Create every repository's indexes; existing indexes are left as they are"""
+    await asyncio.gather(*(repository.ensure_indexes() for repository in repositories))
@@ -0,0 +1,192 @@
+"""
+Grocery list compilation
+Deterministically aggregates a meal plan's ingredients into a shopping list:
+names are canonicalized through an alias index, quantities are summed in
+normalized units and pantry stock is subtracted.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import re
+
+from .units import convert
+
+# Alternative spellings -> canonical ingredient name
+INGREDIENT_ALIASES = {
+    "bell pepper": "bell peppers",
+    "red pepper": "bell peppers",
+    "red bell pepper": "bell peppers",
+    "green pepper": "bell peppers",
+    "broccoli florets": "broccoli",
+    "broccoli crowns": "broccoli",
+    "egg": "eggs",
+    "large eggs": "eggs",
+    "whole milk": "milk",
+    "2% milk": "milk",
+    "scallion": "green onions",
+    "scallions": "green onions",
+    "spring onions": "green onions",
+    "garlic cloves": "garlic",
+    "clove garlic": "garlic",
+    "parmesan cheese": "parmesan",
+    "parmigiano reggiano": "parmesan",
+    "grape tomatoes": "cherry tomatoes",
+    "spaghetti": "pasta",
+    "penne": "pasta",
+    "extra virgin olive oil": "olive oil",
+    "evoo": "olive oil",
+    "low sodium soy sauce": "soy sauce",
+    "chicken breasts": "chicken breast",
+    "boneless chicken breast": "chicken breast",
+    "ground beef": "beef",
+    "canned_goods": "canned goods",
+}
+
+# Canonical ingredient name -> grocery category
+INGREDIENT_CATEGORIES = {
+    "produce": [
+        "broccoli", "bell peppers", "cherry tomatoes", "tomato", "onion", "green onions",
+        "garlic", "lettuce", "spinach", "carrots", "avocado", "lemon", "lime", "banana",
+        "cilantro", "potatoes", "mushrooms", "zucchini", "ginger",
+    ],
+    "dairy": ["milk", "eggs", "butter", "cream", "yogurt", "parmesan", "cheddar", "mozzarella"],
+    "meat": ["chicken breast", "chicken thighs", "beef", "pork", "bacon", "turkey"],
+    "seafood": ["salmon", "shrimp", "tuna", "cod"],
+    "bakery": ["bread", "tortillas", "buns"],
+    "pantry": [
+        "pasta", "rice", "flour", "sugar", "soy sauce", "olive oil", "vegetable oil",
+        "honey", "canned goods", "beans", "oats", "salt", "pepper",
+    ],
+}
+CATEGORY_INDEX = {name: category for category, names in INGREDIENT_CATEGORIES.items() for name in names}
+
+# Default purchase for running-low staples that no recipe calls for
+RESTOCK_QUANTITIES = {
+    "milk": (1, "gallon"),
+    "eggs": (12, "count"),
+    "bread": (1, "each"),
+    "butter": (1, "lb"),
+    "rice": (2, "lb"),
+    "pasta": (1, "lb"),
+}
+
+
+@lru_cache(maxsize=4096)
+def canonical_name(name: str) -> str:
+    """Map an ingredient name to its canonical form"""
+    key = re.sub(r"\s+", " ", name.strip().lower())
+    return INGREDIENT_ALIASES.get(key, key)
+
+
+def meal_key(meal: Dict[str, Any]) -> str:
+    """Identifier of a meal within a weekly plan, e.g. ``monday:dinner``"""
+    return f"{meal.get('day', '')}:{meal.get('meal_type', '')}"
+
+
+class _Line:
+    """Running total for one ingredient, kept in the first unit it was seen in"""
+
+    __slots__ = ("name", "unit", "quantity", "category", "meals", "unit_conflicts")
+
+    def __init__(self, name: str, unit: str, category: str):
+        self.name = name
+        self.unit = unit
+        self.quantity = 0.0
+        self.category = category
+        self.meals: List[str] = []
+        # Quantities that cannot be converted to ``unit`` (e.g. "can" vs "g")
+        self.unit_conflicts: List[Dict[str, Any]] = []
+
+    def add(self, quantity: float, unit: str, meal: str = "") -> None:
+        """Add a quantity, flagging it as a unit conflict if it does not convert"""
+        if unit != self.unit:
+            try:
+                quantity = convert(quantity, unit, self.unit, self.name)
+            except ValueError:
+                self.unit_conflicts.append({"quantity": quantity, "unit": unit, "meal": meal})
+                return
+        self.quantity += quantity
+
+
+def aggregate_ingredients(meals: Iterable[Dict[str, Any]]) -> List[_Line]:
+    """Sum every meal's ingredients per canonical name in normalized units
+
+    Every consumer keys lines by name, so each ingredient gets exactly one
+    line; quantities in units that cannot be converted to it are kept in
+    ``unit_conflicts`` rather than on a second line.
+    """
+    lines: Dict[str, _Line] = {}
+    for meal in meals:
+        key = meal_key(meal)
+        for ingredient in meal.get("ingredients", []):
+            name = canonical_name(ingredient["name"])
+            unit = ingredient.get("unit") or "count"
+            quantity = float(ingredient.get("quantity") or 0)
+            line = lines.get(name)
+            if line is None:
+                category = ingredient.get("category") or CATEGORY_INDEX.get(name, "other")
+                line = lines[name] = _Line(name, unit, category)
+            line.add(quantity, unit, key)
+            if key not in line.meals:
+                line.meals.append(key)
+    return list(lines.values())
+
+
+def _pantry_stock(pantry: Dict[str, Any]) -> Tuple[Dict[str, List[Tuple[float, str]]], set, set]:
+    """Pantry quantities by canonical name, plus well-stocked and running-low names"""
+    stock: Dict[str, List[Tuple[float, str]]] = {}
+    for item in pantry.get("items", []):
+        quantity = item.get("quantity", item.get("current_quantity"))
+        if quantity is not None:
+            stock.setdefault(canonical_name(item["name"]), []).append((float(quantity), item.get("unit") or "count"))
+    well_stocked = {canonical_name(name) for name in pantry.get("well_stocked", [])}
+    running_low = {canonical_name(name) for name in pantry.get("running_low", [])}
+    return stock, well_stocked, running_low
+
+
+def compile_grocery_list(meal_plan: Dict[str, Any], pantry: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build the grocery list for a meal plan, net of pantry stock.
+
+    Items fully covered by the pantry are kept with ``in_pantry: True`` so the
+    list still shows what the plan uses; everything else carries the quantity
+    left to buy. Quantities that could not be converted to the line's unit
+    are listed under ``unit_conflicts`` for review. Running-low staples that
+    no recipe calls for are added as restock lines.
+    """
+    stock, well_stocked, running_low = _pantry_stock(pantry or {})
+    items = []
+
+    for line in aggregate_ingredients(meal_plan.get("meals", [])):
+        needed = line.quantity
+        if line.name in well_stocked:
+            needed = 0.0
+        for quantity, unit in stock.get(line.name, []):
+            try:
+                needed -= quantity if unit == line.unit else convert(quantity, unit, line.unit, line.name)
+            except ValueError:
+                continue
+        item = {
+            "name": line.name,
+            "quantity": round(max(needed, 0.0) if needed > 1e-9 else line.quantity, 2),
+            "unit": line.unit,
+            "category": line.category,
+            "in_pantry": needed <= 1e-9,
+            "meals": line.meals,
+        }
+        if line.unit_conflicts:
+            item["unit_conflicts"] = line.unit_conflicts
+        items.append(item)
+
+    planned = {item["name"] for item in items}
+    for name in sorted(running_low - planned):
+        quantity, unit = RESTOCK_QUANTITIES.get(name, (1, "count"))
+        items.append({
+            "name": name,
+            "quantity": quantity,
+            "unit": unit,
+            "category": CATEGORY_INDEX.get(name, "other"),
+            "in_pantry": False,
+            "meals": [],
+        })
+
+    return {"items": items, "status": "draft"}
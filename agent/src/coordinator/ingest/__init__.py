@@ -0,0 +1,37 @@
+"""Incremental ingestion of external data for Edwardo system"""
+
+from .plaid import (
+    LocalPlaid,
+    LocalTransactionStore,
+    MCPPlaidClient,
+    PlaidSync,
+    SyncPage,
+    default_plaid_client,
+    plaid_sync,
+)
+from .receipts import (
+    LocalGmail,
+    MCPGmailClient,
+    ReceiptIngestion,
+    ReceiptStore,
+    default_gmail_client,
+    parse_receipt,
+    receipt_ingestion,
+)
+
+__all__ = [
+    "LocalPlaid",
+    "LocalTransactionStore",
+    "MCPPlaidClient",
+    "PlaidSync",
+    "SyncPage",
+    "default_plaid_client",
+    "plaid_sync",
+    "LocalGmail",
+    "MCPGmailClient",
+    "ReceiptIngestion",
+    "ReceiptStore",
+    "default_gmail_client",
+    "parse_receipt",
+    "receipt_ingestion",
+]
@@ -0,0 +1,18 @@
+"""
+MCP tool results
+Reading the JSON payload out of a pooled MCP tool response, shared by the
+ingestion clients.
+"""
+
+from typing import Any, Dict
+import json
+
+
+def tool_payload(response: Dict[str, Any]) -> Any:
+    """A tool result's structuredContent, else the JSON in its first text content"""
+    payload = response.get("structuredContent")
+    if payload is None:
+        for content in response.get("content", []):
+            if content.get("type") == "text":
+                return json.loads(content["text"])
+    return payload
@@ -0,0 +1,394 @@
+"""
+Incremental Plaid transaction sync
+Pulls only new, modified and removed transactions since a per-user cursor
+(Plaid's transactions/sync model), categorizes each merchant once, and keeps
+every change in a local append-only table. Context gathering reads that
+table and the spending aggregates, never the full transaction history.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+
+from ..config import settings
+from ..runtime.limits import rate_limits
+from ..runtime.sqlite import SQLiteStore
+from ..spending import SpendingAnalytics, spending_analytics
+from .mcp import tool_payload
+
+logger = logging.getLogger(__name__)
+
+# Merchant categories that count as grocery spending
+GROCERY_CATEGORIES = ("supermarket", "warehouse_club", "grocery_delivery", "specialty_food")
+
+
+def normalize_merchant(name: str) -> str:
+    return " ".join(name.lower().split())
+
+
+def is_grocery(category: str) -> bool:
+    category = category.lower().replace(" ", "_")
+    return category in GROCERY_CATEGORIES or "grocer" in category
+
+
+@dataclass
+class SyncPage:
+    """One page of changes after a cursor"""
+
+    added: List[Dict[str, Any]] = field(default_factory=list)
+    modified: List[Dict[str, Any]] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    next_cursor: str = ""
+    has_more: bool = False
+
+
+class MCPPlaidClient:
+    """transactions/sync and categorization through the pooled Plaid MCP server"""
+
+    async def sync(self, user_id: str, cursor: str, count: int) -> SyncPage:
+        from ..tools.tools import mcp_pool
+
+        await rate_limits.acquire("plaid")
+        response = await mcp_pool.call_tool(
+            "plaid", "plaid_sync_transactions", {"user_id": user_id, "cursor": cursor, "count": count}
+        )
+        if response.get("isError"):
+            raise RuntimeError(f"plaid_sync_transactions failed: {response.get('content')}")
+        payload = tool_payload(response) or {}
+        return SyncPage(
+            added=payload.get("added", []),
+            modified=payload.get("modified", []),
+            removed=[
+                removed["transaction_id"] if isinstance(removed, dict) else removed
+                for removed in payload.get("removed", [])
+            ],
+            next_cursor=payload.get("next_cursor", cursor),
+            has_more=bool(payload.get("has_more")),
+        )
+
+    async def categorize(self, transaction: Dict[str, Any]) -> str:
+        from ..tools.tools import mcp_pool
+
+        await rate_limits.acquire("plaid")
+        response = await mcp_pool.call_tool("plaid", "plaid_categorize_transaction", {
+            "transaction_id": transaction["transaction_id"],
+            "merchant_name": transaction.get("merchant_name") or transaction.get("name", ""),
+            "amount": transaction.get("amount", 0.0),
+        })
+        payload = tool_payload(response) or {}
+        return str(payload.get("category") or "other") if isinstance(payload, dict) else "other"
+
+
+class LocalPlaid:
+    """
+    In-process stand-in for Plaid, for demos, offline runs and tests
+    Each user gets a deterministic transaction history; ``post``, ``modify``
+    and ``remove`` append to the change log that ``sync`` pages through.
+    Call counters show how much a sync actually downloaded.
+    """
+
+    MERCHANTS = (
+        ("Safeway", "supermarket"),
+        ("Whole Foods Market", "supermarket"),
+        ("Trader Joe's", "supermarket"),
+        ("Costco", "warehouse_club"),
+        ("Instacart", "grocery_delivery"),
+        ("Chipotle", "restaurant"),
+        ("Shell", "gas"),
+        ("Netflix", "subscription"),
+    )
+
+    def __init__(self, history_days: int = 90, today: Optional[date] = None):
+        self.history_days = history_days
+        self.today = today or date.today()
+        self._logs: Dict[str, List[tuple]] = {}
+        self._serial = 0
+        self.stats = {"sync_calls": 0, "transactions_sent": 0, "categorize_calls": 0}
+
+    def _log(self, user_id: str) -> List[tuple]:
+        if user_id not in self._logs:
+            self._logs[user_id] = []
+            for offset in range(self.history_days, 0, -1):
+                digest = hashlib.sha256(f"{user_id}|{offset}".encode()).digest()
+                merchant = self.MERCHANTS[digest[0] % len(self.MERCHANTS)][0]
+                self.post(user_id, merchant, round(5 + digest[1] / 255 * 95, 2), self.today - timedelta(days=offset))
+        return self._logs[user_id]
+
+    def post(self, user_id: str, merchant: str, amount: float, on: Optional[date] = None) -> Dict[str, Any]:
+        self._serial += 1
+        transaction = {
+            "transaction_id": f"txn_{self._serial:08d}",
+            "date": (on or self.today).isoformat(),
+            "amount": amount,
+            "merchant_name": merchant,
+            "name": merchant.upper(),
+        }
+        self._log(user_id).append(("added", transaction))
+        return transaction
+
+    def modify(self, user_id: str, transaction: Dict[str, Any], **changes: Any) -> Dict[str, Any]:
+        updated = {**transaction, **changes}
+        self._log(user_id).append(("modified", updated))
+        return updated
+
+    def remove(self, user_id: str, transaction_id: str) -> None:
+        self._log(user_id).append(("removed", transaction_id))
+
+    async def sync(self, user_id: str, cursor: str, count: int) -> SyncPage:
+        log = self._log(user_id)
+        start = int(cursor or 0)
+        changes = log[start:start + count]
+        self.stats["sync_calls"] += 1
+        self.stats["transactions_sent"] += len(changes)
+        # Like Plaid, a page reports each transaction once, in its final state
+        final: Dict[str, tuple] = {}
+        for op, change in changes:
+            transaction_id = change if op == "removed" else change["transaction_id"]
+            earlier = final.get(transaction_id, (None,))[0]
+            if earlier == "added" and op == "removed":
+                del final[transaction_id]
+            else:
+                final[transaction_id] = ("added" if earlier == "added" else op, change)
+        page = SyncPage(next_cursor=str(start + len(changes)), has_more=start + len(changes) < len(log))
+        for op, change in final.values():
+            if op == "removed":
+                page.removed.append(change)
+            else:
+                getattr(page, op).append(dict(change))
+        return page
+
+    async def categorize(self, transaction: Dict[str, Any]) -> str:
+        self.stats["categorize_calls"] += 1
+        merchant = transaction.get("merchant_name") or transaction.get("name", "")
+        return dict(self.MERCHANTS).get(merchant, "other")
+
+
+class LocalTransactionStore(SQLiteStore):
+    """
+    Append-only SQLite copy of each user's Plaid transactions
+    Every added, modified or removed transaction is a new row; a user's
+    current transactions are the latest row per transaction_id. A page of
+    rows, the cursor after it and the page's spending deltas still to be
+    written to the aggregates are committed together.
+    """
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS plaid_transactions (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            transaction_id TEXT NOT NULL,
+            op TEXT NOT NULL,
+            payload TEXT
+        );
+        CREATE INDEX IF NOT EXISTS plaid_transactions_user
+            ON plaid_transactions (user_id, transaction_id, seq);
+        CREATE TABLE IF NOT EXISTS plaid_cursors (
+            user_id TEXT PRIMARY KEY,
+            cursor TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS merchant_categories (
+            merchant TEXT PRIMARY KEY,
+            category TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS pending_spending (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            deltas TEXT NOT NULL
+        );
+    """
+
+    async def cursor(self, user_id: str) -> str:
+        rows = await self._run("SELECT cursor FROM plaid_cursors WHERE user_id = ?", (user_id,))
+        return rows[0][0] if rows else ""
+
+    async def append(self, user_id: str, page: SyncPage, spending: Optional[List[Dict[str, Any]]] = None) -> None:
+        """Record a page of changes and advance the user's cursor past it
+
+        ``spending`` deltas are queued in the same transaction until
+        ``clear_spending`` confirms they reached the aggregates.
+        """
+        rows = [
+            (user_id, transaction["transaction_id"], op, json.dumps(transaction, separators=(",", ":")))
+            for op, transactions in (("added", page.added), ("modified", page.modified))
+            for transaction in transactions
+        ]
+        rows.extend((user_id, transaction_id, "removed", None) for transaction_id in page.removed)
+
+        def write(conn: sqlite3.Connection) -> None:
+            conn.executemany(
+                "INSERT INTO plaid_transactions (user_id, transaction_id, op, payload) VALUES (?, ?, ?, ?)", rows
+            )
+            conn.execute(
+                "INSERT INTO plaid_cursors VALUES (?, ?) ON CONFLICT(user_id) DO UPDATE SET cursor = excluded.cursor",
+                (user_id, page.next_cursor),
+            )
+            if spending:
+                conn.execute(
+                    "INSERT INTO pending_spending (user_id, deltas) VALUES (?, ?)",
+                    (user_id, json.dumps(spending, separators=(",", ":"))),
+                )
+
+        await self._write(write)
+
+    async def pending_spending(self, user_id: str) -> List[Tuple[int, List[Dict[str, Any]]]]:
+        """Queued spending deltas not yet written to the aggregates, oldest first"""
+        rows = await self._run("SELECT seq, deltas FROM pending_spending WHERE user_id = ? ORDER BY seq", (user_id,))
+        return [(seq, json.loads(deltas)) for seq, deltas in rows]
+
+    async def clear_spending(self, seq: int) -> None:
+        await self._run("DELETE FROM pending_spending WHERE seq = ?", (seq,))
+
+    async def current(self, user_id: str, transaction_ids: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Latest version of the user's transactions (or just ``transaction_ids``), removed ones excluded"""
+        if transaction_ids is not None and not transaction_ids:
+            return {}
+        sql = (
+            "SELECT t.transaction_id, t.payload FROM plaid_transactions t JOIN ("
+            " SELECT MAX(seq) AS seq FROM plaid_transactions WHERE user_id = ?{} GROUP BY transaction_id"
+            ") latest ON t.seq = latest.seq WHERE t.op != 'removed'"
+        )
+        params: tuple = (user_id,)
+        if transaction_ids is None:
+            sql = sql.format("")
+        else:
+            sql = sql.format(f" AND transaction_id IN ({','.join('?' * len(transaction_ids))})")
+            params += tuple(transaction_ids)
+        return {transaction_id: json.loads(payload) for transaction_id, payload in await self._run(sql, params)}
+
+    async def merchant_categories(self) -> Dict[str, str]:
+        return dict(await self._run("SELECT merchant, category FROM merchant_categories"))
+
+    async def save_merchant_category(self, merchant: str, category: str) -> None:
+        await self._run("INSERT OR REPLACE INTO merchant_categories VALUES (?, ?)", (merchant, category))
+
+
+class PlaidSync:
+    """
+    Incremental sync engine
+    Each ``sync`` pages from the user's stored cursor until Plaid has nothing
+    newer, categorizes merchants it has not seen before, appends the changes
+    locally and folds the resulting spending deltas into the aggregates.
+    With a persistent aggregate store, each page's deltas are queued with the
+    page and written afterwards; deltas a failed write left queued are
+    replayed on the next sync, so the cursor never runs ahead of the totals.
+    """
+
+    def __init__(self, client: Any, store: LocalTransactionStore,
+                 analytics: SpendingAnalytics = spending_analytics, page_size: Optional[int] = None):
+        self.client = client
+        self.store = store
+        self.analytics = analytics
+        self.page_size = page_size or settings.plaid_sync_page_size
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._categories: Optional[Dict[str, str]] = None
+        self._categorizing: Dict[str, asyncio.Task] = {}
+        self.stats = {"syncs": 0, "pages": 0, "added": 0, "modified": 0, "removed": 0,
+                      "category_hits": 0, "category_lookups": 0}
+
+    async def sync(self, user_id: str) -> Dict[str, int]:
+        """Bring a user's local transactions up to date; returns the changes applied"""
+        lock = self._locks.setdefault(user_id, asyncio.Lock())
+        async with lock:
+            await self._warm(user_id)
+            cursor = await self.store.cursor(user_id)
+            applied = {"added": 0, "modified": 0, "removed": 0}
+            while True:
+                page = await self.client.sync(user_id, cursor, self.page_size)
+                await self._categorize(page.added + page.modified)
+                changed_ids = [t["transaction_id"] for t in page.added + page.modified] + page.removed
+                previous = await self.store.current(user_id, changed_ids)
+                spending = self._spending_deltas(page, previous)
+                await self.store.append(user_id, page, spending if self.analytics.store is not None else None)
+                await self.analytics.ingest(user_id, spending, persist=False)
+
+                for key in applied:
+                    applied[key] += len(getattr(page, key))
+                self.stats["pages"] += 1
+                cursor = page.next_cursor
+                if not page.has_more:
+                    break
+            await self._flush_spending(user_id)
+            self.stats["syncs"] += 1
+            for key, count in applied.items():
+                self.stats[key] += count
+            return applied
+
+    async def _warm(self, user_id: str) -> None:
+        """Rebuild a user's spending aggregates from the local copy after a restart"""
+        if self.analytics.tracks(user_id):
+            return
+        if self.analytics.store is not None:
+            await self.analytics.load(user_id)
+            # Queued deltas are in the local copy but not yet in the stored buckets
+            for _, spending in await self.store.pending_spending(user_id):
+                await self.analytics.ingest(user_id, spending, persist=False)
+            return
+        transactions = (await self.store.current(user_id)).values()
+        await self.analytics.ingest(user_id, [
+            transaction for transaction in transactions if is_grocery(transaction.get("category", ""))
+        ])
+
+    async def _flush_spending(self, user_id: str) -> None:
+        """Write queued spending deltas to the aggregates, oldest first; a failure leaves the rest for the next sync"""
+        for seq, spending in await self.store.pending_spending(user_id):
+            try:
+                await self.analytics.persist(user_id, spending)
+            except Exception as e:
+                logger.warning("spending_weekly unavailable, deltas kept for the next sync: %s", e)
+                return
+            await self.store.clear_spending(seq)
+
+    async def _categorize(self, transactions: List[Dict[str, Any]]) -> None:
+        """Set ``category`` on each transaction, calling the categorizer once per unseen merchant"""
+        if self._categories is None:
+            self._categories = await self.store.merchant_categories()
+        for transaction in transactions:
+            merchant = normalize_merchant(transaction.get("merchant_name") or transaction.get("name", ""))
+            if merchant in self._categories:
+                self.stats["category_hits"] += 1
+            elif merchant not in self._categorizing:
+                self._categorizing[merchant] = asyncio.create_task(self._lookup(merchant, transaction))
+        if self._categorizing:
+            await asyncio.gather(*list(self._categorizing.values()), return_exceptions=True)
+        for transaction in transactions:
+            merchant = normalize_merchant(transaction.get("merchant_name") or transaction.get("name", ""))
+            transaction["category"] = self._categories.get(merchant, "other")
+
+    async def _lookup(self, merchant: str, transaction: Dict[str, Any]) -> None:
+        try:
+            category = await self.client.categorize(transaction)
+            self.stats["category_lookups"] += 1
+            self._categories[merchant] = category
+            await self.store.save_merchant_category(merchant, category)
+        except Exception as e:
+            logger.warning("Categorizing %s failed: %s", merchant, e)
+        finally:
+            self._categorizing.pop(merchant, None)
+
+    def _spending_deltas(self, page: SyncPage, previous: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Grocery spending changes: new amounts in, replaced and removed amounts out"""
+        deltas = []
+        for transaction in page.added + page.modified:
+            old = previous.get(transaction["transaction_id"])
+            if old is not None and is_grocery(old.get("category", "")):
+                deltas.append({**old, "amount": -float(old["amount"])})
+            if is_grocery(transaction["category"]):
+                deltas.append(transaction)
+        for transaction_id in page.removed:
+            old = previous.get(transaction_id)
+            if old is not None and is_grocery(old.get("category", "")):
+                deltas.append({**old, "amount": -float(old["amount"])})
+        return deltas
+
+
+def default_plaid_client() -> Any:
+    return MCPPlaidClient() if settings.plaid_client_id else LocalPlaid()
+
+
+# Shared sync engine
+plaid_sync = PlaidSync(default_plaid_client(), LocalTransactionStore(settings.plaid_sync_path))
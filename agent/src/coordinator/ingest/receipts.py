@@ -0,0 +1,385 @@
+"""
+Incremental Gmail receipt ingestion
+Remembers the newest message processed per user, so each run only searches
+Gmail for mail that arrived since. New messages are fetched in batches,
+parsed across a process pool while the next batch downloads, and stored
+once; a message already in the store is never fetched or parsed again.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from html import unescape
+from typing import Any, Dict, List, Optional, Set, Tuple
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import re
+import sqlite3
+
+from ..config import settings
+from ..grocery import CATEGORY_INDEX, canonical_name
+from ..runtime.limits import rate_limits
+from ..runtime.sqlite import SQLiteStore
+from .mcp import tool_payload
+
+logger = logging.getLogger(__name__)
+
+RECEIPT_QUERY = "subject:(receipt OR order) from:(instacart OR wholefoods OR safeway OR costco OR traderjoes)"
+
+# Batches smaller than this are parsed in-process; the pool round trip costs more
+POOL_MIN_BATCH = 64
+
+# forkserver is not available on Windows
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+_BLOCK_TAG = re.compile(r"<(?:/?(?:p|div|tr|li|h\d|table|body)|br)\b[^>]*>", re.IGNORECASE)
+_TAG = re.compile(r"<[^>]+>")
+_ITEM = re.compile(
+    r"^(?P<name>[a-z][a-z '&-]*?)\s+(?P<quantity>\d+(?:\.\d+)?)\s*(?P<unit>[a-z ]*?)\s+x\s+\$(?P<price>\d+(?:\.\d{1,2})?)$"
+)
+_TOTAL = re.compile(r"^total:?\s*\$(?P<total>[\d,]+(?:\.\d{1,2})?)$")
+_MERCHANT = re.compile(r"^your (?P<merchant>.+?) (?:order )?receipt$")
+
+
+def parse_receipt(message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Structured receipt from a message, or None if it is not a receipt
+    Bodies may be HTML or plain text; item lines read
+    ``<name> <quantity> <unit> x $<price>`` and a ``Total: $<amount>`` line
+    is required.
+    """
+    text = unescape(_TAG.sub(" ", _BLOCK_TAG.sub("\n", message.get("body", ""))))
+    merchant = message.get("from", "")
+    items = []
+    total = None
+    for raw in text.splitlines():
+        line = " ".join(raw.split()).lower()
+        if not line:
+            continue
+        match = _TOTAL.match(line)
+        if match:
+            total = float(match["total"].replace(",", ""))
+            continue
+        match = _MERCHANT.match(line)
+        if match:
+            merchant = match["merchant"].title()
+            continue
+        match = _ITEM.match(line)
+        if match:
+            name = canonical_name(match["name"])
+            items.append({
+                "name": name,
+                "quantity": float(match["quantity"]),
+                "unit": match["unit"].strip() or "each",
+                "price": float(match["price"]),
+                "category": CATEGORY_INDEX.get(name, "other"),
+            })
+    if total is None:
+        return None
+    purchased = datetime.fromtimestamp(message["internal_date"] / 1000, timezone.utc).date()
+    return {"merchant": merchant, "date": purchased.isoformat(), "total": total, "items": items}
+
+
+def parse_messages(messages: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+    """Parse a chunk of messages; runs in a worker process"""
+    return [parse_receipt(message) for message in messages]
+
+
+class MCPGmailClient:
+    """Receipt search and batched message fetches through the pooled Gmail MCP server"""
+
+    async def search(self, user_id: str, after_ms: int, page_token: Optional[str],
+                     page_size: int) -> Tuple[List[str], Optional[str]]:
+        from ..tools.tools import mcp_pool
+
+        query = RECEIPT_QUERY + (f" after:{after_ms // 1000 - 1}" if after_ms else "")
+        args: Dict[str, Any] = {"query": query, "max_results": page_size}
+        if page_token:
+            args["page_token"] = page_token
+        await rate_limits.acquire("gmail")
+        payload = tool_payload(await mcp_pool.call_tool("gmail", "gmail_search_messages", args)) or {}
+        return [message["id"] for message in payload.get("messages", [])], payload.get("next_page_token")
+
+    async def get_batch(self, user_id: str, message_ids: List[str]) -> List[Dict[str, Any]]:
+        from ..tools.tools import mcp_pool
+
+        await rate_limits.acquire("gmail")
+        response = await mcp_pool.call_tool("gmail", "gmail_batch_get_messages", {"message_ids": message_ids})
+        if response.get("isError"):
+            raise RuntimeError(f"gmail_batch_get_messages failed: {response.get('content')}")
+        payload = tool_payload(response) or {}
+        return [
+            {
+                "id": message["id"],
+                "internal_date": int(message.get("internal_date") or message.get("internalDate") or 0),
+                "from": message.get("from", ""),
+                "subject": message.get("subject", ""),
+                "body": message.get("body", ""),
+            }
+            for message in payload.get("messages", [])
+        ]
+
+
+class LocalGmail:
+    """
+    In-process stand-in for a Gmail mailbox, for demos, offline runs and tests
+    Each user gets ``years`` of deterministic receipts (HTML bodies) about
+    every ``receipt_every_days`` days; ``deliver`` adds a new one. Search
+    returns newest first, like Gmail. Counters show what a run downloaded.
+    """
+
+    STORES = ("Safeway", "Whole Foods", "Costco", "Trader Joes", "Instacart")
+    ITEMS = (
+        ("milk", 1, "gallon", 3.49), ("eggs", 12, "count", 4.99), ("bread", 1, "each", 3.29),
+        ("chicken breast", 2, "lb", 9.98), ("broccoli", 1, "head", 2.49), ("rice", 2, "lb", 3.18),
+        ("cheddar", 8, "oz", 4.29), ("apples", 3, "lb", 5.37), ("pasta", 1, "lb", 1.99),
+        ("salmon", 1, "lb", 12.99), ("spinach", 10, "oz", 3.99), ("yogurt", 32, "oz", 5.49),
+    )
+
+    def __init__(self, years: float = 1.0, receipt_every_days: float = 2.0,
+                 now: Optional[datetime] = None, latency_seconds: float = 0.0):
+        self.years = years
+        self.receipt_every_days = receipt_every_days
+        self.now = now or datetime.now(timezone.utc)
+        self.latency_seconds = latency_seconds
+        self._mailboxes: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._serial = 0
+        self.stats = {"search_calls": 0, "batch_calls": 0, "messages_fetched": 0}
+
+    def _mailbox(self, user_id: str) -> Dict[str, Dict[str, Any]]:
+        if user_id not in self._mailboxes:
+            self._mailboxes[user_id] = {}
+            count = int(self.years * 365 / self.receipt_every_days)
+            for n in range(count, 0, -1):
+                self.deliver(user_id, self.now - timedelta(days=n * self.receipt_every_days))
+        return self._mailboxes[user_id]
+
+    def deliver(self, user_id: str, at: Optional[datetime] = None) -> Dict[str, Any]:
+        """Add a receipt to the user's mailbox"""
+        self._serial += 1
+        digest = hashlib.sha256(f"{user_id}|{self._serial}".encode()).digest()
+        store = self.STORES[digest[0] % len(self.STORES)]
+        lines = [self.ITEMS[(digest[1] + i * 7) % len(self.ITEMS)] for i in range(4 + digest[2] % 20)]
+        rows = "".join(
+            f"<tr><td>{name}</td><td>{quantity} {unit} x ${price:.2f}</td></tr>" for name, quantity, unit, price in lines
+        )
+        total = sum(price for _, _, _, price in lines)
+        message = {
+            "id": f"msg_{self._serial:010d}",
+            "internal_date": int((at or self.now).timestamp() * 1000),
+            "from": f"receipts@{store.lower().replace(' ', '')}.com",
+            "subject": f"Your {store} receipt",
+            "body": f"<html><body><h1>Your {store} receipt</h1><table>{rows}</table>"
+                    f"<p>Total: ${total:.2f}</p></body></html>",
+        }
+        self._mailbox(user_id)[message["id"]] = message
+        return message
+
+    async def search(self, user_id: str, after_ms: int, page_token: Optional[str],
+                     page_size: int) -> Tuple[List[str], Optional[str]]:
+        self.stats["search_calls"] += 1
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        matches = sorted(
+            (m for m in self._mailbox(user_id).values() if m["internal_date"] >= after_ms),
+            key=lambda m: m["internal_date"], reverse=True,
+        )
+        start = int(page_token or 0)
+        ids = [m["id"] for m in matches[start:start + page_size]]
+        return ids, str(start + page_size) if start + page_size < len(matches) else None
+
+    async def get_batch(self, user_id: str, message_ids: List[str]) -> List[Dict[str, Any]]:
+        self.stats["batch_calls"] += 1
+        self.stats["messages_fetched"] += len(message_ids)
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        mailbox = self._mailbox(user_id)
+        return [dict(mailbox[message_id]) for message_id in message_ids if message_id in mailbox]
+
+
+class ReceiptStore(SQLiteStore):
+    """
+    Processed messages and extracted receipts per user
+    Every processed message is recorded, receipt or not, so nothing is
+    extracted twice; the checkpoint holds the newest message fully ingested.
+    """
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS gmail_messages (
+            user_id TEXT NOT NULL,
+            message_id TEXT NOT NULL,
+            internal_date INTEGER NOT NULL,
+            is_receipt INTEGER NOT NULL,
+            PRIMARY KEY (user_id, message_id)
+        );
+        CREATE TABLE IF NOT EXISTS receipts (
+            user_id TEXT NOT NULL,
+            message_id TEXT NOT NULL,
+            merchant TEXT NOT NULL,
+            purchased_on TEXT NOT NULL,
+            total REAL NOT NULL,
+            items TEXT NOT NULL,
+            PRIMARY KEY (user_id, message_id)
+        );
+        CREATE INDEX IF NOT EXISTS receipts_user_date ON receipts (user_id, purchased_on);
+        CREATE TABLE IF NOT EXISTS gmail_checkpoints (
+            user_id TEXT PRIMARY KEY,
+            internal_date INTEGER NOT NULL,
+            message_id TEXT NOT NULL
+        );
+    """
+
+    async def checkpoint(self, user_id: str) -> Tuple[int, str]:
+        rows = await self._run("SELECT internal_date, message_id FROM gmail_checkpoints WHERE user_id = ?", (user_id,))
+        return (rows[0][0], rows[0][1]) if rows else (0, "")
+
+    async def advance(self, user_id: str, internal_date: int, message_id: str) -> None:
+        await self._run(
+            "INSERT INTO gmail_checkpoints VALUES (?, ?, ?) ON CONFLICT(user_id) DO UPDATE SET "
+            "internal_date = excluded.internal_date, message_id = excluded.message_id "
+            "WHERE excluded.internal_date > gmail_checkpoints.internal_date",
+            (user_id, internal_date, message_id),
+        )
+
+    async def known(self, user_id: str, message_ids: List[str]) -> Set[str]:
+        if not message_ids:
+            return set()
+        rows = await self._run(
+            f"SELECT message_id FROM gmail_messages WHERE user_id = ? AND message_id IN ({','.join('?' * len(message_ids))})",
+            (user_id, *message_ids),
+        )
+        return {row[0] for row in rows}
+
+    async def save(self, user_id: str, messages: List[Dict[str, Any]],
+                   receipts: List[Optional[Dict[str, Any]]]) -> None:
+        """Record a batch of processed messages and their receipts in one transaction"""
+        processed = [
+            (user_id, message["id"], message["internal_date"], int(receipt is not None))
+            for message, receipt in zip(messages, receipts)
+        ]
+        rows = [
+            (user_id, message["id"], receipt["merchant"], receipt["date"], receipt["total"],
+             json.dumps(receipt["items"], separators=(",", ":")))
+            for message, receipt in zip(messages, receipts) if receipt is not None
+        ]
+
+        def write(conn: sqlite3.Connection) -> None:
+            conn.executemany("INSERT OR IGNORE INTO gmail_messages VALUES (?, ?, ?, ?)", processed)
+            conn.executemany("INSERT OR IGNORE INTO receipts VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+        await self._write(write)
+
+    async def recent(self, user_id: str, since: date, limit: int = 20) -> List[Dict[str, Any]]:
+        rows = await self._run(
+            "SELECT merchant, purchased_on, total, items FROM receipts WHERE user_id = ? AND purchased_on >= ? "
+            "ORDER BY purchased_on DESC LIMIT ?",
+            (user_id, since.isoformat(), limit),
+        )
+        return [
+            {"merchant": merchant, "date": purchased_on, "total": total, "items": json.loads(items)}
+            for merchant, purchased_on, total, items in rows
+        ]
+
+    async def count(self, user_id: str) -> int:
+        return (await self._run("SELECT COUNT(*) FROM receipts WHERE user_id = ?", (user_id,)))[0][0]
+
+
+class ReceiptIngestion:
+    """
+    Receipt pipeline: search since checkpoint → skip known → batch fetch → parallel parse → store
+    Fetching the next batch overlaps with parsing the current one. The
+    checkpoint only advances after a run completes; an interrupted backfill
+    re-lists messages but skips every one already stored.
+    """
+
+    def __init__(self, client: Any, store: ReceiptStore, batch_size: Optional[int] = None,
+                 workers: Optional[int] = None):
+        self.client = client
+        self.store = store
+        self.batch_size = batch_size or settings.receipt_fetch_batch_size
+        self.workers = workers or settings.receipt_parse_workers or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.stats = {"runs": 0, "listed": 0, "skipped": 0, "fetched": 0, "receipts": 0}
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Forking a process that already runs worker threads (SQLite,
+            # MongoDB, the LLM cache) can deadlock; start from a clean server
+            context = multiprocessing.get_context(_START_METHOD)
+            if _START_METHOD == "forkserver":
+                # Workers fork from a server that has already imported the parser
+                context.set_forkserver_preload([__name__])
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        return self._pool
+
+    async def ingest(self, user_id: str) -> Dict[str, int]:
+        """Ingest a user's mail since the last run; returns what this run did"""
+        lock = self._locks.setdefault(user_id, asyncio.Lock())
+        async with lock:
+            after_ms, newest_id = await self.store.checkpoint(user_id)
+            newest = (after_ms, newest_id)
+            run = {"listed": 0, "skipped": 0, "fetched": 0, "receipts": 0}
+            parsing: Optional[asyncio.Task] = None
+            page_token: Optional[str] = None
+            try:
+                while True:
+                    ids, page_token = await self.client.search(user_id, after_ms, page_token, self.batch_size)
+                    known = await self.store.known(user_id, ids)
+                    new_ids = [message_id for message_id in ids if message_id not in known]
+                    run["listed"] += len(ids)
+                    run["skipped"] += len(ids) - len(new_ids)
+
+                    if new_ids:
+                        messages = await self.client.get_batch(user_id, new_ids)
+                        run["fetched"] += len(messages)
+                        for message in messages:
+                            newest = max(newest, (message["internal_date"], message["id"]))
+                        if parsing is not None:
+                            run["receipts"] += await parsing
+                        parsing = asyncio.create_task(self._parse_and_save(user_id, messages))
+                    if not page_token:
+                        break
+            finally:
+                if parsing is not None:
+                    run["receipts"] += await parsing
+
+            if newest[0] > after_ms:
+                await self.store.advance(user_id, *newest)
+            self.stats["runs"] += 1
+            for key, value in run.items():
+                self.stats[key] += value
+            return run
+
+    async def _parse_and_save(self, user_id: str, messages: List[Dict[str, Any]]) -> int:
+        receipts = await self._parse(messages)
+        await self.store.save(user_id, messages, receipts)
+        return sum(receipt is not None for receipt in receipts)
+
+    async def _parse(self, messages: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """Parse in-process for small batches, otherwise split across the pool"""
+        if len(messages) < POOL_MIN_BATCH or self.workers <= 1:
+            return parse_messages(messages)
+        loop = asyncio.get_running_loop()
+        size = -(-len(messages) // self.workers)
+        chunks = [messages[i:i + size] for i in range(0, len(messages), size)]
+        results = await asyncio.gather(*(
+            loop.run_in_executor(self._executor(), parse_messages, chunk) for chunk in chunks
+        ))
+        return [receipt for chunk in results for receipt in chunk]
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+
+def default_gmail_client() -> Any:
+    return MCPGmailClient() if settings.gmail_client_id else LocalGmail()
+
+
+# Shared ingestion pipeline
+receipt_ingestion = ReceiptIngestion(default_gmail_client(), ReceiptStore(settings.receipt_store_path))
@@ -0,0 +1,34 @@
+"""
+Lazy references to heavyweight module attributes
+Importing the ADK agents pulls in google-adk and every MCP toolset, so
+workflows hold these references and only import on first real use.
+"""
+
+from typing import Any
+import importlib
+
+
+class LazyAttribute:
+    """Proxy for ``module.attribute`` that imports the module on first access"""
+
+    def __init__(self, module: str, attribute: str):
+        self._module = module
+        self._attribute = attribute
+        self._target: Any = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._target is not None
+
+    def resolve(self) -> Any:
+        """Import the module and return the real object"""
+        if self._target is None:
+            self._target = getattr(importlib.import_module(self._module), self._attribute)
+        return self._target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<LazyAttribute {self._module}.{self._attribute} ({state})>"
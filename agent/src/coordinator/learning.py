@@ -0,0 +1,304 @@
+"""
+Post-delivery learning loop
+Turns a delivered order into pantry, grocery_transactions, price_snapshots
+and preference_scores updates, applied as one ordered bulk write per
+collection in the background. Every write is keyed by order_id, so a
+delivery applied twice (a retried webhook, a retry after a failure) changes
+nothing the second time.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set
+import asyncio
+import logging
+
+from .config import settings
+from .context import context_cache
+from .data import grocery_transactions, pantry_items, preference_scores, price_snapshots
+from .data.repositories import Repository
+from .grocery import CATEGORY_INDEX, canonical_name
+from .pricing import STORES, normalize_item, vendor_for_store
+from .pricing.batcher import PriceQuote
+from .units import convert
+
+logger = logging.getLogger(__name__)
+
+# Order IDs remembered on each pantry and preference document for idempotency
+APPLIED_ORDERS_KEPT = 50
+
+# Vendor the price cache keys every store's quotes under
+PRICE_VENDOR = "instacart"
+
+
+@dataclass
+class DeliveredItem:
+    """
+    One delivered line
+    ``price`` is what the line cost; ``quote`` is the vendor's package
+    quote behind it (a bare price or ``{"price", "size", "unit"}``), which
+    is what price_snapshots records.
+    """
+
+    name: str
+    quantity: float
+    unit: str
+    price: Optional[float] = None
+    quote: Optional[PriceQuote] = None
+
+
+@dataclass
+class Delivery:
+    """A delivered grocery order"""
+
+    order_id: str
+    user_id: str
+    vendor: str
+    store: str
+    items: List[DeliveredItem]
+    total: float
+    delivered_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    ordered_at: Optional[datetime] = None
+
+
+def merge_items(items: List[DeliveredItem]) -> List[DeliveredItem]:
+    """
+    One line per canonical item name
+    Each document is updated at most once per order, so repeated lines must
+    be combined first; quantities are kept in the first line's unit.
+    """
+    merged: Dict[str, DeliveredItem] = {}
+    for item in items:
+        name = canonical_name(item.name)
+        line = merged.get(name)
+        if line is None:
+            merged[name] = DeliveredItem(name, item.quantity, item.unit, item.price, item.quote)
+            continue
+        if line.quote is None:
+            line.quote = item.quote
+        try:
+            line.quantity += convert(item.quantity, item.unit, line.unit, name) if item.unit != line.unit else item.quantity
+        except ValueError:
+            logger.warning("Cannot add %s %s of %s to %s", item.quantity, item.unit, name, line.unit)
+        if item.price is not None:
+            line.price = (line.price or 0.0) + item.price
+    return list(merged.values())
+
+
+def deliveries_for_order(order_id: str, user_id: str, grocery_order: Dict[str, Any]) -> List[Delivery]:
+    """
+    Deliveries for an approved plan's ``grocery_order``, one per vendor it was split across
+    Lines already in the pantry were not ordered. Line costs and the
+    package quotes behind them come from the plan's price matrix.
+    """
+    pricing = grocery_order["pricing"]
+    matrix = pricing["price_matrix"]
+    lines = {item["name"]: item for item in grocery_order["list"]["items"] if not item.get("in_pantry")}
+    assignments = pricing["optimization"].get("assignments") or {}
+    stores = {vendor_for_store(store): store for store in STORES}
+    deliveries = []
+    for vendor, names in assignments.items():
+        items = [
+            DeliveredItem(
+                name, lines[name]["quantity"], lines[name]["unit"],
+                price=matrix["prices"][name].get(vendor),
+                quote=matrix.get("quotes", {}).get(name, {}).get(vendor),
+            )
+            for name in names if name in lines
+        ]
+        if not items:
+            continue
+        total = sum(item.price or 0.0 for item in items) + matrix.get("delivery_fees", {}).get(vendor, 0.0)
+        deliveries.append(Delivery(
+            order_id=order_id if len(assignments) == 1 else f"{order_id}:{vendor}",
+            user_id=user_id,
+            vendor=vendor,
+            store=stores.get(vendor, vendor),
+            items=items,
+            total=round(total, 2),
+        ))
+    return deliveries
+
+
+def _guarded(ops: List[Any], key: Dict[str, Any], order_id: str, update: Any, defaults: Dict[str, Any]) -> None:
+    """
+    Append a pair of ops that apply ``update`` to the document at ``key`` once per order
+    The first creates the document if needed; the second only matches while
+    the order is not yet in the document's ``applied_orders``.
+    """
+    from pymongo import UpdateOne
+
+    ops.append(UpdateOne(key, {"$setOnInsert": {**defaults, "applied_orders": []}}, upsert=True))
+    ops.append(UpdateOne({**key, "applied_orders": {"$ne": order_id}}, update))
+
+
+def build_writes(delivery: Delivery, pantry_units: Optional[Dict[str, str]] = None) -> Dict[Repository, List[Any]]:
+    """
+    Every write a delivery causes, grouped by repository in application order
+    ``pantry_units`` holds the unit each existing pantry document is stored
+    in; delivered quantities are converted to it before being added.
+    """
+    from pymongo import UpdateOne
+
+    now = delivery.delivered_at
+    applied = {"$push": {"applied_orders": {"$each": [delivery.order_id], "$slice": -APPLIED_ORDERS_KEPT}}}
+    half_life_ms = settings.preference_half_life_days * 86_400_000
+
+    pantry: List[Any] = []
+    prices: List[Any] = []
+    preferences: List[Any] = []
+    lines = []
+    for item in merge_items(delivery.items):
+        name = item.name
+        category = CATEGORY_INDEX.get(name, "other")
+        lines.append({"name": name, "quantity": item.quantity, "unit": item.unit, "price": item.price, "category": category})
+
+        unit, quantity = (pantry_units or {}).get(name, item.unit), item.quantity
+        if unit != item.unit:
+            try:
+                quantity = convert(item.quantity, item.unit, unit, name)
+            except ValueError:
+                logger.warning("Cannot add %s %s of %s to pantry stock kept in %s; skipped",
+                               item.quantity, item.unit, name, unit)
+                quantity = None
+        if quantity is not None:
+            _guarded(
+                pantry, {"user_id": delivery.user_id, "name": name}, delivery.order_id,
+                {
+                    "$inc": {"quantity": quantity},
+                    "$set": {"status": "well_stocked", "updated_at": now},
+                    **applied,
+                },
+                {"quantity": 0, "unit": unit},
+            )
+
+        if item.quote is not None:
+            # Keyed like the price cache's own snapshots, so later lookups hit it
+            snapshot = {
+                "vendor": PRICE_VENDOR,
+                "store": delivery.store,
+                "item": normalize_item(name),
+                "price": item.quote,
+                "observed_at": now,
+                "order_id": delivery.order_id,
+                "source": "delivery",
+            }
+            prices.append(UpdateOne(
+                {"order_id": delivery.order_id, "item": snapshot["item"]}, {"$setOnInsert": snapshot}, upsert=True,
+            ))
+
+        # Score decays by half every preference_half_life_days; each purchase adds one
+        decay = {"$pow": [0.5, {"$divide": [
+            {"$subtract": [now, {"$ifNull": ["$last_purchased_at", now]}]}, half_life_ms,
+        ]}]}
+        _guarded(
+            preferences, {"user_id": delivery.user_id, "item": name}, delivery.order_id,
+            [{"$set": {
+                "score": {"$add": [{"$multiply": [{"$ifNull": ["$score", 0]}, decay]}, 1]},
+                "purchases": {"$add": [{"$ifNull": ["$purchases", 0]}, 1]},
+                "category": category,
+                "last_purchased_at": now,
+                "applied_orders": {"$slice": [
+                    {"$concatArrays": [{"$ifNull": ["$applied_orders", []]}, [delivery.order_id]]},
+                    -APPLIED_ORDERS_KEPT,
+                ]},
+            }}],
+            {"score": 0.0, "purchases": 0},
+        )
+
+    # Written last: a recorded transaction marks the delivery as fully learned
+    transaction = UpdateOne(
+        {"order_id": delivery.order_id},
+        {"$setOnInsert": {
+            "order_id": delivery.order_id,
+            "user_id": delivery.user_id,
+            "vendor": delivery.vendor,
+            "store": delivery.store,
+            "total": delivery.total,
+            "items": lines,
+            "ordered_at": delivery.ordered_at or now,
+            "delivered_at": now,
+            "learned_at": datetime.now(timezone.utc),
+        }},
+        upsert=True,
+    )
+    return {
+        pantry_items: pantry,
+        price_snapshots: prices,
+        preference_scores: preferences,
+        grocery_transactions: [transaction],
+    }
+
+
+class LearningLoop:
+    """
+    Applies deliveries in the background
+    ``submit`` returns immediately; each delivery's collections are written
+    concurrently as ordered bulk writes, then its transaction is recorded.
+    Failed deliveries are retried with backoff, which is safe because every
+    write is idempotent per order_id.
+    """
+
+    def __init__(self, max_attempts: Optional[int] = None, retry_seconds: float = 0.5):
+        self.max_attempts = max_attempts or settings.learning_loop_max_attempts
+        self.retry_seconds = retry_seconds
+        self._tasks: Set[asyncio.Task] = set()
+        self._pending: Dict[str, asyncio.Task] = {}
+        self.stats = {"applied": 0, "duplicates": 0, "failed": 0, "operations": 0, "round_trips": 0}
+
+    def submit(self, delivery: Delivery) -> asyncio.Task:
+        """Schedule a delivery; a delivery already in flight is not scheduled twice"""
+        task = self._pending.get(delivery.order_id)
+        if task is None:
+            task = asyncio.create_task(self._run(delivery))
+            self._pending[delivery.order_id] = task
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            task.add_done_callback(lambda _: self._pending.pop(delivery.order_id, None))
+        return task
+
+    async def _run(self, delivery: Delivery) -> bool:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                await self.apply(delivery)
+                return True
+            except Exception as e:
+                logger.warning("Learning loop failed for %s (attempt %d/%d): %s",
+                               delivery.order_id, attempt, self.max_attempts, e)
+                if attempt < self.max_attempts:
+                    await asyncio.sleep(self.retry_seconds * 2 ** (attempt - 1))
+        self.stats["failed"] += 1
+        return False
+
+    async def apply(self, delivery: Delivery) -> Dict[str, int]:
+        """Write a delivery now; returns the operation count per collection"""
+        if await grocery_transactions.get(delivery.order_id) is not None:
+            self.stats["duplicates"] += 1
+            return {}
+
+        names = [item.name for item in merge_items(delivery.items)]
+        writes = build_writes(delivery, await pantry_items.units(delivery.user_id, names))
+        transaction = writes.pop(grocery_transactions)
+        await asyncio.gather(*(
+            repository.collection().bulk_write(ops, ordered=True) for repository, ops in writes.items() if ops
+        ))
+        await grocery_transactions.collection().bulk_write(transaction, ordered=True)
+        # The cached pantry snapshot no longer matches pantry_items
+        context_cache.invalidate(delivery.user_id, "mongodb")
+
+        counts = {repository.collection_name: len(ops) for repository, ops in writes.items() if ops}
+        counts[grocery_transactions.collection_name] = len(transaction)
+        self.stats["applied"] += 1
+        self.stats["operations"] += sum(counts.values())
+        # Plus the transaction and pantry unit lookups
+        self.stats["round_trips"] += len(counts) + 2
+        return counts
+
+    async def flush(self) -> None:
+        """Wait for submitted deliveries"""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+# Shared learning loop
+learning_loop = LearningLoop()
@@ -164,7 +164,8 @@ class GmailMCPToolset:
                             "properties": {
                                 "query": {"type": "string", "description": "Gmail search query (e.g., 'from:instacart receipt')"},
                                 "max_results": {"type": "integer", "default": 20},
-                                "after_date": {"type": "string", "description": "Search after this date (YYYY/MM/DD)"}
+                                "after_date": {"type": "string", "description": "Search after this date (YYYY/MM/DD)"},
+                                "page_token": {"type": "string", "description": "Token from the previous page of results"}
                             },
                             "required": ["query"]
                         }
@@ -180,6 +181,17 @@ class GmailMCPToolset:
                             "required": ["message_id"]
                         }
                     ),
+                    genai.types.FunctionDeclaration(
+                        name="gmail_batch_get_messages",
+                        description="Get full content of several messages in one request",
+                        parameters={
+                            "type": "object",
+                            "properties": {
+                                "message_ids": {"type": "array", "items": {"type": "string"}, "description": "Gmail message IDs"}
+                            },
+                            "required": ["message_ids"]
+                        }
+                    ),
                     genai.types.FunctionDeclaration(
                         name="gmail_extract_receipt",
                         description="Extract structured data from receipt email/attachment",
@@ -342,6 +354,19 @@ class PlaidMCPToolset:
                             "required": ["start_date", "end_date"]
                         }
                     ),
+                    genai.types.FunctionDeclaration(
+                        name="plaid_sync_transactions",
+                        description="Fetch transactions added, modified or removed since a sync cursor",
+                        parameters={
+                            "type": "object",
+                            "properties": {
+                                "user_id": {"type": "string", "description": "User whose linked accounts to sync"},
+                                "cursor": {"type": "string", "description": "Cursor from the previous sync; empty for full history"},
+                                "count": {"type": "integer", "description": "Maximum changes to return", "default": 500}
+                            },
+                            "required": ["user_id"]
+                        }
+                    ),
                     genai.types.FunctionDeclaration(
                         name="plaid_categorize_transaction",
                         description="Get category for a transaction",
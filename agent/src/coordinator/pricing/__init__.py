@@ -0,0 +1,48 @@
+"""Price lookup and comparison for Edwardo system"""
+
+from typing import List
+
+from ..config import settings
+from .batcher import PriceBatcher, PriceTable
+from .cache import FreshnessPolicy, MongoPriceSnapshotStore, PriceCache, normalize_item
+from .optimizer import optimize_vendor_selection
+from .sources import STORES, default_price_fetch, vendor_for_store
+
+# Shared batcher: concurrent workflows coalesce into the same vendor calls
+price_batcher = PriceBatcher(default_price_fetch())
+
+# Shared price cache in front of price_snapshots
+price_cache = PriceCache(MongoPriceSnapshotStore() if settings.price_snapshot_store == "mongodb" else None)
+
+
+async def lookup_prices(items: List[str], stores: List[str]) -> PriceTable:
+    """Get prices for many grocery items at once across Instacart stores.
+
+    Use this instead of searching products one by one: pass every item that
+    needs a price in a single call.
+
+    Args:
+        items: Grocery item names, e.g. ["milk", "eggs"].
+        stores: Store names, e.g. ["Whole Foods", "Safeway"].
+
+    Returns:
+        A mapping of item name to {store name: price}; a null price means the
+        item is unavailable at that store.
+    """
+    return await price_batcher.get_prices(items, stores)
+
+
+__all__ = [
+    "FreshnessPolicy",
+    "MongoPriceSnapshotStore",
+    "PriceBatcher",
+    "PriceCache",
+    "PriceTable",
+    "STORES",
+    "lookup_prices",
+    "normalize_item",
+    "optimize_vendor_selection",
+    "price_batcher",
+    "price_cache",
+    "vendor_for_store",
+]
@@ -0,0 +1,85 @@
+"""
+Batched price lookups with request coalescing
+Requests for the same store set that arrive within a short window - from any
+user or workflow - are merged into one de-duplicated instacart_get_prices call,
+and each caller gets back just the items it asked for.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+import asyncio
+
+from ..config import settings
+
+# A bare price, or a package quote {"price": float, "size": float, "unit": str}
+PriceQuote = Union[float, Dict[str, Any]]
+PriceTable = Dict[str, Dict[str, Optional[PriceQuote]]]
+PriceFetch = Callable[[List[str], List[str]], Awaitable[PriceTable]]
+
+
+class _PendingBatch:
+    """Items collected for one store set while the window is open"""
+
+    def __init__(self, stores: Tuple[str, ...]):
+        self.stores = stores
+        self.items: Set[str] = set()
+        self.requests = 0
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class PriceBatcher:
+    """Coalesces concurrent price lookups into one vendor call per store set"""
+
+    def __init__(self, fetch: PriceFetch, window_seconds: Optional[float] = None, max_items: Optional[int] = None):
+        self.fetch = fetch
+        self.window_seconds = settings.price_batch_window_seconds if window_seconds is None else window_seconds
+        self.max_items = max_items or settings.price_batch_max_items
+        self._pending: Dict[Tuple[str, ...], _PendingBatch] = {}
+        # Running vendor calls; referenced so the loop cannot collect them mid-flight
+        self._calls: Set[asyncio.Task] = set()
+        self.stats = {"requests": 0, "items_requested": 0, "items_fetched": 0, "vendor_calls": 0}
+
+    async def get_prices(self, items: Iterable[str], stores: Iterable[str]) -> PriceTable:
+        """Return ``{item: {store: price}}`` for the requested items"""
+        items = list(dict.fromkeys(items))
+        key = tuple(sorted(set(stores)))
+        self.stats["requests"] += 1
+        self.stats["items_requested"] += len(items)
+
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = _PendingBatch(key)
+            self._pending[key] = batch
+            batch.timer = asyncio.get_running_loop().call_later(self.window_seconds, self._flush, key)
+        batch.items.update(items)
+        batch.requests += 1
+
+        if len(batch.items) >= self.max_items:
+            self._flush(key)
+
+        prices = await asyncio.shield(batch.future)
+        return {item: prices.get(item, {}) for item in items}
+
+    def _flush(self, key: Tuple[str, ...]) -> None:
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.create_task(self._run(batch))
+        self._calls.add(task)
+        task.add_done_callback(self._calls.discard)
+
+    async def _run(self, batch: _PendingBatch) -> None:
+        items = sorted(batch.items)
+        self.stats["vendor_calls"] += 1
+        self.stats["items_fetched"] += len(items)
+        try:
+            batch.future.set_result(await self.fetch(items, list(batch.stores)))
+        except asyncio.CancelledError:
+            batch.future.cancel()
+            raise
+        except Exception as e:
+            batch.future.set_exception(e)
+            # Mark retrieved so an unobserved failure is not logged twice
+            batch.future.exception()
@@ -0,0 +1,162 @@
+"""
+Two-tier price snapshot cache
+An in-memory dictionary sits in front of the MongoDB price_snapshots
+collection. Lookups are keyed by (vendor, store, normalized item) and only
+prices that are stale or missing need a vendor call.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import asyncio
+import logging
+import re
+import time
+
+from ..config import settings
+from .batcher import PriceQuote, PriceTable
+
+logger = logging.getLogger(__name__)
+
+PriceKey = Tuple[str, str, str]
+
+
+def normalize_item(name: str) -> str:
+    """Canonical form of an item name for cache keys"""
+    return re.sub(r"\s+", " ", name.strip().lower())
+
+
+@dataclass
+class FreshnessPolicy:
+    """How old a price snapshot may be before it is considered stale"""
+
+    max_age_seconds: float = field(default_factory=lambda: settings.price_max_age_seconds)
+    vendor_max_age_seconds: Dict[str, float] = field(
+        default_factory=lambda: dict(settings.price_vendor_max_age_seconds)
+    )
+
+    def max_age(self, vendor: str) -> timedelta:
+        return timedelta(seconds=self.vendor_max_age_seconds.get(vendor, self.max_age_seconds))
+
+    def is_fresh(self, vendor: str, observed_at: datetime, now: Optional[datetime] = None) -> bool:
+        now = now or datetime.now(timezone.utc)
+        return now - observed_at <= self.max_age(vendor)
+
+
+class MongoPriceSnapshotStore:
+    """Price history in the price_snapshots collection"""
+
+    async def latest(self, keys: List[PriceKey], since: datetime) -> Dict[PriceKey, Tuple[Optional[PriceQuote], datetime]]:
+        """Most recent snapshot per key observed after ``since``"""
+        from ..data import price_snapshots
+        return await price_snapshots.latest(keys, since)
+
+    async def record(self, snapshots: List[Dict[str, Any]]) -> None:
+        """Append snapshots to the price history"""
+        from ..data import price_snapshots
+        await price_snapshots.record(snapshots)
+
+
+class PriceCache:
+    """
+    Memory + MongoDB price cache with a configurable freshness policy
+    If the backing store is unreachable the cache keeps working from memory
+    and retries the store after a cool-down.
+    """
+
+    def __init__(self, store: Optional[MongoPriceSnapshotStore] = None,
+                 policy: Optional[FreshnessPolicy] = None, store_retry_seconds: float = 60.0):
+        self.store = store
+        self.policy = policy or FreshnessPolicy()
+        self.store_retry_seconds = store_retry_seconds
+        self._memory: Dict[PriceKey, Tuple[Optional[PriceQuote], datetime]] = {}
+        self._store_down_until = 0.0
+        self._writes: Set[asyncio.Task] = set()
+        self.stats = {"memory_hits": 0, "store_hits": 0, "misses": 0}
+
+    def _store_available(self) -> bool:
+        return self.store is not None and time.monotonic() >= self._store_down_until
+
+    def _store_failed(self, error: Exception) -> None:
+        logger.warning("price_snapshots unavailable, using memory tier only: %s", error)
+        self._store_down_until = time.monotonic() + self.store_retry_seconds
+
+    async def get_many(self, vendor: str, stores: Iterable[str], items: Iterable[str],
+                       memory_only: bool = False) -> Tuple[PriceTable, Dict[str, Any]]:
+        """
+        Return fresh cached prices as ``{item: {store: price}}`` plus lookup stats
+        Items or stores absent from the table are stale or missing.
+        ``memory_only`` skips price_snapshots for latency-critical callers.
+        """
+        now = datetime.now(timezone.utc)
+        stores, items = list(stores), list(items)
+        table: PriceTable = {}
+        pending: List[PriceKey] = []
+        lookup = {"memory_hits": 0, "store_hits": 0, "misses": 0}
+
+        for item in items:
+            for store in stores:
+                key = (vendor, store, normalize_item(item))
+                cached = self._memory.get(key)
+                if cached is not None and self.policy.is_fresh(vendor, cached[1], now):
+                    table.setdefault(item, {})[store] = cached[0]
+                    lookup["memory_hits"] += 1
+                else:
+                    pending.append(key)
+
+        if pending and not memory_only and self._store_available():
+            try:
+                found = await self.store.latest(pending, since=now - self.policy.max_age(vendor))
+            except Exception as e:
+                self._store_failed(e)
+                found = {}
+            by_name = {normalize_item(item): item for item in items}
+            for key, snapshot in found.items():
+                self._memory[key] = snapshot
+                table.setdefault(by_name[key[2]], {})[key[1]] = snapshot[0]
+                lookup["store_hits"] += 1
+
+        lookup["misses"] = len(items) * len(stores) - lookup["memory_hits"] - lookup["store_hits"]
+        for counter, value in lookup.items():
+            self.stats[counter] += value
+        total = len(items) * len(stores)
+        lookup["hit_ratio"] = round((total - lookup["misses"]) / total, 4) if total else 0.0
+        return table, lookup
+
+    async def put_many(self, vendor: str, prices: PriceTable) -> None:
+        """Record freshly fetched prices in memory and queue them for price_snapshots"""
+        now = datetime.now(timezone.utc)
+        snapshots = []
+        for item, by_store in prices.items():
+            for store, price in by_store.items():
+                key = (vendor, store, normalize_item(item))
+                self._memory[key] = (price, now)
+                snapshots.append({
+                    "vendor": vendor,
+                    "store": store,
+                    "item": key[2],
+                    "price": price,
+                    "observed_at": now,
+                })
+
+        if snapshots and self._store_available():
+            # History writes stay off the comparison path
+            task = asyncio.create_task(self._persist(snapshots))
+            self._writes.add(task)
+            task.add_done_callback(self._writes.discard)
+
+    async def _persist(self, snapshots: List[Dict[str, Any]]) -> None:
+        try:
+            await self.store.record(snapshots)
+        except Exception as e:
+            self._store_failed(e)
+
+    async def flush(self) -> None:
+        """Wait for pending history writes"""
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+
+    def hit_ratio(self) -> float:
+        hits = self.stats["memory_hits"] + self.stats["store_hits"]
+        total = hits + self.stats["misses"]
+        return round(hits / total, 4) if total else 0.0
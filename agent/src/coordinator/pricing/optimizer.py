@@ -0,0 +1,175 @@
+"""
+Vendor selection optimizer
+Solves the vendor assignment for a grocery order exactly instead of asking
+the model to do the arithmetic. The objective is the one in the decision
+agent prompt: minimize items cost + delivery fees + time value, where an
+order may be split across several vendors.
+
+Single-vendor plans are scored in one vectorized pass; split plans are found
+with a branch-and-bound search over vendor subsets.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+_EPSILON = 1e-9
+
+
+def _price_array(price_matrix: Dict[str, Any]) -> Tuple[List[str], List[str], np.ndarray]:
+    items = list(price_matrix["items"])
+    vendors = list(price_matrix["vendors"])
+    prices = price_matrix["prices"]
+    array = np.full((len(items), len(vendors)), np.inf)
+    for i, item in enumerate(items):
+        row = prices.get(item, {})
+        for j, vendor in enumerate(vendors):
+            price = row.get(vendor)
+            if price is not None:
+                array[i, j] = float(price)
+    return items, vendors, array
+
+
+def optimize_vendor_selection(
+    price_matrix: Dict[str, Any],
+    time_values: Optional[Dict[str, float]] = None,
+    max_vendors: int = 3,
+) -> Dict[str, Any]:
+    """Choose the cheapest way to buy a grocery list across vendors.
+
+    Minimizes items cost + delivery fees + time value. Each vendor used adds
+    its delivery fee and time value once; items go to the cheapest chosen
+    vendor that stocks them. Splitting across up to ``max_vendors`` vendors
+    is considered when it beats every single-vendor order.
+
+    Args:
+        price_matrix: {"items": [...], "vendors": [...],
+            "prices": {item: {vendor: price or null}},
+            "delivery_fees": {vendor: fee}}.
+        time_values: Optional dollar value of the user's time per vendor
+            (e.g. for later delivery windows).
+        max_vendors: Maximum number of vendors to split the order across.
+
+    Returns:
+        recommended_vendor, assignments per vendor, cost breakdown, savings
+        versus the best single vendor, unavailable items and reasoning.
+    """
+    items, vendors, prices = _price_array(price_matrix)
+    fees = np.array([float(price_matrix.get("delivery_fees", {}).get(v, 0.0)) for v in vendors])
+    times = np.array([float((time_values or {}).get(v, 0.0)) for v in vendors])
+    fixed = fees + times
+
+    stocked = np.isfinite(prices).any(axis=1)
+    unavailable_items = [item for item, ok in zip(items, stocked) if not ok]
+    items = [item for item, ok in zip(items, stocked) if ok]
+    prices = prices[stocked]
+
+    if not items:
+        # Nothing to buy: no vendor is used, so no delivery fee is paid either
+        return {
+            "recommended_vendor": None,
+            "split": False,
+            "assignments": {},
+            "vendor_breakdown": {},
+            "objective": 0.0,
+            "order_total": 0.0,
+            "best_single_vendor": None,
+            "savings_vs_single_vendor": None,
+            "unavailable_items": unavailable_items,
+            "reasoning": "No vendor stocks any of the items" if unavailable_items else "No items to buy",
+            "nodes_explored": 0,
+        }
+
+    if not vendors:
+        return {"recommended_vendor": None, "reasoning": "No vendors to compare", "unavailable_items": unavailable_items}
+
+    # Every single-vendor order at once; vendors missing an item score inf
+    single_scores = prices.sum(axis=0) + fixed
+    best_single = int(np.argmin(single_scores))
+    best_cost = float(single_scores[best_single])
+    best_set: Tuple[int, ...] = (best_single,) if np.isfinite(best_cost) else ()
+
+    # Branch and bound over vendor subsets, cheapest fixed cost first
+    order = np.argsort(fixed, kind="stable")
+    count = len(vendors)
+    suffix_min = np.full((count + 1, len(items)), np.inf)
+    for k in range(count - 1, -1, -1):
+        suffix_min[k] = np.minimum(suffix_min[k + 1], prices[:, order[k]])
+
+    nodes = 0
+
+    def search(k: int, chosen: Tuple[int, ...], current: np.ndarray, fixed_cost: float) -> None:
+        nonlocal best_cost, best_set, nodes
+        nodes += 1
+        cost = float(current.sum()) + fixed_cost
+        if chosen and np.isfinite(cost):
+            if cost < best_cost - _EPSILON or (abs(cost - best_cost) <= _EPSILON and len(chosen) < len(best_set)):
+                best_cost, best_set = cost, chosen
+        if k == count or len(chosen) >= max_vendors:
+            return
+        bound = float(np.minimum(current, suffix_min[k]).sum()) + fixed_cost
+        if bound >= best_cost - _EPSILON:
+            return
+        vendor = int(order[k])
+        search(k + 1, chosen + (vendor,), np.minimum(current, prices[:, vendor]), fixed_cost + fixed[vendor])
+        search(k + 1, chosen, current, fixed_cost)
+
+    search(0, (), np.full(len(items), np.inf), 0.0)
+
+    if not best_set:
+        return {
+            "recommended_vendor": None,
+            "reasoning": f"No combination of up to {max_vendors} vendors stocks every item",
+            "unavailable_items": unavailable_items,
+            "nodes_explored": nodes,
+        }
+
+    chosen = sorted(best_set)
+    choice = np.array(chosen)[np.argmin(prices[:, chosen], axis=1)]
+    assignments: Dict[str, List[str]] = {vendors[v]: [] for v in chosen}
+    breakdown: Dict[str, Dict[str, float]] = {}
+    for i, vendor_index in enumerate(choice):
+        assignments[vendors[vendor_index]].append(items[i])
+    line_prices = prices[np.arange(len(items)), choice]
+    for v in chosen:
+        item_cost = float(line_prices[choice == v].sum())
+        breakdown[vendors[v]] = {
+            "items_cost": round(item_cost, 2),
+            "delivery_fee": round(float(fees[v]), 2),
+            "time_value": round(float(times[v]), 2),
+        }
+
+    primary = max(chosen, key=lambda v: breakdown[vendors[v]]["items_cost"])
+    order_total = sum(entry["items_cost"] + entry["delivery_fee"] for entry in breakdown.values())
+    single_best_cost = float(single_scores[best_single])
+    savings = single_best_cost - best_cost if np.isfinite(single_best_cost) else None
+
+    if len(chosen) == 1:
+        entry = breakdown[vendors[primary]]
+        reasoning = (
+            f"{vendors[primary]} is cheapest overall: ${entry['items_cost']:.2f} items"
+            f" + ${entry['delivery_fee']:.2f} delivery"
+        )
+    elif savings is not None:
+        reasoning = (
+            f"Splitting across {', '.join(vendors[v] for v in chosen)} saves ${savings:.2f}"
+            f" versus the best single vendor ({vendors[best_single]})"
+        )
+    else:
+        reasoning = (
+            f"No single vendor stocks every item; splitting across {', '.join(vendors[v] for v in chosen)}"
+        )
+
+    return {
+        "recommended_vendor": vendors[primary],
+        "split": len(chosen) > 1,
+        "assignments": assignments,
+        "vendor_breakdown": breakdown,
+        "objective": round(best_cost, 2),
+        "order_total": round(order_total, 2),
+        "best_single_vendor": vendors[best_single] if np.isfinite(single_best_cost) else None,
+        "savings_vs_single_vendor": round(savings, 2) if savings is not None else None,
+        "unavailable_items": unavailable_items,
+        "reasoning": reasoning,
+        "nodes_explored": nodes,
+    }
@@ -0,0 +1,116 @@
+"""
+Vendor price sources
+Live prices come from instacart_get_prices on the pooled Instacart MCP server;
+without Instacart credentials a deterministic simulated catalog is used.
+"""
+
+from typing import Any, Dict, List
+import hashlib
+import json
+
+from ..config import settings
+from ..runtime.limits import rate_limits
+from .batcher import PriceFetch, PriceTable
+
+# Instacart storefronts compared for every order; stores offering priority
+# delivery list its fee and ETA under ``instant_delivery``
+STORES = {
+    "Whole Foods": {
+        "vendor": "instacart_whole_foods",
+        "delivery_fee": 5.99,
+        "delivery_windows": ["Sat 2-4pm", "Sat 4-6pm"],
+        "instant_delivery": {"fee": 9.99, "eta_minutes": 45},
+    },
+    "Safeway": {
+        "vendor": "instacart_safeway",
+        "delivery_fee": 3.99,
+        "delivery_windows": ["Sat 10am-12pm", "Sat 4-6pm"],
+        "instant_delivery": {"fee": 7.99, "eta_minutes": 30},
+    },
+    "Costco": {
+        "vendor": "instacart_costco",
+        "delivery_fee": 0.0,
+        "delivery_windows": ["Sun 10am-12pm"],
+    },
+}
+
+
+def vendor_for_store(store: str) -> str:
+    return STORES.get(store, {}).get("vendor", f"instacart_{store.lower().replace(' ', '_')}")
+
+
+def _parse_price_response(response: Dict[str, Any]) -> PriceTable:
+    """Normalize an instacart_get_prices tool result to ``{item: {store: quote}}``
+
+    A quote is either a bare price or ``{"price", "size", "unit"}`` when the
+    store reports its package size.
+    """
+    payload: Any = response.get("structuredContent")
+    if payload is None:
+        for content in response.get("content", []):
+            if content.get("type") == "text":
+                payload = json.loads(content["text"])
+                break
+    if isinstance(payload, dict) and "prices" in payload:
+        payload = payload["prices"]
+
+    table: PriceTable = {}
+    if isinstance(payload, dict):
+        for item, by_store in payload.items():
+            table[item] = {store: price for store, price in (by_store or {}).items()}
+    elif isinstance(payload, list):
+        for row in payload:
+            quote = row.get("price")
+            if quote is not None and row.get("size") is not None:
+                quote = {"price": quote, "size": row["size"], "unit": row.get("unit", "each")}
+            table.setdefault(row["item"], {})[row["store"]] = quote
+    return table
+
+
+async def fetch_instacart_prices(items: List[str], stores: List[str]) -> PriceTable:
+    """One instacart_get_prices call through the shared MCP pool"""
+    from ..tools.tools import mcp_pool
+
+    await rate_limits.acquire("instacart")
+    response = await mcp_pool.call_tool(
+        "instacart", "instacart_get_prices", {"items": items, "stores": stores}
+    )
+    if response.get("isError"):
+        raise RuntimeError(f"instacart_get_prices failed: {response.get('content')}")
+    return _parse_price_response(response)
+
+
+# Package options per item as (size, unit, price multiplier); stores sell
+# the same item in different sizes and units, like real storefronts do
+SIMULATED_PACKAGES = {
+    "broccoli": [(1, "lb", 1.0), (12, "oz", 0.8), (1, "head", 1.2)],
+    "bell peppers": [(1, "each", 0.5), (3, "each", 1.2), (1, "lb", 1.0)],
+    "milk": [(1, "gallon", 1.0), (0.5, "gallon", 0.6), (64, "fl oz", 0.6)],
+    "eggs": [(12, "each", 1.0), (1, "dozen", 1.0), (18, "each", 1.4)],
+    "soy sauce": [(10, "fl oz", 1.0), (15, "fl oz", 1.3), (500, "ml", 1.5)],
+    "pasta": [(1, "lb", 1.0), (16, "oz", 1.0), (500, "g", 1.0)],
+    "cherry tomatoes": [(1, "pint", 1.0), (10, "oz", 0.9), (2, "lb", 2.2)],
+    "parmesan": [(8, "oz", 1.0), (6, "oz", 0.8), (200, "g", 0.9)],
+}
+
+
+async def simulated_prices(items: List[str], stores: List[str]) -> PriceTable:
+    """Stable pseudo-prices for demos and offline runs, quoted per package"""
+    table: PriceTable = {}
+    for item in items:
+        table[item] = {}
+        options = SIMULATED_PACKAGES.get(item.strip().lower(), [(1, "each", 1.0)])
+        for store in stores:
+            digest = hashlib.sha256(f"{item}|{store}".encode()).digest()
+            # Roughly one item in twenty is out of stock at a given store
+            if digest[0] < 13:
+                table[item][store] = None
+                continue
+            size, unit, multiplier = options[digest[2] % len(options)]
+            price = round((1.0 + digest[1] / 255 * 8.0) * multiplier, 2)
+            table[item][store] = {"price": price, "size": size, "unit": unit}
+    return table
+
+
+def default_price_fetch() -> PriceFetch:
+    return fetch_instacart_prices if settings.instacart_api_key else simulated_prices
@@ -0,0 +1,136 @@
+"""
+Incremental re-planning support
+Keeps each user's last weekly plan as a base, records which plan artifacts
+depend on which inputs and diffs the recomputed pieces against the base.
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set
+import copy
+
+
+class PlanStore:
+    """Latest weekly plan per user, used as the base for re-planning"""
+
+    def __init__(self):
+        self._plans: Dict[str, Dict[str, Any]] = {}
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        plan = self._plans.get(user_id)
+        return copy.deepcopy(plan) if plan is not None else None
+
+    def save(self, user_id: str, plan: Dict[str, Any]) -> None:
+        self._plans[user_id] = copy.deepcopy(plan)
+
+    def clear(self, user_id: Optional[str] = None) -> None:
+        if user_id is None:
+            self._plans.clear()
+        else:
+            self._plans.pop(user_id, None)
+
+
+class PlanDependencies:
+    """
+    Dependency graph between plan inputs and artifacts
+    Nodes are strings such as ``pantry:milk``, ``meal:monday:dinner``,
+    ``grocery:milk``, ``price:milk``, ``vendor_selection`` and
+    ``errand_schedule``; edges point from an input to what is derived from it.
+    """
+
+    def __init__(self):
+        self._dependents: Dict[str, Set[str]] = defaultdict(set)
+
+    def add(self, artifact: str, *inputs: str) -> None:
+        for node in inputs:
+            self._dependents[node].add(artifact)
+
+    def affected(self, changed: Iterable[str]) -> Set[str]:
+        """Everything transitively derived from the changed nodes"""
+        seen: Set[str] = set()
+        pending = list(changed)
+        while pending:
+            for artifact in self._dependents.get(pending.pop(), ()):
+                if artifact not in seen:
+                    seen.add(artifact)
+                    pending.append(artifact)
+        return seen
+
+    @classmethod
+    def from_plan(cls, plan: Dict[str, Any]) -> "PlanDependencies":
+        deps = cls()
+        order = plan.get("grocery_order", {})
+        for item in order.get("list", {}).get("items", []):
+            name = item["name"]
+            deps.add(f"grocery:{name}", f"pantry:{name}", *(f"meal:{key}" for key in item.get("meals", [])))
+        for name in order.get("pricing", {}).get("price_matrix", {}).get("items", []):
+            deps.add(f"price:{name}", f"grocery:{name}", f"vendor_prices:{name}")
+            deps.add("vendor_selection", f"price:{name}")
+        deps.add("errand_schedule", "context:calendar", "context:maps")
+        return deps
+
+
+def merge_grocery_items(base: List[Dict[str, Any]], updated: List[Dict[str, Any]],
+                        recomputed: Iterable[str]) -> List[Dict[str, Any]]:
+    """Replace the recomputed lines of a grocery list, keeping the others in place"""
+    recomputed = set(recomputed)
+    by_name = {item["name"]: item for item in updated}
+    merged = []
+    for item in base:
+        if item["name"] not in recomputed:
+            merged.append(item)
+        elif item["name"] in by_name:
+            merged.append(by_name.pop(item["name"]))
+    merged.extend(item for item in updated if item["name"] in by_name)
+    return merged
+
+
+def merge_price_rows(base: Dict[str, Any], rows: Dict[str, Any], recomputed: Iterable[str]) -> Dict[str, Any]:
+    """Swap re-priced lines into a normalized price matrix"""
+    recomputed = set(recomputed)
+    merged = copy.deepcopy(base)
+    new_items = list(rows.get("items", []))
+    merged["items"] = [item for item in base["items"] if item not in recomputed or item in new_items]
+    merged["items"] += [item for item in new_items if item not in merged["items"]]
+    for field in ("prices", "quotes", "unit_prices", "unit_price_basis", "packages"):
+        table = merged.setdefault(field, {})
+        for item in recomputed:
+            table.pop(item, None)
+        table.update(rows.get(field, {}))
+    merged["unit_mismatches"] = [
+        entry for entry in base.get("unit_mismatches", []) if entry["item"] not in recomputed
+    ] + list(rows.get("unit_mismatches", []))
+    return merged
+
+
+def diff_items(before: List[Dict[str, Any]], after: List[Dict[str, Any]],
+               fields: Iterable[str] = ("quantity", "unit", "in_pantry")) -> Dict[str, List[Any]]:
+    """Added, removed and changed grocery lines between two lists"""
+    old = {item["name"]: item for item in before}
+    new = {item["name"]: item for item in after}
+    fields = tuple(fields)
+    changed = []
+    for name in old.keys() & new.keys():
+        delta = {f: {"before": old[name].get(f), "after": new[name].get(f)}
+                 for f in fields if old[name].get(f) != new[name].get(f)}
+        if delta:
+            changed.append({"name": name, **delta})
+    return {
+        "added": [new[name] for name in new if name not in old],
+        "removed": [old[name] for name in old if name not in new],
+        "changed": sorted(changed, key=lambda entry: entry["name"]),
+    }
+
+
+def diff_prices(before: Dict[str, Any], after: Dict[str, Any], items: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Line cost changes per vendor for the given items"""
+    changes = {}
+    for item in items:
+        old = before.get("prices", {}).get(item, {})
+        new = after.get("prices", {}).get(item, {})
+        if old != new:
+            changes[item] = {"before": old, "after": new}
+    return changes
+
+
+# Shared base plans for re-planning
+plan_store = PlanStore()
@@ -0,0 +1,98 @@
+"""
+Coordinator routing
+The workflow patterns in the coordinator prompt are fixed agent sequences, so
+requests that are exactly one of them are routed straight to the sub-agents
+in code and everything else pays for an LLM routing decision.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+import re
+
+from .runtime.telemetry import metrics_registry
+
+
+@dataclass(frozen=True)
+class Route:
+    """A known workflow and the sub-agents it runs, in order"""
+
+    workflow: str
+    agents: Tuple[str, ...]
+    pattern: "re.Pattern[str]"
+
+
+# Each pattern must match the whole request (after courtesy words and
+# trailing punctuation), so anything with extra constraints or a second
+# intent ("update my plan to skip Friday") goes to the LLM coordinator.
+# Execution is never routed directly: orders need explicit user approval first.
+_COURTESY = r"(?:(?:please|can you|could you)\s+)*"
+_PLEASE = r"(?:\s+please)?"
+
+
+def _whole_intent(body: str) -> "re.Pattern[str]":
+    return re.compile(_COURTESY + "(?:" + body + ")" + _PLEASE, re.I)
+
+
+ROUTES = (
+    Route(
+        "emergency_restock",
+        ("context_agent", "decision_agent"),
+        _whole_intent(r"(?:emergency\s+)?restock(?:\s+(?:my|the)\s+pantry)?"),
+    ),
+    Route(
+        "adaptive_replan",
+        ("context_agent", "planning_agent", "decision_agent"),
+        _whole_intent(r"re-?plan(?:\s+(?:my|the|this)\s+(?:week|meal\s+plan|meals))?"),
+    ),
+    Route(
+        "weekly_planning",
+        ("context_agent", "planning_agent", "decision_agent"),
+        _whole_intent(
+            r"plan\s+(?:my|the|this|next)\s+week"
+            r"|plan\s+my\s+meals\s+for\s+(?:the|this|next)\s+week"
+            r"|(?:make|create)\s+(?:a|my)\s+weekly\s+meal\s+plan"
+        ),
+    ),
+)
+ROUTES_BY_WORKFLOW = {route.workflow: route for route in ROUTES}
+
+
+def classify(text: str, workflow_type: Optional[str] = None) -> Optional[Route]:
+    """
+    Route for a request, or None for free-form requests
+    An explicit ``workflow_type`` (from session state) wins over the text;
+    otherwise the whole request has to be one known workflow phrase.
+    """
+    if workflow_type:
+        return ROUTES_BY_WORKFLOW.get(workflow_type)
+    request = " ".join((text or "").split()).rstrip(".!?")
+    for route in ROUTES:
+        if route.pattern.fullmatch(request):
+            return route
+    return None
+
+
+class RoutingStats:
+    """Counts requests routed directly (per workflow) and through the LLM coordinator"""
+
+    def __init__(self):
+        self.direct: Dict[str, int] = {}
+        self.llm_routed = 0
+        self._requests = metrics_registry.counter(
+            "edwardo_coordinator_requests_total", "Coordinator requests by routing path", ("path", "workflow")
+        )
+
+    def record_direct(self, route: Route) -> None:
+        self.direct[route.workflow] = self.direct.get(route.workflow, 0) + 1
+        self._requests.inc(1, "direct", route.workflow)
+
+    def record_llm(self) -> None:
+        self.llm_routed += 1
+        self._requests.inc(1, "llm", "free_form")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"direct": dict(self.direct), "llm_routed": self.llm_routed}
+
+
+# Shared counters
+routing_stats = RoutingStats()
@@ -0,0 +1,40 @@
+"""Workflow runtime for Edwardo system"""
+
+from .scheduler import DAGExecutor, Step, StepTiming
+from .events import EventStream, EventType, WorkflowEvent, event_stream
+from .checkpoints import (
+    CheckpointStore,
+    MongoCheckpointStore,
+    NullCheckpointStore,
+    SQLiteCheckpointStore,
+    checkpoint_store,
+)
+from .limits import RateLimiter, RateLimits, rate_limits, throttle_model_call
+from .llm_cache import ResponseCache, llm_cache
+from .telemetry import MetricsRegistry, Telemetry, metrics_registry, serve_metrics, telemetry
+
+__all__ = [
+    "DAGExecutor",
+    "Step",
+    "StepTiming",
+    "EventStream",
+    "EventType",
+    "WorkflowEvent",
+    "event_stream",
+    "CheckpointStore",
+    "MongoCheckpointStore",
+    "NullCheckpointStore",
+    "SQLiteCheckpointStore",
+    "checkpoint_store",
+    "RateLimiter",
+    "RateLimits",
+    "rate_limits",
+    "throttle_model_call",
+    "ResponseCache",
+    "llm_cache",
+    "MetricsRegistry",
+    "Telemetry",
+    "metrics_registry",
+    "serve_metrics",
+    "telemetry",
+]
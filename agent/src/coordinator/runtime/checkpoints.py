@@ -0,0 +1,197 @@
+"""
+Workflow checkpoints
+Each finished step's output is persisted under its workflow_id so that a
+workflow interrupted part way can resume without redoing expensive steps.
+Outputs are stored as zlib-compressed compact JSON.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+import json
+import logging
+import zlib
+
+from ..config import settings
+from .sqlite import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+
+def encode_output(output: Any) -> bytes:
+    """Compact serialized form of a step output; raises TypeError if it is not JSON"""
+    return zlib.compress(json.dumps(output, separators=(",", ":")).encode())
+
+
+def decode_output(payload: bytes) -> Any:
+    return json.loads(zlib.decompress(payload))
+
+
+class CheckpointStore(ABC):
+    """
+    Interface for checkpoint backends
+    ``begin`` records what is needed to rebuild the workflow, ``save`` stores
+    one step output and ``load`` returns every saved output by step name.
+    """
+
+    @abstractmethod
+    async def begin(self, workflow_id: str, workflow: str, params: Dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    async def save(self, workflow_id: str, step: str, output: Any) -> None:
+        ...
+
+    @abstractmethod
+    async def finish(self, workflow_id: str, status: str) -> None:
+        ...
+
+    @abstractmethod
+    async def load(self, workflow_id: str) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    async def get_workflow(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        """Workflow name, constructor params and status, or None if unknown"""
+
+
+class SQLiteCheckpointStore(CheckpointStore, SQLiteStore):
+    """Checkpoints in a local SQLite file"""
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS workflow_runs (
+            workflow_id TEXT PRIMARY KEY,
+            workflow TEXT NOT NULL,
+            params TEXT NOT NULL,
+            status TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS workflow_checkpoints (
+            workflow_id TEXT NOT NULL,
+            step TEXT NOT NULL,
+            payload BLOB NOT NULL,
+            saved_at TEXT NOT NULL,
+            PRIMARY KEY (workflow_id, step)
+        );
+    """
+
+    async def begin(self, workflow_id: str, workflow: str, params: Dict[str, Any]) -> None:
+        await self._run(
+            "INSERT INTO workflow_runs VALUES (?, ?, ?, 'running', ?) "
+            "ON CONFLICT(workflow_id) DO UPDATE SET status = 'running', updated_at = excluded.updated_at",
+            (workflow_id, workflow, json.dumps(params, default=str), _now()),
+        )
+
+    async def save(self, workflow_id: str, step: str, output: Any) -> None:
+        await self._run(
+            "INSERT OR REPLACE INTO workflow_checkpoints VALUES (?, ?, ?, ?)",
+            (workflow_id, step, encode_output(output), _now()),
+        )
+
+    async def finish(self, workflow_id: str, status: str) -> None:
+        await self._run(
+            "UPDATE workflow_runs SET status = ?, updated_at = ? WHERE workflow_id = ?",
+            (status, _now(), workflow_id),
+        )
+
+    async def load(self, workflow_id: str) -> Dict[str, Any]:
+        rows = await self._run("SELECT step, payload FROM workflow_checkpoints WHERE workflow_id = ?", (workflow_id,))
+        return {step: decode_output(payload) for step, payload in rows}
+
+    async def get_workflow(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        rows = await self._run(
+            "SELECT workflow, params, status FROM workflow_runs WHERE workflow_id = ?", (workflow_id,)
+        )
+        if not rows:
+            return None
+        workflow, params, status = rows[0]
+        return {"workflow": workflow, "params": json.loads(params), "status": status}
+
+
+class MongoCheckpointStore(CheckpointStore):
+    """
+    Checkpoints in the workflow_runs and workflow_checkpoints collections
+    Step lookups use the workflow_checkpoints repository's (workflow_id, step)
+    index, created by ``data.ensure_indexes``.
+    """
+
+    def _db(self) -> Any:
+        from ..data import get_database
+        return get_database()
+
+    def _checkpoints(self) -> Any:
+        from ..data import workflow_checkpoints
+        return workflow_checkpoints.collection()
+
+    async def begin(self, workflow_id: str, workflow: str, params: Dict[str, Any]) -> None:
+        await self._db().workflow_runs.update_one(
+            {"_id": workflow_id},
+            {
+                "$set": {"status": "running", "updated_at": datetime.now(timezone.utc)},
+                "$setOnInsert": {"workflow": workflow, "params": params},
+            },
+            upsert=True,
+        )
+
+    async def save(self, workflow_id: str, step: str, output: Any) -> None:
+        await self._checkpoints().update_one(
+            {"_id": f"{workflow_id}:{step}"},
+            {"$set": {
+                "workflow_id": workflow_id,
+                "step": step,
+                "payload": encode_output(output),
+                "saved_at": datetime.now(timezone.utc),
+            }},
+            upsert=True,
+        )
+
+    async def finish(self, workflow_id: str, status: str) -> None:
+        await self._db().workflow_runs.update_one(
+            {"_id": workflow_id}, {"$set": {"status": status, "updated_at": datetime.now(timezone.utc)}}
+        )
+
+    async def load(self, workflow_id: str) -> Dict[str, Any]:
+        cursor = self._checkpoints().find({"workflow_id": workflow_id})
+        return {doc["step"]: decode_output(doc["payload"]) async for doc in cursor}
+
+    async def get_workflow(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        doc = await self._db().workflow_runs.find_one({"_id": workflow_id})
+        if doc is None:
+            return None
+        return {"workflow": doc["workflow"], "params": doc.get("params", {}), "status": doc["status"]}
+
+
+class NullCheckpointStore(CheckpointStore):
+    """Disables checkpointing"""
+
+    async def begin(self, workflow_id: str, workflow: str, params: Dict[str, Any]) -> None:
+        return None
+
+    async def save(self, workflow_id: str, step: str, output: Any) -> None:
+        return None
+
+    async def finish(self, workflow_id: str, status: str) -> None:
+        return None
+
+    async def load(self, workflow_id: str) -> Dict[str, Any]:
+        return {}
+
+    async def get_workflow(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        return None
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def create_checkpoint_store() -> CheckpointStore:
+    """Checkpoint backend selected by ``settings.checkpoint_store``"""
+    if settings.checkpoint_store == "mongodb":
+        return MongoCheckpointStore()
+    if settings.checkpoint_store == "sqlite":
+        return SQLiteCheckpointStore(settings.checkpoint_path)
+    return NullCheckpointStore()
+
+
+# Shared checkpoint store
+checkpoint_store = create_checkpoint_store()
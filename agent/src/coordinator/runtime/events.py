@@ -0,0 +1,82 @@
+"""
+Workflow progress events
+Workflows publish step lifecycle events to async queues; rendering them is
+left to whoever subscribes, and with no subscribers publishing is free.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
+import asyncio
+
+
+class EventType(str, Enum):
+    """Lifecycle events emitted by workflows"""
+
+    WORKFLOW_STARTED = "workflow_started"
+    STEP_STARTED = "step_started"
+    STEP_FINISHED = "step_finished"
+    OFFER_READY = "offer_ready"
+    WORKFLOW_FINISHED = "workflow_finished"
+    WORKFLOW_FAILED = "workflow_failed"
+
+
+@dataclass
+class WorkflowEvent:
+    """A single progress event"""
+
+    type: EventType
+    workflow: str
+    workflow_id: str
+    step: Optional[str] = None
+    description: str = ""
+    duration_seconds: Optional[float] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+    timestamp: datetime = field(default_factory=datetime.now)
+
+
+class EventStream:
+    """
+    Fan-out of workflow events to subscriber queues
+    Each subscriber gets its own queue; ``None`` marks the end of the stream.
+    """
+
+    def __init__(self):
+        self._subscribers: List[asyncio.Queue] = []
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscribe(self, maxsize: int = 0) -> asyncio.Queue:
+        """Register a new subscriber queue"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Remove a subscriber queue"""
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    def emit(self, event: WorkflowEvent) -> None:
+        """Publish an event without blocking; full queues drop the event"""
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                pass
+
+    def close(self) -> None:
+        """Signal end-of-stream to every subscriber"""
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(None)
+            except asyncio.QueueFull:
+                pass
+        self._subscribers = []
+
+
+# Default stream shared by workflows
+event_stream = EventStream()
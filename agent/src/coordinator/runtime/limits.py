@@ -0,0 +1,109 @@
+"""
+Per-backend rate limits
+Calls to shared external backends (Gemini, Instacart, Plaid) go through a
+rate limiter so that many concurrent workflows stay within each provider's
+quota instead of failing with throttling errors.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import heapq
+import time
+
+from ..config import settings
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter allowing ``rate`` calls per second with bursts of ``burst``
+    Callers reserve a slot and sleep until it comes up, so waiters are served
+    in arrival order without a lock. A waiter cancelled before its slot comes
+    up gives the slot back for the next caller.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._interval = 1.0 / rate
+        self._next_free = 0.0
+        # Future slots given back by cancelled waiters, earliest first
+        self._returned: List[float] = []
+        self.stats = {"calls": 0, "throttled": 0, "wait_seconds": 0.0, "cancelled": 0}
+
+    def _take(self) -> Tuple[float, float]:
+        """Reserve the next slot (reusing a returned one first); returns the slot and the wait for it"""
+        now = time.monotonic()
+        while self._returned:
+            slot = heapq.heappop(self._returned)
+            if slot >= now:
+                break
+        else:
+            slot = max(self._next_free, now)
+            self._next_free = slot + self._interval
+        wait = max(0.0, slot - (self.burst - 1) * self._interval - now)
+        self.stats["calls"] += 1
+        if wait > 0:
+            self.stats["throttled"] += 1
+            self.stats["wait_seconds"] += wait
+        return slot, wait
+
+    def reserve(self) -> float:
+        """Reserve the next slot and return how long to wait for it"""
+        return self._take()[1]
+
+    def release(self, slot: float) -> None:
+        """Give back a reserved slot that will not be used"""
+        self.stats["calls"] -= 1
+        self.stats["cancelled"] += 1
+        if slot + self._interval == self._next_free:
+            self._next_free = slot
+        else:
+            heapq.heappush(self._returned, slot)
+
+    async def acquire(self) -> None:
+        slot, wait = self._take()
+        if wait > 0:
+            started = time.monotonic()
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self.stats["throttled"] -= 1
+                self.stats["wait_seconds"] -= max(0.0, wait - (time.monotonic() - started))
+                self.release(slot)
+                raise
+
+
+class RateLimits:
+    """Rate limiters by backend name; backends without a configured limit are unlimited"""
+
+    def __init__(self, limits: Optional[Dict[str, float]] = None):
+        self._limits = dict(settings.backend_rate_limits if limits is None else limits)
+        self._limiters: Dict[str, RateLimiter] = {}
+
+    def limiter(self, backend: str) -> Optional[RateLimiter]:
+        if backend not in self._limiters and self._limits.get(backend):
+            self._limiters[backend] = RateLimiter(self._limits[backend])
+        return self._limiters.get(backend)
+
+    async def acquire(self, backend: str) -> None:
+        limiter = self.limiter(backend)
+        if limiter is not None:
+            await limiter.acquire()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            backend: {**limiter.stats, "wait_seconds": round(limiter.stats["wait_seconds"], 3), "rate": limiter.rate}
+            for backend, limiter in self._limiters.items()
+        }
+
+
+# Shared limits: every workflow in the process draws on the same quotas
+rate_limits = RateLimits()
+
+
+async def throttle_model_call(callback_context: Any, llm_request: Any) -> None:
+    """ADK before_model_callback that waits for a Gemini rate-limit slot"""
+    # Only calls that reach Gemini draw on its quota (not local or fake models)
+    if "gemini" in (llm_request.model or ""):
+        await rate_limits.acquire("gemini")
+    return None
@@ -0,0 +1,183 @@
+"""
+Gemini response cache
+Opt-in cache of model responses for agent calls, wired in through ADK's
+before/after model callbacks. The key is a canonical hash of the model,
+instruction, generate_content_config, tools and conversation contents, so
+repeat plans with the same inputs skip the model call entirely.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+import zlib
+
+from ..config import settings
+from .sqlite import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+
+def request_key(llm_request: Any) -> str:
+    """Canonical hash of everything that determines a model response"""
+    config = llm_request.config.model_dump(mode="json", exclude_none=True) if llm_request.config else {}
+    # Transport options do not change the answer
+    config.pop("http_options", None)
+    payload = {
+        "model": llm_request.model,
+        "config": config,
+        "contents": [content.model_dump(mode="json", exclude_none=True) for content in llm_request.contents],
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ResponseCache(SQLiteStore):
+    """
+    Disk-backed LRU store of serialized LlmResponse objects
+    Entries live in a SQLite file; once the stored payloads exceed
+    ``max_bytes`` the least recently used entries are evicted.
+    """
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS llm_responses (
+            key TEXT PRIMARY KEY,
+            agent TEXT NOT NULL,
+            payload BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            last_used REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS llm_responses_last_used ON llm_responses (last_used);
+    """
+
+    def __init__(self, path: Union[str, Path], max_bytes: int, bypass_agents: Iterable[str] = (),
+                 enabled: bool = True):
+        super().__init__(path)
+        self.max_bytes = max_bytes
+        self.bypass_agents = set(bypass_agents)
+        self.enabled = enabled
+        self._size = 0
+        # Key of the outstanding miss per (invocation, agent), stored by after_model
+        self._pending: Dict[Tuple[str, str], str] = {}
+        self.stats = {"hits": 0, "misses": 0, "bypassed": 0, "stored": 0, "evicted": 0, "errors": 0}
+        self.agent_stats: Dict[str, Dict[str, int]] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = super()._connect()
+            self._size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()[0]
+        return self._conn
+
+    def _get(self, key: str) -> Optional[bytes]:
+        def touch(conn: sqlite3.Connection) -> Optional[bytes]:
+            row = conn.execute("SELECT payload FROM llm_responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE llm_responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            return row[0] if row else None
+
+        return self._transaction(touch)
+
+    def _put(self, key: str, agent: str, payload: bytes) -> None:
+        def write(conn: sqlite3.Connection) -> None:
+            previous = conn.execute("SELECT size FROM llm_responses WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?, ?, ?)",
+                (key, agent, payload, len(payload), time.time()),
+            )
+            self._size += len(payload) - (previous[0] if previous else 0)
+            self._evict(conn)
+
+        self._transaction(write)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        while self._size > self.max_bytes:
+            rows = conn.execute("SELECT key, size FROM llm_responses ORDER BY last_used LIMIT 64").fetchall()
+            if not rows:
+                self._size = 0
+                return
+            for key, size in rows:
+                if self._size <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self._size -= size
+                self.stats["evicted"] += 1
+
+    def _count(self, agent: str, outcome: str) -> None:
+        self.stats[outcome] += 1
+        counters = self.agent_stats.setdefault(agent, {"hits": 0, "misses": 0, "bypassed": 0})
+        counters[outcome] += 1
+
+    async def before_model(self, callback_context: Any, llm_request: Any) -> Any:
+        """ADK before_model_callback: return the cached response on a hit"""
+        if not self.enabled:
+            return None
+        agent = callback_context.agent_name
+        if agent in self.bypass_agents:
+            self._count(agent, "bypassed")
+            return None
+        try:
+            key = request_key(llm_request)
+            payload = await asyncio.to_thread(self._get, key)
+        except Exception as e:
+            logger.warning("LLM cache lookup failed for %s: %s", agent, e)
+            self.stats["errors"] += 1
+            return None
+
+        if payload is None:
+            self._count(agent, "misses")
+            self._pending[(callback_context.invocation_id, agent)] = key
+            return None
+
+        from google.adk.models.llm_response import LlmResponse
+        self._count(agent, "hits")
+        return LlmResponse.model_validate_json(zlib.decompress(payload))
+
+    async def after_model(self, callback_context: Any, llm_response: Any) -> Any:
+        """ADK after_model_callback: store complete, successful responses"""
+        # Streaming chunks arrive first; keep the key for the final response
+        if llm_response.partial:
+            return None
+        key = self._pending.pop((callback_context.invocation_id, callback_context.agent_name), None)
+        if key is None or llm_response.error_code or llm_response.content is None:
+            return None
+        try:
+            payload = zlib.compress(llm_response.model_dump_json(exclude_none=True).encode())
+            await asyncio.to_thread(self._put, key, callback_context.agent_name, payload)
+            self.stats["stored"] += 1
+        except Exception as e:
+            logger.warning("LLM cache store failed: %s", e)
+            self.stats["errors"] += 1
+        return None
+
+    def hit_ratio(self) -> float:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return round(self.stats["hits"] / lookups, 4) if lookups else 0.0
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "hit_ratio": self.hit_ratio(),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "agents": self.agent_stats,
+        }
+
+    def clear(self) -> None:
+        def delete(conn: sqlite3.Connection) -> None:
+            conn.execute("DELETE FROM llm_responses")
+            self._size = 0
+
+        self._transaction(delete)
+
+
+# Shared cache; does nothing unless LLM_CACHE_ENABLED is set
+llm_cache = ResponseCache(
+    settings.llm_cache_path,
+    max_bytes=settings.llm_cache_max_bytes,
+    bypass_agents=settings.llm_cache_bypass_agents,
+    enabled=settings.llm_cache_enabled,
+)
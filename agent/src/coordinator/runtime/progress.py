@@ -0,0 +1,84 @@
+"""
+Rich console subscriber for workflow progress events
+"""
+
+from typing import Dict, Optional
+import asyncio
+from rich.console import Console
+from rich.progress import Progress, SpinnerColumn, TextColumn, TaskID
+
+from .events import EventType, WorkflowEvent
+
+WORKFLOW_ICONS = {
+    "weekly_planning": "🚀",
+    "approval": "📋",
+    "adaptive_replan": "🔄",
+    "emergency_restock": "🚨",
+}
+
+
+class ConsoleProgress:
+    """Renders workflow events as Rich spinners, one live display per workflow run"""
+
+    def __init__(self, console: Console):
+        self.console = console
+        self._progress: Dict[str, Progress] = {}
+        self._tasks: Dict[tuple, TaskID] = {}
+
+    async def consume(self, queue: asyncio.Queue) -> None:
+        """Render events until the stream is closed"""
+        while True:
+            event: Optional[WorkflowEvent] = await queue.get()
+            try:
+                if event is None:
+                    break
+                self.render(event)
+            finally:
+                queue.task_done()
+        for progress in self._progress.values():
+            progress.stop()
+
+    def render(self, event: WorkflowEvent) -> None:
+        if event.type == EventType.WORKFLOW_STARTED:
+            icon = WORKFLOW_ICONS.get(event.workflow, "▶")
+            self.console.print(f"\n[bold cyan]{icon} {event.description}[/bold cyan]")
+            for key, value in event.data.items():
+                label = key.replace("_", " ").title().replace(" Id", " ID")
+                self.console.print(f"{label}: {value}")
+            self.console.print(f"Workflow ID: {event.workflow_id}\n")
+        elif event.type == EventType.STEP_STARTED:
+            progress = self._progress_for(event.workflow_id)
+            self._tasks[(event.workflow_id, event.step)] = progress.add_task(
+                f"[cyan]{event.description}", total=None
+            )
+        elif event.type == EventType.STEP_FINISHED:
+            task = self._tasks.pop((event.workflow_id, event.step), None)
+            if task is not None:
+                self._progress[event.workflow_id].update(
+                    task,
+                    description=f"[green]✓ {event.description} [dim]({event.duration_seconds:.2f}s)[/dim]",
+                )
+        elif event.type == EventType.OFFER_READY:
+            self.console.print(f"[bold yellow]⚡ {event.description}[/bold yellow]")
+        elif event.type == EventType.WORKFLOW_FINISHED:
+            self._stop(event.workflow_id)
+            self.console.print(f"\n[bold green]✅ {event.description}[/bold green]\n")
+        elif event.type == EventType.WORKFLOW_FAILED:
+            self._stop(event.workflow_id)
+            self.console.print(f"\n[bold red]❌ {event.description}[/bold red]\n")
+
+    def _progress_for(self, workflow_id: str) -> Progress:
+        if workflow_id not in self._progress:
+            progress = Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                console=self.console,
+            )
+            progress.start()
+            self._progress[workflow_id] = progress
+        return self._progress[workflow_id]
+
+    def _stop(self, workflow_id: str) -> None:
+        progress = self._progress.pop(workflow_id, None)
+        if progress is not None:
+            progress.stop()
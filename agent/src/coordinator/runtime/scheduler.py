@@ -0,0 +1,161 @@
+"""
+Dependency-graph scheduler for workflow steps
+Runs each step as soon as the steps it depends on have finished
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import time
+
+
+@dataclass
+class Step:
+    """A single unit of work in a workflow graph
+
+    ``run`` is awaited with the results of ``depends_on`` passed positionally,
+    in the order they are listed. Steps with ``checkpoint=False`` are cheap to
+    redo and their results are not persisted.
+    """
+
+    name: str
+    run: Callable[..., Awaitable[Any]]
+    depends_on: Tuple[str, ...] = ()
+    description: str = ""
+    completed_description: str = ""
+    checkpoint: bool = True
+
+
+@dataclass
+class StepTiming:
+    """Wall-clock timing of a finished step, relative to the start of the run"""
+
+    name: str
+    started_at: float
+    finished_at: float
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.finished_at - self.started_at
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "started_at": round(self.started_at, 4),
+            "duration_seconds": round(self.duration_seconds, 4),
+        }
+
+
+StepCallback = Callable[[Step], None]
+StepFinishedCallback = Callable[[Step, StepTiming], None]
+StepResultCallback = Callable[[Step, Any], Awaitable[None]]
+
+
+@dataclass
+class DAGExecutor:
+    """
+    Asyncio scheduler for a graph of workflow steps
+    Independent branches run concurrently, so a run takes as long as its
+    critical path rather than the sum of all steps.
+
+    ``completed`` holds results restored from a checkpoint; those steps are
+    not run again. ``on_step_result`` is awaited with each new result before
+    dependent steps start, so it can persist the result.
+    """
+
+    steps: List[Step]
+    on_step_started: Optional[StepCallback] = None
+    on_step_finished: Optional[StepFinishedCallback] = None
+    completed: Dict[str, Any] = field(default_factory=dict)
+    on_step_result: Optional[StepResultCallback] = None
+    results: Dict[str, Any] = field(default_factory=dict, init=False)
+    timings: Dict[str, StepTiming] = field(default_factory=dict, init=False)
+
+    def __post_init__(self):
+        self._steps = {step.name: step for step in self.steps}
+        if len(self._steps) != len(self.steps):
+            raise ValueError("Duplicate step names in workflow graph")
+        self._order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        """Order steps so every step follows its dependencies; reject cycles"""
+        order: List[str] = []
+        state: Dict[str, str] = {}
+
+        def visit(name: str, path: Tuple[str, ...]) -> None:
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Cycle in workflow graph: {' -> '.join(path + (name,))}")
+            state[name] = "visiting"
+            for dependency in self._steps[name].depends_on:
+                if dependency not in self._steps:
+                    raise ValueError(f"Step '{name}' depends on unknown step '{dependency}'")
+                visit(dependency, path + (name,))
+            state[name] = "done"
+            order.append(name)
+
+        for step in self.steps:
+            visit(step.name, ())
+        return order
+
+    async def run(self) -> Dict[str, Any]:
+        """Run every step and return their results keyed by step name"""
+        self.results = {}
+        self.timings = {}
+        origin = time.perf_counter()
+        tasks: Dict[str, asyncio.Task] = {}
+
+        for name in self._order:
+            step = self._steps[name]
+            dependencies = [tasks[dependency] for dependency in step.depends_on]
+            tasks[name] = asyncio.create_task(self._run_step(step, dependencies, origin), name=name)
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+
+        return self.results
+
+    async def _run_step(self, step: Step, dependencies: List[asyncio.Task], origin: float) -> None:
+        if dependencies:
+            await asyncio.gather(*dependencies)
+
+        if step.name in self.completed:
+            self.results[step.name] = self.completed[step.name]
+            return
+
+        if self.on_step_started:
+            self.on_step_started(step)
+
+        started_at = time.perf_counter() - origin
+        result = await step.run(*(self.results[dependency] for dependency in step.depends_on))
+        timing = StepTiming(step.name, started_at, time.perf_counter() - origin)
+
+        if self.on_step_result:
+            await self.on_step_result(step, result)
+
+        self.results[step.name] = result
+        self.timings[step.name] = timing
+
+        if self.on_step_finished:
+            self.on_step_finished(step, timing)
+
+    def critical_path(self) -> Tuple[List[str], float]:
+        """Return the longest chain of dependent steps from the last run and its duration"""
+        longest: Dict[str, Tuple[float, List[str]]] = {}
+        for name in self._order:
+            timing = self.timings.get(name)
+            if timing is None:
+                continue
+            upstream = [longest[dep] for dep in self._steps[name].depends_on if dep in longest]
+            base_duration, base_path = max(upstream, default=(0.0, []), key=lambda item: item[0])
+            longest[name] = (base_duration + timing.duration_seconds, base_path + [name])
+
+        if not longest:
+            return [], 0.0
+        duration, path = max(longest.values(), key=lambda item: item[0])
+        return path, duration
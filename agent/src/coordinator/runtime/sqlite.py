@@ -0,0 +1,54 @@
+"""
+Local SQLite stores
+Shared connection handling for every SQLite-backed store (ingestion,
+checkpoints, the LLM response cache): one WAL-mode connection per file,
+used from worker threads under a lock.
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar, Union
+import asyncio
+import sqlite3
+import threading
+
+T = TypeVar("T")
+
+
+class SQLiteStore:
+    """Base for local stores; subclasses set ``schema``"""
+
+    schema = ""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self.schema)
+            self._conn = conn
+        return self._conn
+
+    def _transaction(self, write: Callable[[sqlite3.Connection], T]) -> T:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                return write(conn)
+
+    async def _run(self, sql: str, params: tuple = ()) -> list:
+        return await asyncio.to_thread(self._transaction, lambda conn: conn.execute(sql, params).fetchall())
+
+    async def _write(self, write: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run several statements in one transaction"""
+        return await asyncio.to_thread(self._transaction, write)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
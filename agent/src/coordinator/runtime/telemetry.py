@@ -0,0 +1,312 @@
+"""
+Agent and tool instrumentation
+Records wall time, token counts, tool call counts and payload sizes for
+agent runs, model calls, tool calls, MCP calls and workflow steps. Every
+measurement feeds an in-process histogram registry (served in Prometheus
+text format) and, when tracing is enabled, a per-workflow JSON trace file.
+"""
+
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import bisect
+import json
+import logging
+import time
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Workflow the current task is running for; inherited by the tasks it spawns
+current_workflow_id: ContextVar[str] = ContextVar("current_workflow_id", default="")
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+TOKEN_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144)
+
+
+def _escape_label(value: Any) -> str:
+    # Label values escape backslash, double quote and newline in the text format
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels, as in the Prometheus data model"""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = SECONDS_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        # counts per bucket (last one is +Inf), then sum and count
+        series = self._series.setdefault(label_values, [0.0] * (len(self.buckets) + 3))
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for label_values, series in sorted(self._series.items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else 'le="%r"' % bound
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, label_values, le)} {cumulative:g}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, label_values)} {series[-2]:g}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, label_values)} {series[-1]:g}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, *label_values: str) -> None:
+        self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for label_values, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {value:g}")
+        return lines
+
+
+class MetricsRegistry:
+    """In-process metric registry rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = SECONDS_BUCKETS) -> Histogram:
+        if name not in self._metrics:
+            self._metrics[name] = Histogram(name, help, labels, buckets)
+        return self._metrics[name]
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        if name not in self._metrics:
+            self._metrics[name] = Counter(name, help, labels)
+        return self._metrics[name]
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def _payload_bytes(value: Any) -> int:
+    try:
+        return len(json.dumps(value, default=str, separators=(",", ":")))
+    except (TypeError, ValueError):
+        return 0
+
+
+class Telemetry:
+    """
+    Collects measurements and groups them by workflow_id
+    The ``before_*``/``after_*`` methods are ADK agent, model and tool
+    callbacks; workflows call ``bind``/``finish`` around their execution.
+    """
+
+    def __init__(self, registry: MetricsRegistry, trace_dir: str = ""):
+        self.registry = registry
+        self.trace_dir = trace_dir
+        self._spans: Dict[str, List[Dict[str, Any]]] = {}
+        self._started: Dict[Tuple[str, ...], float] = {}
+
+        self.agent_seconds = registry.histogram("edwardo_agent_run_seconds", "Wall time of agent runs", ("agent",))
+        self.model_seconds = registry.histogram("edwardo_model_call_seconds", "Wall time of model calls", ("agent",))
+        self.model_tokens = registry.histogram(
+            "edwardo_model_call_tokens", "Tokens per model call", ("agent", "type"), TOKEN_BUCKETS
+        )
+        self.tokens_total = registry.counter("edwardo_tokens_total", "Tokens used", ("agent", "type"))
+        self.tool_seconds = registry.histogram("edwardo_tool_call_seconds", "Wall time of agent tool calls", ("tool",))
+        self.tool_bytes = registry.histogram(
+            "edwardo_tool_call_bytes", "Tool call payload sizes", ("tool", "direction"), BYTES_BUCKETS
+        )
+        self.tool_calls = registry.counter("edwardo_tool_calls_total", "Agent tool calls", ("tool", "status"))
+        self.mcp_seconds = registry.histogram("edwardo_mcp_call_seconds", "Wall time of MCP server calls", ("server", "tool"))
+        self.mcp_bytes = registry.histogram(
+            "edwardo_mcp_call_bytes", "MCP call payload sizes", ("server", "direction"), BYTES_BUCKETS
+        )
+        self.step_seconds = registry.histogram("edwardo_workflow_step_seconds", "Wall time of workflow steps", ("workflow", "step"))
+        self.workflow_seconds = registry.histogram("edwardo_workflow_seconds", "Wall time of workflows", ("workflow", "status"))
+
+    @property
+    def tracing(self) -> bool:
+        return bool(self.trace_dir)
+
+    def _span(self, kind: str, name: str, seconds: float, **fields: Any) -> None:
+        workflow_id = current_workflow_id.get()
+        if not self.tracing or not workflow_id:
+            return
+        self._spans.setdefault(workflow_id, []).append({
+            "kind": kind,
+            "name": name,
+            "ended_at": time.time(),
+            "duration_seconds": round(seconds, 6),
+            **fields,
+        })
+
+    # Workflows
+
+    def bind(self, workflow_id: str) -> Any:
+        """Attribute measurements in the current task to ``workflow_id``; returns a reset token"""
+        self._started[("workflow", workflow_id)] = time.perf_counter()
+        return current_workflow_id.set(workflow_id)
+
+    def finish(self, token: Any, workflow: str, status: str) -> Optional[Path]:
+        """Close the workflow's measurements and write its trace file if tracing is on"""
+        workflow_id = current_workflow_id.get()
+        current_workflow_id.reset(token)
+        started = self._started.pop(("workflow", workflow_id), None)
+        seconds = time.perf_counter() - started if started is not None else 0.0
+        self.workflow_seconds.observe(seconds, workflow, status)
+        spans = self._spans.pop(workflow_id, [])
+        if not self.tracing:
+            return None
+        return self._write_trace(workflow_id, workflow, status, seconds, spans)
+
+    def record_step(self, workflow: str, step: str, seconds: float) -> None:
+        self.step_seconds.observe(seconds, workflow, step)
+        self._span("step", step, seconds, workflow=workflow)
+
+    def record_mcp_call(self, server: str, tool: str, seconds: float, bytes_in: int, bytes_out: int) -> None:
+        self.mcp_seconds.observe(seconds, server, tool)
+        self.mcp_bytes.observe(bytes_in, server, "in")
+        self.mcp_bytes.observe(bytes_out, server, "out")
+        self._span("mcp", f"{server}.{tool}", seconds, bytes_in=bytes_in, bytes_out=bytes_out)
+
+    # ADK callbacks
+
+    async def before_agent(self, callback_context: Any) -> None:
+        self._started[("agent", callback_context.invocation_id, callback_context.agent_name)] = time.perf_counter()
+        return None
+
+    async def after_agent(self, callback_context: Any) -> None:
+        agent = callback_context.agent_name
+        started = self._started.pop(("agent", callback_context.invocation_id, agent), None)
+        if started is not None:
+            seconds = time.perf_counter() - started
+            self.agent_seconds.observe(seconds, agent)
+            self._span("agent", agent, seconds)
+        return None
+
+    async def before_model(self, callback_context: Any, llm_request: Any) -> None:
+        self._started[("model", callback_context.invocation_id, callback_context.agent_name)] = time.perf_counter()
+        return None
+
+    async def after_model(self, callback_context: Any, llm_response: Any) -> None:
+        agent = callback_context.agent_name
+        started = self._started.pop(("model", callback_context.invocation_id, agent), None)
+        if started is None or llm_response.partial:
+            return None
+        seconds = time.perf_counter() - started
+        usage = llm_response.usage_metadata
+        prompt_tokens = (usage.prompt_token_count or 0) if usage else 0
+        completion_tokens = (usage.candidates_token_count or 0) if usage else 0
+        self.model_seconds.observe(seconds, agent)
+        self.model_tokens.observe(prompt_tokens, agent, "prompt")
+        self.model_tokens.observe(completion_tokens, agent, "completion")
+        self.tokens_total.inc(prompt_tokens, agent, "prompt")
+        self.tokens_total.inc(completion_tokens, agent, "completion")
+        self._span("model", agent, seconds, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+        return None
+
+    async def before_tool(self, tool: Any, args: Dict[str, Any], tool_context: Any) -> None:
+        self._started[("tool", tool_context.invocation_id, tool_context.function_call_id or tool.name)] = time.perf_counter()
+        return None
+
+    async def after_tool(self, tool: Any, args: Dict[str, Any], tool_context: Any, tool_response: Any) -> None:
+        started = self._started.pop(("tool", tool_context.invocation_id, tool_context.function_call_id or tool.name), None)
+        if started is None:
+            return None
+        seconds = time.perf_counter() - started
+        bytes_in, bytes_out = _payload_bytes(args), _payload_bytes(tool_response)
+        status = "error" if isinstance(tool_response, dict) and tool_response.get("isError") else "ok"
+        self.tool_seconds.observe(seconds, tool.name)
+        self.tool_bytes.observe(bytes_in, tool.name, "in")
+        self.tool_bytes.observe(bytes_out, tool.name, "out")
+        self.tool_calls.inc(1, tool.name, status)
+        self._span("tool", tool.name, seconds, bytes_in=bytes_in, bytes_out=bytes_out, status=status)
+        return None
+
+    # Export
+
+    def _write_trace(self, workflow_id: str, workflow: str, status: str, seconds: float,
+                     spans: List[Dict[str, Any]]) -> Optional[Path]:
+        summary: Dict[str, Dict[str, float]] = {}
+        for span in spans:
+            totals = summary.setdefault(span["kind"], {"count": 0, "seconds": 0.0})
+            totals["count"] += 1
+            totals["seconds"] = round(totals["seconds"] + span["duration_seconds"], 6)
+            for field in ("prompt_tokens", "completion_tokens", "bytes_in", "bytes_out"):
+                if field in span:
+                    totals[field] = totals.get(field, 0) + span[field]
+        trace = {
+            "workflow_id": workflow_id,
+            "workflow": workflow,
+            "status": status,
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "duration_seconds": round(seconds, 6),
+            "summary": summary,
+            "slowest": sorted(spans, key=lambda span: span["duration_seconds"], reverse=True)[:10],
+            "spans": spans,
+        }
+        path = Path(self.trace_dir) / f"{workflow_id.replace(':', '-').replace('/', '_')}.json"
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(trace, indent=2, default=str))
+        except OSError as e:
+            logger.warning("Could not write trace for %s: %s", workflow_id, e)
+            return None
+        return path
+
+
+async def serve_metrics(port: int, host: str = "127.0.0.1", registry: Optional[MetricsRegistry] = None) -> asyncio.AbstractServer:
+    """Serve the registry in Prometheus text format at ``/metrics``"""
+    registry = registry or metrics_registry
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            path = request.split()[1].decode() if len(request.split()) > 1 else "/"
+            if path.split("?")[0] == "/metrics":
+                body, status = registry.render().encode(), "200 OK"
+            else:
+                body, status = b"not found\n", "404 Not Found"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+# Shared registry and instrumentation
+metrics_registry = MetricsRegistry()
+telemetry = Telemetry(metrics_registry, trace_dir=settings.trace_dir)
@@ -0,0 +1,172 @@
+"""
+Spending analytics
+Rolling weekly grocery totals per user and category, updated incrementally
+as transactions arrive. The context step reads ``spending_patterns`` from
+these aggregates instead of summarizing raw transactions.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+import logging
+
+from .config import settings
+from .data import SpendingWeekRepository, spending_weeks
+
+logger = logging.getLogger(__name__)
+
+DateLike = Union[date, datetime, str]
+
+
+def week_start(when: DateLike) -> date:
+    """Monday of the week containing ``when``"""
+    if isinstance(when, str):
+        when = date.fromisoformat(when[:10])
+    if isinstance(when, datetime):
+        when = when.date()
+    return when - timedelta(days=when.weekday())
+
+
+@dataclass
+class _UserSpending:
+    """Weekly buckets inside the window plus running totals over them"""
+
+    weeks: Dict[date, Dict[str, float]] = field(default_factory=dict)
+    categories: Dict[str, float] = field(default_factory=dict)
+    total: float = 0.0
+    first_week: Optional[date] = None
+
+    def add(self, week: date, category: str, amount: float) -> None:
+        bucket = self.weeks.setdefault(week, {})
+        bucket[category] = bucket.get(category, 0.0) + amount
+        self.categories[category] = self.categories.get(category, 0.0) + amount
+        self.total += amount
+        if self.first_week is None or week < self.first_week:
+            self.first_week = week
+
+    def evict_before(self, oldest: date) -> None:
+        # At most window_weeks buckets are held, so this is bounded work
+        for week in [week for week in self.weeks if week < oldest]:
+            for category, amount in self.weeks.pop(week).items():
+                self.categories[category] -= amount
+                self.total -= amount
+
+
+class SpendingAnalytics:
+    """
+    Rolling per-category weekly spending, per user
+    Transactions are folded into weekly buckets as they arrive; reading a
+    user's patterns touches only the running totals. With a store, weekly
+    buckets are also persisted so totals survive restarts.
+    """
+
+    def __init__(self, store: Optional[SpendingWeekRepository] = None, window_weeks: Optional[int] = None):
+        self.store = store
+        self.window_weeks = window_weeks or settings.spending_window_weeks
+        self._users: Dict[str, _UserSpending] = {}
+
+    def _window_start(self, today: Optional[date] = None) -> date:
+        return week_start(today or datetime.now(timezone.utc).date()) - timedelta(weeks=self.window_weeks - 1)
+
+    def tracks(self, user_id: str) -> bool:
+        return user_id in self._users
+
+    def _weekly_deltas(self, transactions: Iterable[Dict[str, Any]]) -> Tuple[Dict[date, Dict[str, float]], int]:
+        """Per-week, per-category sums of the transactions inside the window, and how many were counted"""
+        oldest = self._window_start()
+        deltas: Dict[date, Dict[str, float]] = {}
+        counted = 0
+        for transaction in transactions:
+            week = week_start(transaction["date"])
+            if week < oldest:
+                continue
+            category = transaction.get("category") or "other"
+            bucket = deltas.setdefault(week, {})
+            bucket[category] = bucket.get(category, 0.0) + float(transaction["amount"])
+            counted += 1
+        return deltas, counted
+
+    async def ingest(self, user_id: str, transactions: Iterable[Dict[str, Any]], persist: bool = True) -> int:
+        """
+        Fold transactions (``amount``, ``date``, ``category``) into the user's totals
+        Negative amounts (refunds, removed transactions) are subtracted.
+        Transactions older than the window are skipped. Returns how many were counted.
+        With ``persist=False`` only the in-memory totals change; the caller
+        writes the store with ``persist``.
+        """
+        if user_id not in self._users:
+            await self.load(user_id)
+        spending = self._users[user_id]
+        deltas, counted = self._weekly_deltas(transactions)
+        for week, categories in deltas.items():
+            for category, amount in categories.items():
+                spending.add(week, category, amount)
+
+        if persist and deltas and self.store is not None:
+            try:
+                await self.store.increment(user_id, deltas)
+            except Exception as e:
+                logger.warning("spending_weekly unavailable, totals kept in memory only: %s", e)
+        return counted
+
+    async def persist(self, user_id: str, transactions: Iterable[Dict[str, Any]]) -> None:
+        """Add transactions to the stored weekly buckets; raises if the store write fails"""
+        deltas, _ = self._weekly_deltas(transactions)
+        if deltas and self.store is not None:
+            await self.store.increment(user_id, deltas)
+
+    async def load(self, user_id: str) -> None:
+        """Rebuild a user's totals from the store's weekly buckets"""
+        spending = _UserSpending()
+        if self.store is not None:
+            for week, categories in (await self.store.weeks(user_id, self._window_start())).items():
+                for category, amount in categories.items():
+                    spending.add(week, category, amount)
+        # A concurrent load may have finished first
+        self._users.setdefault(user_id, spending)
+
+    async def patterns(self, user_id: str) -> Dict[str, Any]:
+        """The user's ``spending_patterns``: average weekly spend, in total and per category"""
+        if user_id not in self._users:
+            await self.load(user_id)
+        spending = self._users[user_id]
+        oldest = self._window_start()
+        spending.evict_before(oldest)
+
+        # Average over the weeks observed so far, up to the full window
+        observed = 0
+        if spending.first_week is not None:
+            current = week_start(datetime.now(timezone.utc).date())
+            observed = min(self.window_weeks, (current - max(spending.first_week, oldest)).days // 7 + 1)
+        weeks = max(observed, 1)
+        return {
+            "avg_weekly_grocery": round(spending.total / weeks, 2),
+            "categories": {
+                category: round(amount / weeks, 2)
+                for category, amount in spending.categories.items() if round(amount, 2)
+            },
+            "weeks_observed": observed,
+        }
+
+    def forget(self, user_id: str) -> None:
+        self._users.pop(user_id, None)
+
+
+# Shared analytics; persisted when context is read from MongoDB
+spending_analytics = SpendingAnalytics(spending_weeks if settings.context_store == "mongodb" else None)
+
+
+async def get_spending_patterns(user_id: str) -> Dict[str, Any]:
+    """Get a user's average weekly grocery spending, in total and per category.
+
+    Use this instead of downloading and summarizing raw Plaid transactions:
+    the totals are kept up to date as transactions arrive.
+
+    Args:
+        user_id: The user whose spending to summarize.
+
+    Returns:
+        ``avg_weekly_grocery``, per-category weekly averages under
+        ``categories``, and ``weeks_observed``.
+    """
+    return await spending_analytics.patterns(user_id)
@@ -5,6 +5,10 @@ from google.genai import types
 
 from . import prompt
 from ...tools.tools import mongodb_tools, calendar_tools, gmail_tools, plaid_tools, maps_tools
+from ...spending import get_spending_patterns
+from ...runtime.limits import throttle_model_call
+from ...runtime.llm_cache import llm_cache
+from ...runtime.telemetry import telemetry
 
 MODEL = "gemini-1.5-flash"
 
@@ -17,6 +21,9 @@ for tool in [mongodb_tools, calendar_tools, gmail_tools, plaid_tools, maps_tools
         else:
             tools.append(tool)
 
+# Precomputed weekly spending instead of raw transaction history
+tools.append(get_spending_patterns)
+
 context_agent = Agent(
     model=MODEL,
     name="context_agent",
@@ -24,4 +31,10 @@ context_agent = Agent(
     instruction=prompt.CONTEXT_AGENT_PROMPT,
     tools=tools,
     generate_content_config=types.GenerateContentConfig(temperature=0.1),
+    before_agent_callback=telemetry.before_agent,
+    after_agent_callback=telemetry.after_agent,
+    before_model_callback=[llm_cache.before_model, throttle_model_call, telemetry.before_model],
+    after_model_callback=[llm_cache.after_model, telemetry.after_model],
+    before_tool_callback=telemetry.before_tool,
+    after_tool_callback=telemetry.after_tool,
 )
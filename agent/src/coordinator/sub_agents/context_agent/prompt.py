@@ -8,13 +8,17 @@ Data Sources:
 1. MongoDB: User profile, pantry inventory, meal history, preferences
 2. Calendar: Upcoming events (dietary constraints: vegan potluck, dinner party, etc.)
 3. Gmail: Grocery receipts, delivery confirmations, subscription emails
-4. Plaid: Recent transactions to identify grocery spending patterns
+4. Plaid: Grocery spending patterns (use get_spending_patterns, not raw transactions)
 5. Google Maps: Store locations, traffic conditions, delivery zones
 
+These sources are independent: request them together in a single turn rather
+than one at a time. If a source fails or times out, continue with the others
+and list it under missing_sources instead of retrying.
+
 Analysis Outputs:
 - Current pantry status (low stock items, expiring soon)
 - Calendar constraints (events requiring specific meals)
 - Financial snapshot (weekly budget, recent spending)
 - Environmental factors (traffic to stores, weather for delivery)
 
-Output Format: Structured JSON with pantry_snapshot, calendar_events, financial_state, location_info"""
+Output Format: Structured JSON with pantry_snapshot, calendar_events, financial_state, location_info, missing_sources"""
@@ -5,6 +5,11 @@ from google.genai import types
 
 from . import prompt
 from ...tools.tools import mongodb_tools, instacart_tools
+from ...pricing import lookup_prices, optimize_vendor_selection
+from ...units import normalize_price_matrix
+from ...runtime.limits import throttle_model_call
+from ...runtime.llm_cache import llm_cache
+from ...runtime.telemetry import telemetry
 
 MODEL = "gemini-1.5-flash"
 
@@ -17,6 +22,9 @@ for tool in [mongodb_tools, instacart_tools]:
         else:
             tools.append(tool)
 
+# Batched, coalesced price lookups for whole lists, unit normalization and exact vendor selection
+tools.extend([lookup_prices, normalize_price_matrix, optimize_vendor_selection])
+
 decision_agent = Agent(
     model=MODEL,
     name="decision_agent",
@@ -24,4 +32,10 @@ decision_agent = Agent(
     instruction=prompt.DECISION_AGENT_PROMPT,
     tools=tools,
     generate_content_config=types.GenerateContentConfig(temperature=0.2),
+    before_agent_callback=telemetry.before_agent,
+    after_agent_callback=telemetry.after_agent,
+    before_model_callback=[llm_cache.before_model, throttle_model_call, telemetry.before_model],
+    after_model_callback=[llm_cache.after_model, telemetry.after_model],
+    before_tool_callback=telemetry.before_tool,
+    after_tool_callback=telemetry.after_tool,
 )
@@ -9,12 +9,21 @@ Price Comparison Process:
    - Instacart (multiple stores: Whole Foods, Trader Joe's, etc.)
    - Amazon Fresh
    - Walmart+
+   Use lookup_prices with the full item list and all stores in one call;
+   only fall back to instacart_search_products for items it cannot price.
 2. Normalize units (oz to lbs, etc.) for fair comparison
 3. Calculate unit prices
+   Prices may be package quotes ({"price", "size", "unit"}). Pass the grocery
+   items and the price matrix to normalize_price_matrix, which converts every
+   quote in one call and returns line costs and unit prices; never convert
+   units by hand.
 
 Vendor Selection Algorithm:
 Objective: Minimize (total_cost + delivery_fee + time_value)
 Factors: Item availability, total cost, delivery windows, quality ratings, user preferences
+Do not compute totals yourself: pass the item-by-vendor price matrix to
+optimize_vendor_selection, which solves the assignment exactly (including
+split orders) and returns the recommended vendor with its reasoning.
 
 Budget Alerts:
 - If total > user.weekly_grocery_budget: Flag as "over budget"
@@ -18,9 +18,8 @@ Order Tracking:
 - Send email notifications via Gmail
 
 Learning Loop:
-- After delivery, update pantry_items with incoming quantities
-- Store transaction in grocery_transactions
-- Update price_snapshots for history
-- Recalculate user preference scores
+- After delivery, the learning loop updates pantry_items, grocery_transactions,
+  price_snapshots and preference scores in bulk, off the approval path
+- Do not issue per-item mongodb_update_one or mongodb_insert_one calls for these
 
 Output Format: order_id, status, confirmation_number, estimated_delivery, total_charged, tracking_url"""
@@ -5,6 +5,10 @@ from google.genai import types
 
 from . import prompt
 from ...tools.tools import mongodb_tools, calendar_tools, maps_tools
+from ...grocery import compile_grocery_list
+from ...runtime.limits import throttle_model_call
+from ...runtime.llm_cache import llm_cache
+from ...runtime.telemetry import telemetry
 
 MODEL = "gemini-1.5-flash"
 
@@ -17,6 +21,9 @@ for tool in [mongodb_tools, calendar_tools, maps_tools]:
         else:
             tools.append(tool)
 
+# Deterministic ingredient aggregation for shopping lists
+tools.append(compile_grocery_list)
+
 planning_agent = Agent(
     model=MODEL,
     name="planning_agent",
@@ -24,4 +31,10 @@ planning_agent = Agent(
     instruction=prompt.PLANNING_AGENT_PROMPT,
     tools=tools,
     generate_content_config=types.GenerateContentConfig(temperature=0.7),
+    before_agent_callback=telemetry.before_agent,
+    after_agent_callback=telemetry.after_agent,
+    before_model_callback=[llm_cache.before_model, throttle_model_call, telemetry.before_model],
+    after_model_callback=[llm_cache.after_model, telemetry.after_model],
+    before_tool_callback=telemetry.before_tool,
+    after_tool_callback=telemetry.after_tool,
 )
@@ -12,6 +12,9 @@ Planning Process:
    - Cooking time constraints (busy weeknights vs. weekends)
    - Ingredient reuse (minimize waste, use expiring items)
 3. Create shopping list: Aggregate ingredients, subtract pantry stock
+   Pass the meal plan and pantry snapshot to compile_grocery_list instead of
+   adding up quantities yourself; it merges duplicate ingredients across
+   meals and converts units before subtracting the pantry.
 4. Optimize trips: Group by store, prioritize based on traffic/delivery windows
 
 Output Format: meal_plan (7 days), shopping_list (items with quantities), trip_optimization (store/delivery recommendations)"""
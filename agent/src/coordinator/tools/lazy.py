@@ -0,0 +1,59 @@
+"""
+Lazy MCP toolsets
+Tool declarations come from the static schemas in ``mcp_toolsets.py``, so an
+agent can be built and prompted without touching any MCP server; the pooled
+server is only started the first time one of its tools is actually called.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from google.adk.tools.base_tool import BaseTool
+from google.genai import types
+
+from .pool import MCPServerPool, PooledMCPToolset
+
+
+class LazyMCPTool(BaseTool):
+    """ADK tool declared up front that connects to its server on first call"""
+
+    def __init__(self, pool: MCPServerPool, server: str, declaration: types.FunctionDeclaration):
+        super().__init__(name=declaration.name, description=declaration.description or "")
+        self._pool = pool
+        self._server = server
+        self._declaration = declaration
+
+    def _get_declaration(self) -> types.FunctionDeclaration:
+        return self._declaration
+
+    async def run_async(self, *, args: Dict[str, Any], tool_context: Any) -> Any:
+        return await self._pool.call_tool(self._server, self.name, args)
+
+
+class LazyMCPToolset(PooledMCPToolset):
+    """Pooled toolset whose tool list is known without starting the server
+
+    ``declarations`` is any object with a ``get_tools()`` method returning
+    ``genai.types.Tool`` objects, such as the toolsets in ``mcp_toolsets.py``.
+    """
+
+    def __init__(self, pool: MCPServerPool, server: str, declarations: Any, tool_filter: Optional[List[str]] = None):
+        super().__init__(pool, server, tool_filter=tool_filter)
+        self._source = declarations
+        self._declarations: Optional[List[types.FunctionDeclaration]] = None
+
+    @property
+    def connected(self) -> bool:
+        return bool(self.pool.stats().get(self.server, {}).get("alive"))
+
+    def declarations(self) -> List[types.FunctionDeclaration]:
+        if self._declarations is None:
+            self._declarations = [
+                declaration
+                for tool in self._source.get_tools()
+                for declaration in tool.function_declarations or []
+            ]
+        return self._declarations
+
+    async def get_tools(self, readonly_context: Any = None) -> List[BaseTool]:
+        tools = [LazyMCPTool(self.pool, self.server, declaration) for declaration in self.declarations()]
+        return [tool for tool in tools if self._is_tool_selected(tool, readonly_context)]
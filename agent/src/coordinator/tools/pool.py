@@ -0,0 +1,306 @@
+"""
+MCP server process pool
+Starts each MCP server once, pings it before reuse after it has been idle,
+and shares its session across every agent and workflow run; crashed or hung
+servers are restarted on demand.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import json
+import threading
+import time
+
+import anyio
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.base_toolset import BaseToolset
+from google.genai import types
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from ..config import settings
+from ..runtime.telemetry import telemetry
+
+# Errors that mean the server process or its pipes are gone
+CONNECTION_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    ConnectionError,
+    BrokenPipeError,
+)
+
+
+@dataclass(frozen=True)
+class MCPServerSpec:
+    """How to launch one stdio MCP server"""
+
+    name: str
+    package: str
+    args: Tuple[str, ...] = ()
+    env: Dict[str, str] = field(default_factory=dict, hash=False)
+    command: str = "npx"
+
+    def server_params(self) -> StdioServerParameters:
+        args = ["-y", self.package, *self.args] if self.command == "npx" else list(self.args)
+        return StdioServerParameters(command=self.command, args=args, env=self.env or None)
+
+
+class _PooledServer:
+    """A running MCP server owned by a single long-lived task
+
+    The stdio transport must be opened and closed from the same task, so the
+    owner task holds the session open until asked to stop.
+    """
+
+    def __init__(self, spec: MCPServerSpec):
+        self.spec = spec
+        self.session: Optional[ClientSession] = None
+        self.tools: Optional[List[Any]] = None
+        self.starts = 0
+        self.restarts = 0
+        self.last_error: Optional[str] = None
+        self.last_start_seconds: Optional[float] = None
+        # When the server last answered a call or ping
+        self.last_ok = 0.0
+        self.lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def start(self, timeout: float) -> None:
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self.tools = None
+        started = time.perf_counter()
+        self._task = asyncio.create_task(self._serve(), name=f"mcp:{self.spec.name}")
+
+        ready = asyncio.create_task(self._ready.wait())
+        try:
+            await asyncio.wait({ready, self._task}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            ready.cancel()
+
+        if not self.alive:
+            error = None
+            if self._task.done() and not self._task.cancelled():
+                error = self._task.exception()
+            await self.stop()
+            self.last_error = str(error) if error else f"start timed out after {timeout}s"
+            raise ConnectionError(f"MCP server '{self.spec.name}' failed to start: {self.last_error}") from error
+
+        self.starts += 1
+        self.last_start_seconds = time.perf_counter() - started
+        self.last_ok = time.monotonic()
+
+    async def _serve(self) -> None:
+        try:
+            async with stdio_client(self.spec.server_params()) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    self.session = session
+                    self._ready.set()
+                    await self._stop.wait()
+        finally:
+            self.session = None
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None and not self._task.done():
+            try:
+                await asyncio.wait_for(self._task, timeout=5)
+            except BaseException:
+                self._task.cancel()
+        self._task = None
+        self.session = None
+
+
+class MCPServerPool:
+    """
+    Shared pool of MCP server processes
+    Servers start lazily on first use and stay up for the life of the event
+    loop, so agents and workflow runs reuse one process per server.
+    """
+
+    def __init__(self, start_timeout: Optional[float] = None, health_check_timeout: Optional[float] = None,
+                 health_check_interval: Optional[float] = None):
+        self.start_timeout = start_timeout or settings.mcp_start_timeout_seconds
+        self.health_check_timeout = health_check_timeout or settings.mcp_health_check_timeout_seconds
+        self.health_check_interval = (
+            settings.mcp_health_check_interval_seconds if health_check_interval is None else health_check_interval
+        )
+        self._specs: Dict[str, MCPServerSpec] = {}
+        self._servers: Dict[str, _PooledServer] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def specs(self) -> Dict[str, MCPServerSpec]:
+        return dict(self._specs)
+
+    def register(self, spec: MCPServerSpec) -> None:
+        """Add a server to the pool without starting it"""
+        self._specs[spec.name] = spec
+
+    def _server(self, name: str) -> _PooledServer:
+        if name not in self._specs:
+            raise ValueError(f"Unknown MCP server: {name}")
+
+        # Sessions are bound to the loop that opened them; a new loop starts fresh
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._stop_previous(self._loop, list(self._servers.values()))
+            self._loop = loop
+            self._servers = {}
+
+        if name not in self._servers:
+            self._servers[name] = _PooledServer(self._specs[name])
+        return self._servers[name]
+
+    @staticmethod
+    def _stop_previous(loop: Optional[asyncio.AbstractEventLoop], servers: List[_PooledServer]) -> None:
+        """Stop servers started on another event loop, on that loop"""
+        if loop is None or loop.is_closed() or not servers:
+            # asyncio.run cancels leftover owner tasks on exit, which closes their processes
+            return
+
+        async def stop_all() -> None:
+            for server in servers:
+                await server.stop()
+
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(stop_all(), loop)
+        else:
+            # The loop is idle but still open: run it briefly on a helper thread
+            thread = threading.Thread(target=loop.run_until_complete, args=(stop_all(),), name="mcp-pool-stop")
+            thread.start()
+            thread.join()
+
+    async def acquire(self, name: str) -> ClientSession:
+        """
+        Return a live session for a server, starting or restarting it if needed
+        A server idle for longer than ``health_check_interval`` is pinged
+        first; one that does not answer (hung, not just exited) is restarted.
+        """
+        server = self._server(name)
+        async with server.lock:
+            if server.alive and time.monotonic() - server.last_ok > self.health_check_interval:
+                if not await self.health_check(name):
+                    await server.stop()
+            if not server.alive:
+                if server.starts:
+                    server.restarts += 1
+                    await server.stop()
+                await server.start(self.start_timeout)
+            return server.session
+
+    async def restart(self, name: str) -> ClientSession:
+        """Stop a server and start a fresh process"""
+        server = self._server(name)
+        async with server.lock:
+            await server.stop()
+        return await self.acquire(name)
+
+    async def health_check(self, name: str) -> bool:
+        """Ping a running server; returns False if it does not answer in time"""
+        server = self._server(name)
+        if not server.alive:
+            return False
+        try:
+            await asyncio.wait_for(server.session.send_ping(), timeout=self.health_check_timeout)
+            server.last_ok = time.monotonic()
+            return True
+        except (asyncio.TimeoutError, *CONNECTION_ERRORS) as e:
+            server.last_error = str(e) or type(e).__name__
+            return False
+
+    async def list_tools(self, name: str) -> List[Any]:
+        """List the tools a server exposes (cached per process start)"""
+        session = await self.acquire(name)
+        server = self._server(name)
+        if server.tools is None:
+            server.tools = (await session.list_tools()).tools
+        return server.tools
+
+    async def call_tool(self, name: str, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Call a tool, restarting the server once if its process has died"""
+        started = time.perf_counter()
+        for attempt in range(2):
+            session = await self.acquire(name)
+            try:
+                result = await session.call_tool(tool_name, arguments=arguments)
+                self._server(name).last_ok = time.monotonic()
+                response = result.model_dump(exclude_none=True, mode="json")
+                telemetry.record_mcp_call(
+                    name, tool_name, time.perf_counter() - started,
+                    bytes_in=len(json.dumps(arguments, default=str)),
+                    bytes_out=len(json.dumps(response, default=str)),
+                )
+                return response
+            except CONNECTION_ERRORS:
+                if attempt:
+                    raise
+                await self.restart(name)
+
+    async def close(self) -> None:
+        """Stop every server process"""
+        for server in self._servers.values():
+            await server.stop()
+        self._servers = {}
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-server process statistics"""
+        return {
+            name: {
+                "alive": server.alive,
+                "starts": server.starts,
+                "restarts": server.restarts,
+                "last_start_seconds": server.last_start_seconds,
+                "last_error": server.last_error,
+            }
+            for name, server in self._servers.items()
+        }
+
+
+class PooledMCPTool(BaseTool):
+    """ADK tool that forwards calls to a pooled MCP server"""
+
+    def __init__(self, pool: MCPServerPool, server: str, mcp_tool: Any):
+        super().__init__(name=mcp_tool.name, description=mcp_tool.description or "")
+        self._pool = pool
+        self._server = server
+        self._mcp_tool = mcp_tool
+
+    def _get_declaration(self) -> types.FunctionDeclaration:
+        return types.FunctionDeclaration(
+            name=self.name,
+            description=self.description,
+            parameters_json_schema=self._mcp_tool.inputSchema,
+        )
+
+    async def run_async(self, *, args: Dict[str, Any], tool_context: Any) -> Any:
+        return await self._pool.call_tool(self._server, self.name, args)
+
+
+class PooledMCPToolset(BaseToolset):
+    """ADK toolset backed by a server in the shared pool
+
+    Closing the toolset leaves the server running for other agents; the pool
+    owns the process lifecycle.
+    """
+
+    def __init__(self, pool: MCPServerPool, server: str, tool_filter: Optional[List[str]] = None):
+        super().__init__(tool_filter=tool_filter)
+        self.pool = pool
+        self.server = server
+
+    async def get_tools(self, readonly_context: Any = None) -> List[BaseTool]:
+        tools = [PooledMCPTool(self.pool, self.server, tool) for tool in await self.pool.list_tools(self.server)]
+        return [tool for tool in tools if self._is_tool_selected(tool, readonly_context)]
+
+    async def close(self) -> None:
+        pass
@@ -1,112 +1,99 @@
 """Tools initialization for Edwardo agents"""
 
-from google.adk.tools.mcp_tool import MCPToolset, StdioConnectionParams
-from mcp import StdioServerParameters
+from .pool import MCPServerPool, MCPServerSpec
+from .lazy import LazyMCPToolset
 from ..config import settings
+from ..mcp_toolsets import (
+    MongoDBMCPToolset,
+    GoogleCalendarMCPToolset,
+    GmailMCPToolset,
+    PlaidMCPToolset,
+    GoogleMapsMCPToolset,
+    InstacartMCPToolset,
+)
 
-# Initialize MCP toolsets using ADK's MCPToolset with proper server_params
+# MCP servers are launched once by the shared pool and reused by every agent.
+# Nothing starts at import time: toolsets declare their tools from the static
+# schemas in mcp_toolsets.py and connect on the first actual tool call.
+SERVER_SPECS = [
+    # MongoDB MCP Server
+    MCPServerSpec(
+        name="mongodb",
+        package="@modelcontextprotocol/server-mongodb",
+        args=(settings.mongodb_uri,),
+    ),
+    # Google Calendar MCP Server
+    MCPServerSpec(
+        name="calendar",
+        package="@modelcontextprotocol/server-google-calendar",
+        env={
+            "GOOGLE_CALENDAR_CLIENT_ID": settings.google_calendar_client_id,
+            "GOOGLE_CALENDAR_CLIENT_SECRET": settings.google_calendar_client_secret,
+        },
+    ),
+    # Gmail MCP Server
+    MCPServerSpec(
+        name="gmail",
+        package="@modelcontextprotocol/server-gmail",
+        env={
+            "GMAIL_CLIENT_ID": settings.gmail_client_id,
+            "GMAIL_CLIENT_SECRET": settings.gmail_client_secret,
+        },
+    ),
+    # Plaid MCP Server
+    MCPServerSpec(
+        name="plaid",
+        package="@modelcontextprotocol/server-plaid",
+        env={
+            "PLAID_CLIENT_ID": settings.plaid_client_id,
+            "PLAID_SECRET": settings.plaid_secret,
+            "PLAID_ENV": settings.plaid_env,
+        },
+    ),
+    # Google Maps MCP Server
+    MCPServerSpec(
+        name="maps",
+        package="@modelcontextprotocol/server-google-maps",
+        env={
+            "GOOGLE_MAPS_API_KEY": settings.google_maps_api_key,
+        },
+    ),
+    # Instacart MCP Server (custom - may need different package name)
+    MCPServerSpec(
+        name="instacart",
+        package="@modelcontextprotocol/server-instacart",
+        env={
+            "INSTACART_API_KEY": settings.instacart_api_key,
+            "INSTACART_USER_TOKEN": settings.instacart_user_token,
+        },
+    ),
+]
 
-# MongoDB MCP Server
-try:
-    mongodb_tools = MCPToolset(
-        connection_params=StdioConnectionParams(
-            server_params=StdioServerParameters(
-                command="npx",
-                args=["-y", "@modelcontextprotocol/server-mongodb", settings.mongodb_uri],
-            )
-        )
-    )
-except Exception as e:
-    print(f"Warning: MongoDB MCP server not available: {e}")
-    mongodb_tools = None
-
-# Google Calendar MCP Server
-try:
-    calendar_tools = MCPToolset(
-        connection_params=StdioConnectionParams(
-            server_params=StdioServerParameters(
-                command="npx",
-                args=["-y", "@modelcontextprotocol/server-google-calendar"],
-                env={
-                    "GOOGLE_CALENDAR_CLIENT_ID": settings.google_calendar_client_id,
-                    "GOOGLE_CALENDAR_CLIENT_SECRET": settings.google_calendar_client_secret,
-                }
-            )
-        )
-    )
-except Exception as e:
-    print(f"Warning: Google Calendar MCP server not available: {e}")
-    calendar_tools = None
-
-# Gmail MCP Server
-try:
-    gmail_tools = MCPToolset(
-        connection_params=StdioConnectionParams(
-            server_params=StdioServerParameters(
-                command="npx",
-                args=["-y", "@modelcontextprotocol/server-gmail"],
-                env={
-                    "GMAIL_CLIENT_ID": settings.gmail_client_id,
-                    "GMAIL_CLIENT_SECRET": settings.gmail_client_secret,
-                }
-            )
-        )
-    )
-except Exception as e:
-    print(f"Warning: Gmail MCP server not available: {e}")
-    gmail_tools = None
-
-# Plaid MCP Server
-try:
-    plaid_tools = MCPToolset(
-        connection_params=StdioConnectionParams(
-            server_params=StdioServerParameters(
-                command="npx",
-                args=["-y", "@modelcontextprotocol/server-plaid"],
-                env={
-                    "PLAID_CLIENT_ID": settings.plaid_client_id,
-                    "PLAID_SECRET": settings.plaid_secret,
-                    "PLAID_ENV": settings.plaid_env,
-                }
-            )
-        )
-    )
-except Exception as e:
-    print(f"Warning: Plaid MCP server not available: {e}")
-    plaid_tools = None
-
-# Google Maps MCP Server
-try:
-    maps_tools = MCPToolset(
-        connection_params=StdioConnectionParams(
-            server_params=StdioServerParameters(
-                command="npx",
-                args=["-y", "@modelcontextprotocol/server-google-maps"],
-                env={
-                    "GOOGLE_MAPS_API_KEY": settings.google_maps_api_key,
-                }
-            )
-        )
-    )
-except Exception as e:
-    print(f"Warning: Google Maps MCP server not available: {e}")
-    maps_tools = None
-
-# Instacart MCP Server (custom - may need different package name)
-try:
-    instacart_tools = MCPToolset(
-        connection_params=StdioConnectionParams(
-            server_params=StdioServerParameters(
-                command="npx",
-                args=["-y", "@modelcontextprotocol/server-instacart"],
-                env={
-                    "INSTACART_API_KEY": settings.instacart_api_key,
-                    "INSTACART_USER_TOKEN": settings.instacart_user_token,
-                }
-            )
-        )
-    )
-except Exception as e:
-    print(f"Warning: Instacart MCP server not available: {e}")
-    instacart_tools = None
+mcp_pool = MCPServerPool()
+for spec in SERVER_SPECS:
+    mcp_pool.register(spec)
 
+mongodb_tools = LazyMCPToolset(
+    mcp_pool, "mongodb",
+    MongoDBMCPToolset(settings.mongodb_uri, settings.mongodb_database),
+)
+calendar_tools = LazyMCPToolset(
+    mcp_pool, "calendar",
+    GoogleCalendarMCPToolset(settings.google_calendar_client_id, settings.google_calendar_client_secret),
+)
+gmail_tools = LazyMCPToolset(
+    mcp_pool, "gmail",
+    GmailMCPToolset(settings.gmail_client_id, settings.gmail_client_secret),
+)
+plaid_tools = LazyMCPToolset(
+    mcp_pool, "plaid",
+    PlaidMCPToolset(settings.plaid_client_id, settings.plaid_secret, settings.plaid_env),
+)
+maps_tools = LazyMCPToolset(
+    mcp_pool, "maps",
+    GoogleMapsMCPToolset(settings.google_maps_api_key),
+)
+instacart_tools = LazyMCPToolset(
+    mcp_pool, "instacart",
+    InstacartMCPToolset(settings.instacart_api_key, settings.instacart_user_token),
+)
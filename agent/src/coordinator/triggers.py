@@ -0,0 +1,198 @@
+"""
+Re-plan trigger bus
+Turns a stream of change events (pantry scans, calendar updates, item
+unavailability) into as few AdaptiveRePlanningWorkflow runs as possible:
+events are debounced per user, bursts are merged into one re-plan, and
+events already covered by a running re-plan are dropped.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import logging
+import time
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TriggerEvent:
+    """A change that may require re-planning"""
+
+    user_id: str
+    reason: str
+    change_data: Dict[str, Any] = field(default_factory=dict)
+    received_at: float = field(default_factory=time.monotonic)
+    future: Optional[asyncio.Future] = None
+
+
+def _items(change_data: Dict[str, Any]) -> List[str]:
+    items = list(change_data.get("items") or [])
+    if change_data.get("item"):
+        items.append(change_data["item"])
+    return items
+
+
+def merge_change_data(changes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine the change_data of several events into one
+
+    ``item``/``items`` entries are unioned into ``items``; for any other key
+    the latest event wins.
+    """
+    merged: Dict[str, Any] = {}
+    items: List[str] = []
+    for change in changes:
+        items.extend(item for item in _items(change) if item not in items)
+        merged.update({k: v for k, v in change.items() if k not in ("item", "items")})
+    if items:
+        merged["items"] = items
+    return merged
+
+
+def covers(running: Dict[str, Any], change: Dict[str, Any]) -> bool:
+    """Whether a re-plan for ``running`` already accounts for ``change``"""
+    if not set(_items(change)) <= set(_items(running)):
+        return False
+    return all(running.get(k) == v for k, v in change.items() if k not in ("item", "items"))
+
+
+class _UserTriggers:
+    """Debounce state for one user"""
+
+    def __init__(self):
+        self.pending: List[TriggerEvent] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.first_pending_at = 0.0
+        self.running: Optional[asyncio.Task] = None
+        self.running_changes: Dict[str, Dict[str, Any]] = {}
+        self.running_futures: Dict[str, asyncio.Future] = {}
+        self.due = False
+
+
+class TriggerBus:
+    """
+    Debounces and coalesces re-plan triggers per user
+    Each event restarts the user's debounce window, up to ``max_delay_seconds``
+    after the first pending event. When the window closes, pending events are
+    grouped by trigger reason and each group runs as a single re-plan with
+    the merged change_data. A user has at most one re-plan running at a time.
+    """
+
+    def __init__(self, workflow_factory: Optional[Callable[[str, str], Any]] = None,
+                 window_seconds: Optional[float] = None, max_delay_seconds: Optional[float] = None):
+        self.workflow_factory = workflow_factory or self._default_factory
+        self.window_seconds = settings.replan_debounce_seconds if window_seconds is None else window_seconds
+        self.max_delay_seconds = settings.replan_max_delay_seconds if max_delay_seconds is None else max_delay_seconds
+        self._users: Dict[str, _UserTriggers] = {}
+        self.stats = {"events": 0, "coalesced": 0, "dropped": 0, "replans": 0, "failures": 0}
+
+    @staticmethod
+    def _default_factory(user_id: str, reason: str) -> Any:
+        from .workflows import AdaptiveRePlanningWorkflow
+        return AdaptiveRePlanningWorkflow(user_id=user_id, trigger_reason=reason)
+
+    def publish(self, user_id: str, reason: str, change_data: Optional[Dict[str, Any]] = None) -> asyncio.Future:
+        """Submit a trigger; the returned future resolves to the re-plan result covering it"""
+        loop = asyncio.get_running_loop()
+        event = TriggerEvent(user_id, reason, dict(change_data or {}), future=loop.create_future())
+        state = self._users.setdefault(user_id, _UserTriggers())
+        self.stats["events"] += 1
+
+        running = state.running_changes.get(reason)
+        if running is not None and covers(running, event.change_data):
+            self.stats["dropped"] += 1
+            return state.running_futures[reason]
+
+        if not state.pending:
+            state.first_pending_at = loop.time()
+        state.pending.append(event)
+        event.future.add_done_callback(_consume_exception)
+
+        if state.timer is not None:
+            state.timer.cancel()
+        deadline = min(loop.time() + self.window_seconds, state.first_pending_at + self.max_delay_seconds)
+        state.timer = loop.call_at(deadline, self._window_closed, user_id)
+        return event.future
+
+    def _window_closed(self, user_id: str) -> None:
+        state = self._users[user_id]
+        state.timer = None
+        if state.running is not None:
+            # Started as soon as the current re-plan finishes
+            state.due = True
+            return
+        self._start(user_id, state)
+
+    def _start(self, user_id: str, state: _UserTriggers) -> None:
+        events, state.pending, state.due = state.pending, [], False
+        if not events:
+            return
+        by_reason: Dict[str, List[TriggerEvent]] = {}
+        for event in events:
+            by_reason.setdefault(event.reason, []).append(event)
+        self.stats["coalesced"] += len(events) - len(by_reason)
+
+        loop = asyncio.get_running_loop()
+        state.running_changes = {
+            reason: merge_change_data([e.change_data for e in group]) for reason, group in by_reason.items()
+        }
+        state.running_futures = {reason: loop.create_future() for reason in by_reason}
+        for future in state.running_futures.values():
+            future.add_done_callback(_consume_exception)
+        state.running = asyncio.create_task(self._run(user_id, state, by_reason))
+
+    async def _run(self, user_id: str, state: _UserTriggers, by_reason: Dict[str, List[TriggerEvent]]) -> None:
+        try:
+            for reason, group in by_reason.items():
+                shared = state.running_futures[reason]
+                try:
+                    workflow = self.workflow_factory(user_id, reason)
+                    result = await workflow.execute(state.running_changes[reason])
+                    self.stats["replans"] += 1
+                except Exception as e:
+                    logger.exception("Re-plan for %s (%s) failed", user_id, reason)
+                    self.stats["failures"] += 1
+                    for future in [shared] + [event.future for event in group]:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                for future in [shared] + [event.future for event in group]:
+                    if not future.done():
+                        future.set_result(result)
+        finally:
+            state.running = None
+            state.running_changes = {}
+            state.running_futures = {}
+            if state.due:
+                self._start(user_id, state)
+            elif not state.pending and state.timer is None:
+                self._users.pop(user_id, None)
+
+    def pending(self, user_id: str) -> int:
+        state = self._users.get(user_id)
+        return len(state.pending) if state else 0
+
+    async def drain(self) -> None:
+        """Run every pending trigger now and wait for all re-plans to finish"""
+        while self._users:
+            for user_id, state in list(self._users.items()):
+                if state.timer is not None:
+                    state.timer.cancel()
+                    state.timer = None
+                    self._window_closed(user_id)
+            running = [state.running for state in self._users.values() if state.running is not None]
+            if not running:
+                break
+            await asyncio.gather(*running, return_exceptions=True)
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    # Failures are logged by the bus; do not warn about unawaited futures
+    if not future.cancelled():
+        future.exception()
+
+
+# Shared trigger bus
+trigger_bus = TriggerBus()
@@ -0,0 +1,269 @@
+"""
+Unit normalization and unit pricing
+Dimension-aware conversion tables (mass, volume, count) are built once at
+import time, with per-ingredient densities and unit weights for conversions
+that cross dimensions. Batch helpers normalize a whole grocery list or vendor
+price matrix in a single pass.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import math
+import re
+
+MASS = "mass"
+VOLUME = "volume"
+COUNT = "count"
+
+# Base unit for each dimension
+BASE_UNITS = {MASS: "g", VOLUME: "ml", COUNT: "each"}
+
+# unit -> (dimension, size in base units)
+_UNIT_DEFINITIONS = {
+    MASS: {
+        "mg": 0.001,
+        "g": 1.0,
+        "kg": 1000.0,
+        "oz": 28.349523125,
+        "lb": 453.59237,
+    },
+    VOLUME: {
+        "ml": 1.0,
+        "l": 1000.0,
+        "tsp": 4.92892159375,
+        "tbsp": 14.78676478125,
+        "fl oz": 29.5735295625,
+        "cup": 236.5882365,
+        "pint": 473.176473,
+        "quart": 946.352946,
+        "gallon": 3785.411784,
+    },
+    COUNT: {
+        "each": 1.0,
+        "dozen": 12.0,
+        # Packaging units count as one item; their weight comes from UNIT_WEIGHTS
+        "head": 1.0,
+        "bunch": 1.0,
+        "clove": 1.0,
+        "can": 1.0,
+        "package": 1.0,
+    },
+}
+
+_ALIASES = {
+    "milligram": "mg", "milligrams": "mg",
+    "gram": "g", "grams": "g", "gr": "g",
+    "kilogram": "kg", "kilograms": "kg", "kgs": "kg",
+    "ounce": "oz", "ounces": "oz",
+    "pound": "lb", "pounds": "lb", "lbs": "lb",
+    "milliliter": "ml", "milliliters": "ml", "millilitre": "ml", "millilitres": "ml",
+    "liter": "l", "liters": "l", "litre": "l", "litres": "l",
+    "teaspoon": "tsp", "teaspoons": "tsp", "tsps": "tsp",
+    "tablespoon": "tbsp", "tablespoons": "tbsp", "tbsps": "tbsp", "tbs": "tbsp",
+    "fluid ounce": "fl oz", "fluid ounces": "fl oz", "floz": "fl oz", "fl. oz": "fl oz",
+    "cups": "cup", "c": "cup",
+    "pints": "pint", "pt": "pint",
+    "quarts": "quart", "qt": "quart",
+    "gallons": "gallon", "gal": "gallon",
+    "count": "each", "ct": "each", "ea": "each", "piece": "each", "pieces": "each",
+    "unit": "each", "units": "each",
+    "heads": "head", "bunches": "bunch", "cloves": "clove", "cans": "can",
+    "packages": "package", "pkg": "package", "pack": "package",
+}
+
+# Density overrides in g/ml for converting between volume and mass
+DENSITIES = {
+    "water": 1.0,
+    "milk": 1.03,
+    "cream": 1.01,
+    "yogurt": 1.03,
+    "soy sauce": 1.15,
+    "olive oil": 0.91,
+    "vegetable oil": 0.92,
+    "honey": 1.42,
+    "flour": 0.53,
+    "sugar": 0.85,
+    "rice": 0.85,
+    "butter": 0.96,
+    "cherry tomatoes": 0.6,
+    "parmesan": 0.42,
+}
+DEFAULT_DENSITY = 1.0
+
+# Typical weight in grams of one counted unit, per ingredient and packaging
+UNIT_WEIGHTS = {
+    ("broccoli", "head"): 600.0,
+    ("broccoli", "each"): 600.0,
+    ("lettuce", "head"): 550.0,
+    ("garlic", "clove"): 5.0,
+    ("garlic", "head"): 50.0,
+    ("cilantro", "bunch"): 60.0,
+    ("bell peppers", "each"): 170.0,
+    ("eggs", "each"): 50.0,
+    ("onion", "each"): 150.0,
+    ("tomato", "each"): 120.0,
+    ("avocado", "each"): 200.0,
+    ("lemon", "each"): 100.0,
+    ("banana", "each"): 120.0,
+}
+
+
+@dataclass(frozen=True)
+class Unit:
+    """A canonical unit and its size in its dimension's base unit"""
+
+    name: str
+    dimension: str
+    factor: float
+
+
+def _build_table() -> Dict[str, Unit]:
+    table = {}
+    for dimension, units in _UNIT_DEFINITIONS.items():
+        for name, factor in units.items():
+            table[name] = Unit(name, dimension, factor)
+    for alias, name in _ALIASES.items():
+        table[alias] = table[name]
+    return table
+
+
+UNIT_TABLE = _build_table()
+
+
+def _key(text: str) -> str:
+    return re.sub(r"\s+", " ", text.strip().lower())
+
+
+def parse_unit(unit: Optional[str]) -> Unit:
+    """Look up a unit by name or alias; raises ValueError if unknown"""
+    key = _key(unit or "")
+    found = UNIT_TABLE.get(key) or UNIT_TABLE.get(key.rstrip("."))
+    if found is None and key.endswith("s"):
+        found = UNIT_TABLE.get(key[:-1])
+    if found is None:
+        raise ValueError(f"Unknown unit: {unit}")
+    return found
+
+
+def _unit_weight(ingredient: str, unit: Unit) -> Optional[float]:
+    """Grams per counted unit of an ingredient, if known"""
+    return UNIT_WEIGHTS.get((ingredient, unit.name)) or UNIT_WEIGHTS.get((ingredient, "each"))
+
+
+def _to_grams(quantity: float, unit: Unit, ingredient: str) -> Optional[float]:
+    """Convert any quantity of an ingredient to grams when the tables allow it"""
+    if unit.dimension == MASS:
+        return quantity * unit.factor
+    if unit.dimension == VOLUME:
+        return quantity * unit.factor * DENSITIES.get(ingredient, DEFAULT_DENSITY)
+    weight = _unit_weight(ingredient, unit)
+    return quantity * unit.factor * weight if weight else None
+
+
+def convert(quantity: float, from_unit: str, to_unit: str, ingredient: str = "") -> float:
+    """Convert a quantity between units, crossing dimensions via ingredient data"""
+    source, target = parse_unit(from_unit), parse_unit(to_unit)
+    ingredient = _key(ingredient)
+    if source.dimension == target.dimension:
+        if source.dimension == COUNT and source.name != target.name:
+            # A head of garlic is not one clove: go through weights when both are known
+            source_weight, target_weight = _unit_weight(ingredient, source), _unit_weight(ingredient, target)
+            if source_weight and target_weight:
+                return quantity * source.factor * source_weight / (target.factor * target_weight)
+        return quantity * source.factor / target.factor
+
+    grams = _to_grams(quantity, source, ingredient)
+    if grams is None:
+        raise ValueError(f"Cannot convert {from_unit} to {to_unit} for '{ingredient or 'unknown'}'")
+    if target.dimension == MASS:
+        return grams / target.factor
+    if target.dimension == VOLUME:
+        return grams / DENSITIES.get(ingredient, DEFAULT_DENSITY) / target.factor
+    weight = _unit_weight(ingredient, target)
+    if not weight:
+        raise ValueError(f"Cannot convert {from_unit} to {to_unit} for '{ingredient or 'unknown'}'")
+    return grams / weight / target.factor
+
+
+def normalize(quantity: float, unit: str) -> Tuple[float, str]:
+    """Express a quantity in its dimension's base unit (g, ml or each)"""
+    parsed = parse_unit(unit)
+    return quantity * parsed.factor, BASE_UNITS[parsed.dimension]
+
+
+def normalize_grocery_list(items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Add ``normalized_quantity`` and ``base_unit`` to every grocery item"""
+    normalized = []
+    for item in items:
+        try:
+            quantity, base_unit = normalize(item["quantity"], item.get("unit", "each"))
+        except ValueError:
+            quantity, base_unit = item["quantity"], item.get("unit", "each")
+        normalized.append({**item, "normalized_quantity": round(quantity, 4), "base_unit": base_unit})
+    return normalized
+
+
+def normalize_price_matrix(grocery_items: List[Dict[str, Any]], price_matrix: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn vendor package quotes into comparable line costs and unit prices.
+
+    Each price may be a plain number (the cost of the listed quantity) or a
+    package quote {"price", "size", "unit"}. For quotes, the number of
+    packages needed to cover the grocery item's quantity is computed in a
+    common unit and the line cost is packages x price.
+
+    Returns a copy of the price matrix whose ``prices`` are line costs, with
+    the vendor quotes they came from under ``quotes``, plus
+    ``unit_prices`` ({item: {vendor: price per base unit}}) with the base unit
+    per item in ``unit_price_basis``, ``packages`` and ``unit_mismatches``
+    for quotes that could not be converted or have no price or a non-positive
+    size; those have no line cost, so the vendor counts as not stocking the
+    item.
+    """
+    wanted = {item["name"]: item for item in grocery_items}
+    line_costs: Dict[str, Dict[str, Optional[float]]] = {}
+    unit_prices: Dict[str, Dict[str, Optional[float]]] = {}
+    packages: Dict[str, Dict[str, int]] = {}
+    basis: Dict[str, Optional[str]] = {}
+    mismatches: List[Dict[str, str]] = []
+
+    for name, by_vendor in price_matrix["prices"].items():
+        item = wanted.get(name, {"quantity": 1, "unit": "each"})
+        ingredient = _key(name)
+        line_costs[name], unit_prices[name], packages[name] = {}, {}, {}
+        try:
+            basis[name] = BASE_UNITS[parse_unit(item.get("unit", "each")).dimension]
+        except ValueError:
+            basis[name] = None
+
+        for vendor, quote in by_vendor.items():
+            if quote is None or not isinstance(quote, dict):
+                line_costs[name][vendor] = quote
+                unit_prices[name][vendor] = None
+                continue
+
+            price, size, unit = quote.get("price"), quote.get("size", 1), quote.get("unit", "each")
+            try:
+                if price is None or not size or size <= 0:
+                    raise ValueError(f"unusable quote for {name!r} from {vendor!r}")
+                needed = convert(item["quantity"], item.get("unit", "each"), unit, ingredient)
+                count = max(1, math.ceil(needed / size - 1e-9))
+                # Unit prices share the grocery item's base unit across vendors
+                unit_prices[name][vendor] = round(price / convert(size, unit, basis[name], ingredient), 6)
+            except ValueError:
+                # The vendor cannot be costed for this line, so it counts as unavailable
+                line_costs[name][vendor] = None
+                unit_prices[name][vendor] = None
+                mismatches.append({"item": name, "vendor": vendor, "unit": unit})
+                continue
+            packages[name][vendor] = count
+            line_costs[name][vendor] = round(count * price, 2)
+
+    return {
+        **price_matrix,
+        "prices": line_costs,
+        "quotes": {name: dict(by_vendor) for name, by_vendor in price_matrix["prices"].items()},
+        "unit_prices": unit_prices,
+        "unit_price_basis": basis,
+        "packages": packages,
+        "unit_mismatches": mismatches,
+    }
@@ -3,128 +3,205 @@ Edwardo Agent Workflows
 Orchestrates multi-agent sequences for key user journeys
 """
 
-from typing import Dict, Any, Optional
-import asyncio
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
-from .agent import root_agent
-from .sub_agents import context_agent, planning_agent, decision_agent, execution_agent
+from functools import partial
+import asyncio
+import logging
+import time
 from .config import settings
-from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from .lazy import LazyAttribute
+from .context import ContextGatherer, context_gatherer
+from .context.sources import fetch_low_stock_items
+from .grocery import RESTOCK_QUANTITIES, canonical_name, compile_grocery_list, meal_key
+from .learning import deliveries_for_order, learning_loop
+from .pricing import STORES, optimize_vendor_selection, price_batcher, price_cache, vendor_for_store
+from .replan import (
+    PlanDependencies, PlanStore, diff_items, diff_prices, merge_grocery_items, merge_price_rows, plan_store,
+)
+from .runtime import DAGExecutor, Step, StepTiming
+from .runtime.checkpoints import CheckpointStore, checkpoint_store
+from .runtime.events import EventStream, EventType, WorkflowEvent, event_stream
+from .runtime.telemetry import telemetry
+from .units import normalize_price_matrix
+
+logger = logging.getLogger(__name__)
+
+# Agents are imported on first use so loading workflows does not pull in ADK
+root_agent = LazyAttribute(f"{__package__}.agent", "root_agent")
+context_agent = LazyAttribute(f"{__package__}.sub_agents", "context_agent")
+planning_agent = LazyAttribute(f"{__package__}.sub_agents", "planning_agent")
+decision_agent = LazyAttribute(f"{__package__}.sub_agents", "decision_agent")
+execution_agent = LazyAttribute(f"{__package__}.sub_agents", "execution_agent")
 
-console = Console()
+
+class WorkflowEventsMixin:
+    """Publishes workflow lifecycle events to an event stream"""
+    
+    workflow_name = "workflow"
+    workflow_id = ""
+    events: EventStream = event_stream
+    
+    def _emit(self, event_type: EventType, step: Optional[str] = None, description: str = "",
+              duration_seconds: Optional[float] = None, **data: Any) -> None:
+        if not self.events.has_subscribers:
+            return
+        self.events.emit(WorkflowEvent(
+            type=event_type,
+            workflow=self.workflow_name,
+            workflow_id=self.workflow_id,
+            step=step,
+            description=description,
+            duration_seconds=duration_seconds,
+            data=data,
+        ))
+    
+    def _on_step_started(self, step: Step) -> None:
+        self._emit(EventType.STEP_STARTED, step=step.name, description=step.description)
+    
+    def _on_step_finished(self, step: Step, timing: StepTiming) -> None:
+        telemetry.record_step(self.workflow_name, step.name, timing.duration_seconds)
+        self._emit(
+            EventType.STEP_FINISHED,
+            step=step.name,
+            description=step.completed_description,
+            duration_seconds=timing.duration_seconds,
+        )
 
 
-class WeeklyPlanningWorkflow:
+class WeeklyPlanningWorkflow(WorkflowEventsMixin):
     """
     Full weekly planning cycle workflow
     Sequence: Coordinator → Context → Planning → Decision → Coordinator
+    Steps run as a dependency graph; errands are scheduled concurrently
+    with grocery list compilation and price comparison.
     """
     
-    def __init__(self, user_id: str):
+    workflow_name = "weekly_planning"
+    
+    def __init__(self, user_id: str, events: Optional[EventStream] = None,
+                 context: Optional[ContextGatherer] = None, checkpoints: Optional[CheckpointStore] = None,
+                 workflow_id: Optional[str] = None):
         self.user_id = user_id
-        self.workflow_id = f"weekly_plan_{user_id}_{datetime.now().isoformat()}"
+        self.workflow_id = workflow_id or f"weekly_plan_{user_id}_{datetime.now().isoformat()}"
+        self.events = events or event_stream
+        self.context_gatherer = context or context_gatherer
+        self.checkpoints = checkpoints or checkpoint_store
         self.status = {}
+        self.timings = {}
         
     async def execute(self) -> Dict[str, Any]:
-        """Execute full weekly planning workflow"""
-        console.print(f"\n[bold cyan]🚀 Starting Weekly Planning Workflow[/bold cyan]")
-        console.print(f"User ID: {self.user_id}")
-        console.print(f"Workflow ID: {self.workflow_id}\n")
+        """Execute full weekly planning workflow, skipping steps already checkpointed"""
+        self._emit(EventType.WORKFLOW_STARTED, description="Starting Weekly Planning Workflow", user_id=self.user_id)
+        trace = telemetry.bind(self.workflow_id)
         
         try:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console
-            ) as progress:
-                
-                # Step 1: Coordinator initialization
-                task1 = progress.add_task("[cyan]Initializing coordinator...", total=None)
-                coordinator = root_agent
-                self.status["coordinator"] = "initialized"
-                progress.update(task1, description="[green]✓ Coordinator ready")
-                await asyncio.sleep(0.5)
-                
-                # Step 2: Context gathering
-                task2 = progress.add_task("[cyan]Gathering context data...", total=None)
-                
-                # Simulate context gathering (in real implementation, would call agent)
-                context_result = await self._gather_context(context_agent)
-                self.status["context"] = "completed"
-                progress.update(task2, description="[green]✓ Context gathered")
-                await asyncio.sleep(0.5)
-                
-                # Step 3: Meal planning
-                task3 = progress.add_task("[cyan]Generating meal plan...", total=None)
-                
-                meal_plan_result = await self._generate_meal_plan(planning_agent, context_result)
-                self.status["planning"] = "completed"
-                progress.update(task3, description="[green]✓ Meal plan generated")
-                await asyncio.sleep(0.5)
-                
-                # Step 4: Grocery list compilation
-                task4 = progress.add_task("[cyan]Compiling grocery list...", total=None)
-                grocery_list_result = await self._compile_grocery_list(planning_agent, meal_plan_result, context_result)
-                progress.update(task4, description="[green]✓ Grocery list ready")
-                await asyncio.sleep(0.5)
-                
-                # Step 5: Price comparison
-                task5 = progress.add_task("[cyan]Comparing prices...", total=None)
-                
-                price_result = await self._compare_prices(decision_agent, grocery_list_result)
-                self.status["decision"] = "completed"
-                progress.update(task5, description="[green]✓ Best prices found")
-                await asyncio.sleep(0.5)
-                
-                # Step 6: Errand scheduling
-                task6 = progress.add_task("[cyan]Scheduling errands...", total=None)
-                errand_result = await self._schedule_errands(planning_agent, context_result)
-                progress.update(task6, description="[green]✓ Errands scheduled")
-                await asyncio.sleep(0.5)
-                
-                # Step 7: Finalization
-                task7 = progress.add_task("[cyan]Creating approval requests...", total=None)
-                final_result = await self._finalize_plan(
-                    coordinator,
-                    meal_plan_result,
-                    grocery_list_result,
-                    price_result,
-                    errand_result
-                )
-                self.status["workflow"] = "completed"
-                progress.update(task7, description="[green]✓ Plan ready for approval")
+            completed = await self.checkpoints.load(self.workflow_id)
+            await self.checkpoints.begin(self.workflow_id, self.workflow_name, {"user_id": self.user_id})
+            executor = DAGExecutor(
+                self._build_graph(),
+                on_step_started=self._on_step_started,
+                on_step_finished=self._on_step_finished,
+                completed=completed,
+                on_step_result=self._save_checkpoint,
+            )
+            results = await executor.run()
+            
+            self.timings = {name: timing.to_dict() for name, timing in executor.timings.items()}
+            self.status.update({name: "completed" for name in executor.results})
+            if completed:
+                self.status["resumed_steps"] = sorted(completed)
+            critical_path, critical_path_seconds = executor.critical_path()
+            
+            final_result = results["finalize"]
+            final_result["step_timings"] = self.timings
+            final_result["critical_path"] = {
+                "steps": critical_path,
+                "duration_seconds": round(critical_path_seconds, 4),
+            }
+            self.status["workflow"] = "completed"
+            # Base for incremental re-planning
+            plan_store.save(self.user_id, final_result)
             
-            console.print("\n[bold green]✅ Weekly planning workflow completed successfully![/bold green]\n")
+            await self.checkpoints.finish(self.workflow_id, "completed")
+            
+            self._emit(EventType.WORKFLOW_FINISHED, description="Weekly planning workflow completed successfully!")
             return final_result
             
         except Exception as e:
-            console.print(f"\n[bold red]❌ Workflow failed: {str(e)}[/bold red]\n")
             self.status["workflow"] = "failed"
+            await self.checkpoints.finish(self.workflow_id, "failed")
+            self._emit(EventType.WORKFLOW_FAILED, description=f"Workflow failed: {str(e)}")
             raise
+        finally:
+            telemetry.finish(trace, self.workflow_name, self.status.get("workflow", "failed"))
+    
+    def _build_graph(self) -> List[Step]:
+        """
+        Describe the workflow as a dependency graph
+        Errand scheduling only needs context, so it runs alongside the
+        meal plan → grocery list → price comparison branch.
+        """
+        return [
+            Step(
+                "coordinator", self._init_coordinator,
+                description="Initializing coordinator...",
+                completed_description="Coordinator ready",
+                checkpoint=False,
+            ),
+            Step(
+                "context", partial(self._gather_context, context_agent),
+                description="Gathering context data...",
+                completed_description="Context gathered",
+            ),
+            Step(
+                "meal_plan", partial(self._generate_meal_plan, planning_agent),
+                depends_on=("context",),
+                description="Generating meal plan...",
+                completed_description="Meal plan generated",
+            ),
+            Step(
+                "grocery_list", partial(self._compile_grocery_list, planning_agent),
+                depends_on=("meal_plan", "context"),
+                description="Compiling grocery list...",
+                completed_description="Grocery list ready",
+            ),
+            Step(
+                "prices", partial(self._compare_prices, decision_agent),
+                depends_on=("grocery_list",),
+                description="Comparing prices...",
+                completed_description="Best prices found",
+            ),
+            Step(
+                "errands", partial(self._schedule_errands, planning_agent),
+                depends_on=("context",),
+                description="Scheduling errands...",
+                completed_description="Errands scheduled",
+            ),
+            Step(
+                "finalize", self._finalize_plan,
+                depends_on=("coordinator", "meal_plan", "grocery_list", "prices", "errands"),
+                description="Creating approval requests...",
+                completed_description="Plan ready for approval",
+            ),
+        ]
+    
+    async def _save_checkpoint(self, step: Step, result: Any) -> None:
+        if not step.checkpoint:
+            return
+        try:
+            await self.checkpoints.save(self.workflow_id, step.name, result)
+        except (TypeError, ValueError) as e:
+            # Not JSON: resume reruns the step rather than restoring a corrupted output
+            logger.warning("Step %s of %s not checkpointed: %s", step.name, self.workflow_id, e)
+    
+    async def _init_coordinator(self) -> Any:
+        """Initialize the coordinator agent"""
+        return root_agent
     
     async def _gather_context(self, agent: Any) -> Dict[str, Any]:
-        """Gather context data from multiple sources"""
-        # In real implementation, would use agent's tools to fetch data
-        return {
-            "availability": {
-                "free_blocks": ["Sat 10am-6pm", "Sun 2pm-8pm"],
-                "busy_blocks": ["Sat 8-9:30am", "Sun 10am-1pm"]
-            },
-            "spending_patterns": {
-                "avg_weekly_grocery": 150.0,
-                "categories": {"produce": 40, "dairy": 25, "meat": 35, "pantry": 50}
-            },
-            "pantry_state": {
-                "running_low": ["milk", "eggs", "bread"],
-                "well_stocked": ["rice", "pasta", "canned_goods"]
-            },
-            "contextual_insights": {
-                "weather": "Clear weekend",
-                "traffic": "Light Saturday afternoon",
-                "recommended_shopping_time": "Saturday 2-3pm"
-            }
-        }
+        """Gather context data from all sources concurrently"""
+        return await self.context_gatherer.gather(self.user_id)
     
     async def _generate_meal_plan(self, agent: Any, context: Dict[str, Any]) -> Dict[str, Any]:
         """Generate weekly meal plan"""
@@ -164,40 +241,66 @@ class WeeklyPlanningWorkflow:
         }
     
     async def _compile_grocery_list(self, agent: Any, meal_plan: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
-        """Compile consolidated grocery list"""
-        return {
-            "items": [
-                {"name": "broccoli", "quantity": 1, "unit": "head", "category": "produce", "in_pantry": False},
-                {"name": "bell peppers", "quantity": 2, "unit": "count", "category": "produce", "in_pantry": False},
-                {"name": "milk", "quantity": 1, "unit": "gallon", "category": "dairy", "in_pantry": False},
-                {"name": "eggs", "quantity": 12, "unit": "count", "category": "dairy", "in_pantry": False},
-            ],
-            "status": "draft"
-        }
+        """Compile consolidated grocery list from the meal plan, net of pantry stock"""
+        return compile_grocery_list(meal_plan, context.get("pantry_state"))
     
     async def _compare_prices(self, agent: Any, grocery_list: Dict[str, Any]) -> Dict[str, Any]:
-        """Compare prices across vendors"""
+        """Compare prices across vendors, only calling vendors for stale or missing prices"""
+        items = [item for item in grocery_list["items"] if not item.get("in_pantry")]
+        price_matrix, cache_stats = await self._price_lines(items)
+        return self._select_vendors(price_matrix, cache_stats)
+    
+    async def _price_lines(self, grocery_items: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Build the normalized item-by-vendor price matrix for some grocery lines"""
+        items = [item["name"] for item in grocery_items]
+        stores = list(STORES)
+        
+        prices, cache_stats = await price_cache.get_many("instacart", stores, items)
+        missing = [item for item in items if len(prices.get(item, {})) < len(stores)]
+        if missing:
+            fetched = await price_batcher.get_prices(missing, stores)
+            await price_cache.put_many("instacart", fetched)
+            for item in missing:
+                prices[item] = {**fetched.get(item, {}), **prices.get(item, {})}
+        
+        # Stores quote different package sizes; compare the cost of covering each line
+        price_matrix = normalize_price_matrix(grocery_items, {
+            "items": items,
+            "vendors": [vendor_for_store(store) for store in stores],
+            "prices": {
+                item: {vendor_for_store(store): prices[item].get(store) for store in stores}
+                for item in items
+            },
+            "delivery_fees": {vendor_for_store(store): STORES[store]["delivery_fee"] for store in stores},
+        })
+        return price_matrix, cache_stats
+    
+    def _select_vendors(self, price_matrix: Dict[str, Any], cache_stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize each vendor and pick the cheapest assignment"""
+        items = price_matrix["items"]
+        comparisons = []
+        for store in STORES:
+            vendor = vendor_for_store(store)
+            available = [price_matrix["prices"][item][vendor] for item in items]
+            available = [price for price in available if price is not None]
+            comparisons.append({
+                "vendor": vendor,
+                "total_cost": round(sum(available), 2),
+                "delivery_fee": STORES[store]["delivery_fee"],
+                "items_available": len(available),
+                "items_total": len(items),
+                "delivery_windows": STORES[store]["delivery_windows"],
+            })
+        
+        optimization = optimize_vendor_selection(price_matrix, max_vendors=settings.max_split_vendors)
         return {
-            "vendor_comparisons": [
-                {
-                    "vendor": "instacart_whole_foods",
-                    "total_cost": 147.23,
-                    "delivery_fee": 5.99,
-                    "items_available": 45,
-                    "items_total": 45,
-                    "delivery_windows": ["Sat 2-4pm", "Sat 4-6pm"]
-                },
-                {
-                    "vendor": "amazon_fresh",
-                    "total_cost": 152.10,
-                    "delivery_fee": 0.0,
-                    "items_available": 43,
-                    "items_total": 45,
-                    "delivery_windows": ["Sat 4-6pm"]
-                }
-            ],
-            "recommended_vendor": "instacart_whole_foods",
-            "reasoning": "Best availability and competitive pricing"
+            "vendor_comparisons": comparisons,
+            "price_matrix": price_matrix,
+            "optimization": optimization,
+            "recommended_vendor": optimization["recommended_vendor"],
+            "order_total": optimization.get("order_total", 0.0),
+            "reasoning": optimization["reasoning"],
+            "cache": cache_stats,
         }
     
     async def _schedule_errands(self, agent: Any, context: Dict[str, Any]) -> Dict[str, Any]:
@@ -233,7 +336,7 @@ class WeeklyPlanningWorkflow:
                 "list": grocery_list,
                 "pricing": prices,
                 "selected_vendor": prices["recommended_vendor"],
-                "total": 147.23
+                "total": prices["order_total"]
             },
             "errand_schedule": errands,
             "estimated_savings": {
@@ -248,43 +351,69 @@ class WeeklyPlanningWorkflow:
         }
 
 
-class ApprovalWorkflow:
+class ApprovalWorkflow(WorkflowEventsMixin):
     """
     Approval and execution workflow
     Sequence: User Approval → Execution Agent → Status Tracking
     """
     
-    def __init__(self, approval_id: str, user_id: str):
+    workflow_name = "approval"
+    
+    def __init__(self, approval_id: str, user_id: str, events: Optional[EventStream] = None):
         self.approval_id = approval_id
         self.user_id = user_id
+        self.workflow_id = approval_id
+        self.events = events or event_stream
         
     async def execute(self, approval_type: str) -> Dict[str, Any]:
         """Execute approval and subsequent actions"""
-        console.print(f"\n[bold cyan]📋 Processing Approval[/bold cyan]")
-        console.print(f"Approval ID: {self.approval_id}")
-        console.print(f"Type: {approval_type}\n")
+        self._emit(
+            EventType.WORKFLOW_STARTED,
+            description="Processing Approval",
+            approval_id=self.approval_id,
+            approval_type=approval_type,
+        )
+        trace = telemetry.bind(self.workflow_id)
+        status = "failed"
         
-        if approval_type == "grocery_order":
-            result = await self._execute_grocery_order(execution_agent)
-        elif approval_type == "errand_schedule":
-            result = await self._execute_errand_booking(execution_agent)
-        else:
-            result = {"status": "approved", "message": f"{approval_type} approved"}
+        try:
+            if approval_type == "grocery_order":
+                step = Step(
+                    "place_order", partial(self._execute_grocery_order, execution_agent),
+                    description="Placing order with Instacart...",
+                    completed_description="Order placed successfully",
+                )
+            elif approval_type == "errand_schedule":
+                step = Step(
+                    "book_errands", partial(self._execute_errand_booking, execution_agent),
+                    description="Booking errands on calendar...",
+                    completed_description="Errands booked",
+                )
+            else:
+                step = Step("approve", partial(self._approve, approval_type), completed_description="Approved")
+            
+            executor = DAGExecutor(
+                [step],
+                on_step_started=self._on_step_started,
+                on_step_finished=self._on_step_finished,
+            )
+            result = (await executor.run())[step.name]
+            status = "completed"
+        except Exception as e:
+            self._emit(EventType.WORKFLOW_FAILED, description=f"{approval_type} failed: {str(e)}")
+            raise
+        finally:
+            telemetry.finish(trace, self.workflow_name, status)
         
-        console.print(f"[bold green]✅ {approval_type} processed successfully![/bold green]\n")
+        self._emit(EventType.WORKFLOW_FINISHED, description=f"{approval_type} processed successfully!")
         return result
     
+    async def _approve(self, approval_type: str) -> Dict[str, Any]:
+        """Record an approval that needs no follow-up action"""
+        return {"status": "approved", "message": f"{approval_type} approved"}
+    
     async def _execute_grocery_order(self, agent: Any) -> Dict[str, Any]:
         """Execute approved grocery order"""
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
-            task = progress.add_task("[cyan]Placing order with Instacart...", total=None)
-            await asyncio.sleep(2)  # Simulate API call
-            progress.update(task, description="[green]✓ Order placed successfully")
-        
         return {
             "order_id": "inst_ord_12345",
             "status": "placed",
@@ -294,6 +423,19 @@ class ApprovalWorkflow:
             "tracking_url": "https://instacart.com/track/inst_ord_12345"
         }
     
+    def confirm_delivery(self, order: Dict[str, Any]) -> List[asyncio.Task]:
+        """
+        Vendor confirmation that a placed grocery order was delivered
+        The user's approved plan is handed to the learning loop, which
+        updates pantry, transactions, prices and preferences in the
+        background. Needs ``context_store`` set to mongodb.
+        """
+        plan = plan_store.get(self.user_id)
+        if settings.context_store != "mongodb" or plan is None:
+            return []
+        deliveries = deliveries_for_order(order["order_id"], self.user_id, plan["grocery_order"])
+        return [learning_loop.submit(delivery) for delivery in deliveries]
+    
     async def _execute_errand_booking(self, agent: Any) -> Dict[str, Any]:
         """Execute errand calendar bookings"""
         return {
@@ -302,51 +444,400 @@ class ApprovalWorkflow:
         }
 
 
-class AdaptiveRePlanningWorkflow:
+class AdaptiveRePlanningWorkflow(WorkflowEventsMixin):
     """
     Adaptive re-planning when pantry or context changes
     Sequence: Context Update → Planning Agent → Decision Agent
+    The user's last weekly plan is the base: only the grocery lines, prices,
+    vendor choice and errands that depend on the change are recomputed, and
+    the result is returned as a diff against the base.
     """
     
-    def __init__(self, user_id: str, trigger_reason: str):
+    workflow_name = "adaptive_replan"
+    
+    # Context sources made stale by each trigger; everything else is served
+    # from the snapshot cache
+    TRIGGER_SOURCES = {
+        "pantry_item_depleted": ["mongodb"],
+        "calendar_conflict": ["calendar"],
+    }
+    
+    # Dependency graph nodes that each impact area may recompute
+    AFFECTED_NODES = {
+        "grocery_list": ("grocery:", "price:", "vendor_selection"),
+        "errand_schedule": ("errand_schedule",),
+    }
+    
+    def __init__(self, user_id: str, trigger_reason: str, events: Optional[EventStream] = None,
+                 context: Optional[ContextGatherer] = None, plans: Optional[PlanStore] = None):
         self.user_id = user_id
         self.trigger_reason = trigger_reason
+        self.workflow_id = f"replan_{user_id}_{datetime.now().isoformat()}"
+        self.events = events or event_stream
+        self.context_gatherer = context or context_gatherer
+        self.plans = plans or plan_store
+        self.context: Dict[str, Any] = {}
         
     async def execute(self, change_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute adaptive re-planning"""
-        console.print(f"\n[bold yellow]🔄 Adaptive Re-planning Triggered[/bold yellow]")
-        console.print(f"Reason: {self.trigger_reason}")
-        console.print(f"Change: {change_data}\n")
-        
-        # Assess impact
-        impact = await self._assess_impact(change_data)
-        
-        if impact["severity"] == "low":
-            console.print("[green]Low impact - no re-planning needed[/green]\n")
-            return {"action": "none", "reason": "low_impact"}
+        self._emit(
+            EventType.WORKFLOW_STARTED,
+            description="Adaptive Re-planning Triggered",
+            reason=self.trigger_reason,
+            change=change_data,
+        )
+        trace = telemetry.bind(self.workflow_id)
+        status = "failed"
         
-        # Re-plan as needed
-        result = await self._execute_replan(planning_agent, change_data, impact)
+        try:
+            # Assess impact
+            impact = await self._assess_impact(change_data)
+            
+            if impact["severity"] == "low":
+                status = "skipped"
+                self._emit(EventType.WORKFLOW_FINISHED, description="Low impact - no re-planning needed")
+                return {"action": "none", "reason": "low_impact"}
+            
+            # Refresh only the context the trigger invalidated
+            self.context = await self._refresh_context()
+            
+            # Re-plan as needed
+            result = await self._execute_replan(planning_agent, change_data, impact)
+            status = "completed"
+        except Exception as e:
+            self._emit(EventType.WORKFLOW_FAILED, description=f"Re-planning failed: {str(e)}")
+            raise
+        finally:
+            telemetry.finish(trace, self.workflow_name, status)
         
-        console.print("[bold green]✅ Re-planning completed![/bold green]\n")
+        self._emit(EventType.WORKFLOW_FINISHED, description="Re-planning completed!")
         return result
     
     async def _assess_impact(self, change_data: Dict[str, Any]) -> Dict[str, Any]:
         """Assess impact of change"""
         # Simple heuristic for MVP
+        # Only areas with AFFECTED_NODES entries: meals are plan inputs, not
+        # derived from the pantry, so a depleted item changes grocery lines only
         if self.trigger_reason == "pantry_item_depleted":
-            return {"severity": "medium", "affected": ["grocery_list", "meal_plan"]}
+            return {"severity": "medium", "affected": ["grocery_list"]}
         elif self.trigger_reason == "calendar_conflict":
             return {"severity": "high", "affected": ["errand_schedule"]}
         else:
             return {"severity": "low", "affected": []}
     
+    async def _refresh_context(self) -> Dict[str, Any]:
+        """Invalidate the sources touched by the trigger and re-gather context"""
+        cache = self.context_gatherer.cache
+        if cache is not None:
+            for source in self.TRIGGER_SOURCES.get(self.trigger_reason, []):
+                cache.invalidate(self.user_id, source)
+        return await self.context_gatherer.gather(self.user_id)
+    
+    def _depleted_items(self, change_data: Dict[str, Any]) -> List[str]:
+        names = change_data.get("items") or ([change_data["item"]] if change_data.get("item") else [])
+        return [canonical_name(name) for name in names]
+    
+    def _changed_inputs(self, change_data: Dict[str, Any]) -> List[str]:
+        """Dependency graph inputs invalidated by the trigger"""
+        if self.trigger_reason == "pantry_item_depleted":
+            return [f"pantry:{name}" for name in self._depleted_items(change_data)]
+        return [f"context:{source}" for source in self.TRIGGER_SOURCES.get(self.trigger_reason, [])]
+    
+    def _pantry_after_change(self, change_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Refreshed pantry snapshot with depleted items marked as out of stock"""
+        pantry = dict(self.context.get("pantry_state") or {})
+        depleted = set(self._depleted_items(change_data))
+        if depleted:
+            pantry["well_stocked"] = [n for n in pantry.get("well_stocked", []) if canonical_name(n) not in depleted]
+            pantry["items"] = [i for i in pantry.get("items", []) if canonical_name(i["name"]) not in depleted]
+            pantry["running_low"] = list(pantry.get("running_low", [])) + sorted(depleted)
+        return pantry
+    
     async def _execute_replan(self, agent: Any, change_data: Dict, impact: Dict) -> Dict[str, Any]:
-        """Execute the re-planning"""
+        """Recompute only the plan pieces that depend on the change"""
+        base = self.plans.get(self.user_id)
+        if base is None:
+            # Nothing to patch yet: produce a full plan, which becomes the base
+            plan = await WeeklyPlanningWorkflow(self.user_id, events=self.events, context=self.context_gatherer).execute()
+            return {
+                "action": "full_replan",
+                "changes": ["No previous plan; generated a new weekly plan"],
+                "new_total": plan["grocery_order"]["total"],
+                "recomputed": ["weekly_plan"],
+                "diff": None,
+                "plan": plan,
+            }
+        
+        planner = WeeklyPlanningWorkflow(self.user_id, events=self.events, context=self.context_gatherer)
+        prefixes = tuple(p for area in impact["affected"] for p in self.AFFECTED_NODES.get(area, ()))
+        affected = {node for node in PlanDependencies.from_plan(base).affected(self._changed_inputs(change_data))
+                    if node.startswith(prefixes)}
+        if "grocery_list" in impact["affected"]:
+            # A depleted staple the plan never used still needs a restock line
+            affected |= {f"grocery:{name}" for name in self._depleted_items(change_data)}
+        
+        order = base["grocery_order"]
+        recomputed: List[str] = []
+        changes: List[str] = []
+        diff: Dict[str, Any] = {}
+        
+        lines = {node.split(":", 1)[1] for node in affected if node.startswith("grocery:")}
+        if lines:
+            base_items = order["list"]["items"]
+            meal_keys = {key for item in base_items if item["name"] in lines for key in item.get("meals", [])}
+            meals = [meal for meal in base["meal_plan"].get("meals", []) if meal_key(meal) in meal_keys]
+            compiled = compile_grocery_list({"meals": meals}, self._pantry_after_change(change_data))
+            updated = [item for item in compiled["items"] if item["name"] in lines]
+            recomputed += [f"grocery:{name}" for name in sorted(lines)]
+            
+            grocery_diff = diff_items([item for item in base_items if item["name"] in lines], updated)
+            changed = ({item["name"] for item in grocery_diff["added"] + grocery_diff["removed"]}
+                       | {entry["name"] for entry in grocery_diff["changed"]})
+            if changed:
+                diff["grocery_list"] = grocery_diff
+                diff["meals_using_changed_items"] = sorted(meal_keys)
+                order["list"]["items"] = merge_grocery_items(base_items, updated, lines)
+                changes += self._describe_grocery_diff(grocery_diff)
+                
+                # Re-price just the changed lines, then re-run vendor selection
+                to_buy = [item for item in updated if item["name"] in changed and not item.get("in_pantry")]
+                rows, cache_stats = await planner._price_lines(to_buy)
+                base_matrix = order["pricing"]["price_matrix"]
+                pricing = planner._select_vendors(merge_price_rows(base_matrix, rows, changed), cache_stats)
+                recomputed += [f"price:{name}" for name in sorted(changed)] + ["vendor_selection"]
+                
+                diff["prices"] = diff_prices(base_matrix, pricing["price_matrix"], changed)
+                diff["vendor"] = {"before": order["selected_vendor"], "after": pricing["recommended_vendor"]}
+                diff["total"] = {"before": order["total"], "after": pricing["order_total"]}
+                if pricing["recommended_vendor"] != order["selected_vendor"]:
+                    changes.append(f"Switched vendor from {order['selected_vendor']} to {pricing['recommended_vendor']}")
+                order.update({
+                    "pricing": pricing,
+                    "selected_vendor": pricing["recommended_vendor"],
+                    "total": pricing["order_total"],
+                })
+        
+        if "errand_schedule" in affected:
+            errands = await planner._schedule_errands(agent, self.context)
+            recomputed.append("errand_schedule")
+            if errands != base.get("errand_schedule"):
+                diff["errand_schedule"] = {"before": base.get("errand_schedule"), "after": errands}
+                base["errand_schedule"] = errands
+                changes.append("Rescheduled errands")
+        
+        if diff:
+            self.plans.save(self.user_id, base)
+        
+        if "grocery_list" in diff and "errand_schedule" in diff:
+            action = "modified_plan"
+        elif "grocery_list" in diff:
+            action = "modified_grocery_list"
+        elif "errand_schedule" in diff:
+            action = "rescheduled_errands"
+        else:
+            action = "none"
+        
+        return {
+            "action": action,
+            "changes": changes,
+            "new_total": order["total"],
+            "recomputed": recomputed,
+            "diff": diff,
+        }
+    
+    def _describe_grocery_diff(self, grocery_diff: Dict[str, List[Any]]) -> List[str]:
+        changes = [f"Added {item['quantity']} {item['unit']} {item['name']} to order" for item in grocery_diff["added"]]
+        changes += [f"Removed {item['name']} from order" for item in grocery_diff["removed"]]
+        for entry in grocery_diff["changed"]:
+            if entry.get("in_pantry", {}).get("after") is False:
+                changes.append(f"Added {entry['name']} to order (no longer in pantry)")
+            elif entry.get("in_pantry", {}).get("after") is True:
+                changes.append(f"Removed {entry['name']} from order (covered by pantry)")
+            else:
+                quantity = entry.get("quantity", {})
+                changes.append(f"Changed {entry['name']} from {quantity.get('before')} to {quantity.get('after')}")
+        return changes
+
+
+class EmergencyRestockWorkflow(WorkflowEventsMixin):
+    """
+    Emergency restock workflow
+    Sequence: Low-stock Check → Instant-delivery Quotes → First Viable Offer
+    Meal planning is skipped. Every instant-delivery store is quoted at once
+    under a tight deadline, and the first store able to deliver every item
+    is offered (and streamed as an ``OFFER_READY`` event) as soon as its
+    quote arrives; slower quotes are abandoned.
+    """
+    
+    workflow_name = "emergency_restock"
+    
+    def __init__(self, user_id: str, events: Optional[EventStream] = None,
+                 context: Optional[ContextGatherer] = None, deadline_seconds: Optional[float] = None):
+        self.user_id = user_id
+        self.workflow_id = f"restock_{user_id}_{datetime.now().isoformat()}"
+        self.events = events or event_stream
+        self.context_gatherer = context or context_gatherer
+        self.deadline_seconds = deadline_seconds or settings.restock_deadline_seconds
+        self.started = 0.0
+        
+    async def execute(self, items: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Find the fastest instant-delivery offer for low-stock items (plus any ``items`` named)"""
+        self._emit(EventType.WORKFLOW_STARTED, description="Emergency Restock", user_id=self.user_id)
+        trace = telemetry.bind(self.workflow_id)
+        status = "failed"
+        self.started = time.perf_counter()
+        
+        try:
+            executor = DAGExecutor(
+                [
+                    Step(
+                        "low_stock", partial(self._low_stock_items, items),
+                        description="Checking pantry for low-stock items...",
+                        completed_description="Low-stock items found",
+                    ),
+                    Step(
+                        "offer", self._first_offer,
+                        depends_on=("low_stock",),
+                        description="Requesting instant-delivery quotes...",
+                        completed_description="Offer ready",
+                    ),
+                ],
+                on_step_started=self._on_step_started,
+                on_step_finished=self._on_step_finished,
+            )
+            result = (await executor.run())["offer"]
+            status = "completed"
+        except Exception as e:
+            self._emit(EventType.WORKFLOW_FAILED, description=f"Emergency restock failed: {str(e)}")
+            raise
+        finally:
+            telemetry.finish(trace, self.workflow_name, status)
+        
+        self._emit(EventType.WORKFLOW_FINISHED, description="Emergency restock offer ready for approval!")
+        return result
+    
+    async def _low_stock_items(self, items: Optional[List[str]]) -> List[str]:
+        """
+        Named items plus the pantry's low-stock items
+        A fresh pantry snapshot answers without any I/O. Otherwise, with the
+        MongoDB context store, the indexed pantry query runs, falling back to
+        the pantry source if MongoDB is slow; without it, the pantry source
+        is read directly.
+        """
+        names = [canonical_name(name) for name in items or []]
+        snapshot = self.context_gatherer.cache.get(self.user_id, "mongodb") if self.context_gatherer.cache else None
+        if snapshot is None and settings.context_store != "mongodb":
+            snapshot = (await self.context_gatherer.gather(self.user_id, only=["mongodb"])).get("pantry_state")
+        elif snapshot is None:
+            try:
+                low = await asyncio.wait_for(
+                    fetch_low_stock_items(self.user_id), timeout=settings.restock_pantry_timeout_seconds
+                )
+                return list(dict.fromkeys(names + [canonical_name(name) for name in low]))
+            except Exception as e:
+                logger.warning("Low-stock query failed for %s, using pantry snapshot: %s", self.user_id, str(e) or type(e).__name__)
+                snapshot = (await self.context_gatherer.gather(self.user_id, only=["mongodb"])).get("pantry_state")
+        low = (snapshot or {}).get("running_low", [])
+        return list(dict.fromkeys(names + [canonical_name(name) for name in low]))
+    
+    async def _first_offer(self, low_stock: List[str]) -> Dict[str, Any]:
+        """Quote every instant-delivery store concurrently and take the first complete offer"""
+        lines = []
+        for name in low_stock:
+            quantity, unit = RESTOCK_QUANTITIES.get(name, (1, "count"))
+            lines.append({"name": name, "quantity": quantity, "unit": unit})
+        stores = [store for store, info in STORES.items() if info.get("instant_delivery")]
+        result: Dict[str, Any] = {
+            "workflow_id": self.workflow_id,
+            "status": "nothing_to_restock",
+            "items": lines,
+            "offer": None,
+            "alternatives": [],
+            "stores_without_quote": [],
+            "approvals_needed": [],
+        }
+        if not lines or not stores:
+            return result
+        
+        tasks = {asyncio.create_task(self._quote_or_none(store, lines)): store for store in stores}
+        offers: List[Dict[str, Any]] = []
+        try:
+            for next_quote in asyncio.as_completed(tasks, timeout=self.deadline_seconds):
+                offer = await next_quote
+                if offer is None:
+                    continue
+                offers.append(offer)
+                if offer["viable"]:
+                    self._emit(
+                        EventType.OFFER_READY, step="offer",
+                        description=f"{offer['store']} can deliver everything in ~{offer['eta_minutes']} min "
+                                    f"for ${offer['total']:.2f}",
+                        offer=offer,
+                    )
+                    break
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            # Let cancelled quotes unwind (and release their rate-limit slots) before returning
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        quoted = {offer["store"] for offer in offers}
+        viable = [offer for offer in offers if offer["viable"]]
+        # Without a complete offer, the offer covering the most items (then cheapest) is the best we have
+        ranked = viable or sorted(offers, key=lambda offer: (len(offer["unavailable"]), offer["total"]))
+        result.update({
+            "status": "ready_for_approval" if viable else ("partial_offer" if offers else "no_offer"),
+            "offer": ranked[0] if ranked else None,
+            "alternatives": [offer for offer in offers if ranked and offer is not ranked[0]],
+            "stores_without_quote": [store for store in stores if store not in quoted],
+            "time_to_offer_seconds": round(time.perf_counter() - self.started, 4),
+            "approvals_needed": ["grocery_order"] if ranked else [],
+        })
+        return result
+    
+    async def _quote_or_none(self, store: str, lines: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """A store's offer, or None if quoting failed; other stores are still awaited"""
+        try:
+            return await self._quote(store, lines)
+        except Exception as e:
+            logger.warning("Instant-delivery quote from %s failed: %s", store, e)
+            return None
+    
+    async def _quote(self, store: str, lines: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """One store's instant-delivery offer; prices already in memory are used when fresh"""
+        items = [line["name"] for line in lines]
+        prices, _ = await price_cache.get_many("instacart", [store], items, memory_only=True)
+        missing = [item for item in items if store not in prices.get(item, {})]
+        if missing:
+            # Straight to the vendor: the batch window would only add latency here
+            fetched = await price_batcher.fetch(missing, [store])
+            await price_cache.put_many("instacart", fetched)
+            for item in missing:
+                prices.setdefault(item, {})[store] = fetched.get(item, {}).get(store)
+        
+        vendor = vendor_for_store(store)
+        matrix = normalize_price_matrix(lines, {
+            "items": items,
+            "vendors": [vendor],
+            "prices": {item: {vendor: prices.get(item, {}).get(store)} for item in items},
+        })
+        line_costs = {item: matrix["prices"][item][vendor] for item in items}
+        unavailable = [item for item, cost in line_costs.items() if cost is None]
+        instant = STORES[store]["instant_delivery"]
+        subtotal = round(sum(cost for cost in line_costs.values() if cost is not None), 2)
         return {
-            "action": "modified_grocery_list",
-            "changes": ["Added milk to order"],
-            "new_total": 151.78
+            "store": store,
+            "vendor": vendor,
+            "viable": not unavailable,
+            "line_costs": line_costs,
+            "unavailable": unavailable,
+            "subtotal": subtotal,
+            "delivery_fee": instant["fee"],
+            "total": round(subtotal + instant["fee"], 2),
+            "eta_minutes": instant["eta_minutes"],
         }
 
 
@@ -355,6 +846,7 @@ WORKFLOWS = {
     "weekly_planning": WeeklyPlanningWorkflow,
     "approval": ApprovalWorkflow,
     "adaptive_replan": AdaptiveRePlanningWorkflow,
+    "emergency_restock": EmergencyRestockWorkflow,
 }
 
 
@@ -363,3 +855,13 @@ def get_workflow(workflow_name: str):
     if workflow_name not in WORKFLOWS:
         raise ValueError(f"Unknown workflow: {workflow_name}")
     return WORKFLOWS[workflow_name]
+
+
+async def resume(workflow_id: str, checkpoints: Optional[CheckpointStore] = None) -> Dict[str, Any]:
+    """Re-run a checkpointed workflow, skipping the steps it already completed"""
+    checkpoints = checkpoints or checkpoint_store
+    run = await checkpoints.get_workflow(workflow_id)
+    if run is None:
+        raise ValueError(f"No checkpoint for workflow: {workflow_id}")
+    workflow = get_workflow(run["workflow"])(**run["params"], checkpoints=checkpoints, workflow_id=workflow_id)
+    return await workflow.execute()
@@ -0,0 +1,25 @@
+from coordinator.pricing.optimizer import optimize_vendor_selection
+
+FEES = {"instacart": 3.99, "amazon_fresh": 0.0}
+
+
+def test_empty_list_uses_no_vendor():
+    result = optimize_vendor_selection({"items": [], "vendors": list(FEES), "prices": {}, "delivery_fees": FEES})
+
+    assert result["recommended_vendor"] is None
+    assert result["assignments"] == {}
+    assert result["order_total"] == 0.0
+    assert result["objective"] == 0.0
+
+
+def test_cheapest_vendor_includes_delivery_fee():
+    result = optimize_vendor_selection({
+        "items": ["milk", "eggs"],
+        "vendors": list(FEES),
+        "prices": {"milk": {"instacart": 3.0, "amazon_fresh": 3.5}, "eggs": {"instacart": 4.0, "amazon_fresh": 4.5}},
+        "delivery_fees": FEES,
+    })
+
+    assert result["recommended_vendor"] == "amazon_fresh"
+    assert result["assignments"] == {"amazon_fresh": ["milk", "eggs"]}
+    assert result["order_total"] == 8.0
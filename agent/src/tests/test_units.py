@@ -0,0 +1,29 @@
+from coordinator.units import normalize_price_matrix
+
+MILK = [{"name": "milk", "quantity": 1, "unit": "gallon"}]
+
+
+def test_package_quote_is_costed_in_packages():
+    matrix = normalize_price_matrix(MILK, {"prices": {"milk": {"a": {"price": 2.0, "size": 64, "unit": "fl oz"}}}})
+
+    assert matrix["packages"]["milk"]["a"] == 2
+    assert matrix["prices"]["milk"]["a"] == 4.0
+
+
+def test_zero_size_quote_is_unavailable():
+    matrix = normalize_price_matrix(MILK, {"prices": {"milk": {
+        "a": {"price": 3.0, "size": 0, "unit": "gallon"},
+        "b": {"price": 3.5, "size": 1, "unit": "gallon"},
+    }}})
+
+    assert matrix["prices"]["milk"] == {"a": None, "b": 3.5}
+    assert matrix["unit_prices"]["milk"]["a"] is None
+    assert [m["vendor"] for m in matrix["unit_mismatches"]] == ["a"]
+
+
+def test_quote_without_price_is_unavailable():
+    matrix = normalize_price_matrix(MILK, {"prices": {"milk": {"a": {"price": None, "size": 1, "unit": "gallon"}}}})
+
+    assert matrix["prices"]["milk"]["a"] is None
+    assert matrix["unit_prices"]["milk"]["a"] is None
+    assert [m["vendor"] for m in matrix["unit_mismatches"]] == ["a"]